@@ -8,139 +8,106 @@ from flask_socketio import SocketIO, emit, join_room, leave_room
 import ollama
 import json
 import uuid
-import asyncio
-import websockets
 from datetime import datetime
-from database import db
+from database import db, TREND_DEFAULT_POINTS
 from modules.similarity_scorer import SimilarityScorer
+from modules.questions import TRIGGER_KEYWORDS, TEST_QUESTIONS
+from modules.session_gate import SessionTurnGate, SessionBusyError, SessionCoalesced
+from modules.event_bus import EventPublisher
+from modules.admission import AdmissionController, AdmissionRejected
+from modules.http_cache import FastJSONProvider, compress_response, versioned, tagged
+from modules.change_feed import ChangeFeed
+from modules.socket_queue import socketio_queue_options
+from modules.cohort_analytics import CohortAnalytics
+from modules.stream_export import STREAM_FORMATS, stream_export
+from modules.socket_auth import SocketTokenSigner
 
 app = Flask(__name__)
-CORS(app)
+# 세션 목록 API의 다음 페이지 커서를 클라이언트에서 읽을 수 있도록 노출
+CORS(app, expose_headers=['X-Next-Cursor'])
 
-# JSON 인코딩 설정 - 한글 유니코드 이스케이프 방지
-app.config['JSON_AS_ASCII'] = False
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+# JSON 인코딩 설정 - 한글 유니코드 이스케이프 없이 공백 없는 JSON (orjson 설치 시 orjson 사용)
+app.json = FastJSONProvider(app)
+
+# 이 크기(바이트) 이상인 JSON 응답은 br/gzip으로 압축
+RESPONSE_COMPRESS_MIN_SIZE = int(os.environ.get('RESPONSE_COMPRESS_MIN_SIZE', '1024'))
+RESPONSE_COMPRESS_LEVEL = int(os.environ.get('RESPONSE_COMPRESS_LEVEL', '6'))
+
+@app.after_request
+def compress_api_response(response):
+    if request.path.startswith('/api/'):
+        return compress_response(response, RESPONSE_COMPRESS_MIN_SIZE, RESPONSE_COMPRESS_LEVEL)
+    return response
+
+# DB 프로파일링: 이 시간(ms) 이상 걸린 SQL 문장은 파라미터, 실행 계획과 함께 기록
+DB_SLOW_QUERY_MS = float(os.environ.get('DB_SLOW_QUERY_MS', '50'))
+DB_PROFILING = os.environ.get('DB_PROFILING', '1') != '0'
+db.profiler.configure(slow_threshold_ms=DB_SLOW_QUERY_MS, enabled=DB_PROFILING)
+
+# 스냅샷 내보내기 변경 로그 보존 한도(행 수, 0이면 무제한): 로그는 export_snapshot.py가 기록을 켠
+# 뒤에만 쌓이며, 내보내기가 멈춘 뒤에도 계속 커지지 않도록 시작할 때 오래된 변경분부터 정리한다
+EXPORT_CHANGES_MAX_ROWS = int(os.environ.get('EXPORT_CHANGES_MAX_ROWS', '1000000'))
+trimmed_changes = db.trim_export_changes(EXPORT_CHANGES_MAX_ROWS)
+if trimmed_changes:
+    print(f"스냅샷 변경 로그 정리: {trimmed_changes:,}건 (보존 한도 {EXPORT_CHANGES_MAX_ROWS:,}행)")
+
+# 모집단 점수 분포 분석: 완료된 세션 점수의 메모리 컬럼 캐시 (이 간격(초)마다 변경분만 읽어서 반영)
+ANALYTICS_REFRESH_INTERVAL = float(os.environ.get('ANALYTICS_REFRESH_INTERVAL', '5'))
+cohort_analytics = CohortAnalytics(lambda: db.connections.connection(readonly=True),
+                                   refresh_interval=ANALYTICS_REFRESH_INTERVAL)
+
+def analytics_version():
+    """분석 응답 ETag: 캐시에 반영된 마지막 점수 변경 번호 (갱신 간격 안에서는 본문과 함께 고정)"""
+    return f"{db.versions.boot}-a{cohort_analytics.version()}"
+
+# SocketIO 메시지 큐 (여러 노드 실행 시 emit/room을 노드 간에 전달)
+# 예: redis://localhost:6379/0, 테스트용 localqueue://127.0.0.1:6380 (python -m modules.socket_queue)
+SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+SOCKETIO_CHANNEL = os.environ.get('SOCKETIO_CHANNEL', 'flask-socketio')
+
+# 대시보드 델타 구독 토큰 (로그인 시 발급, subscribe_dashboard에서 검증)
+# 여러 노드로 실행하면 모든 노드에 같은 값을 설정해야 함 (설정하지 않으면 프로세스마다 임의 값)
+SOCKET_TOKEN_SECRET = os.environ.get('SOCKET_TOKEN_SECRET') or os.urandom(32).hex()
+SOCKET_TOKEN_MAX_AGE = int(os.environ.get('SOCKET_TOKEN_MAX_AGE', '43200'))
+socket_tokens = SocketTokenSigner(SOCKET_TOKEN_SECRET, SOCKET_TOKEN_MAX_AGE)
+if SOCKETIO_MESSAGE_QUEUE and not os.environ.get('SOCKET_TOKEN_SECRET'):
+    print("경고: SOCKET_TOKEN_SECRET이 없어 다른 노드에서 발급한 구독 토큰은 거절됩니다.")
 
 # SocketIO 초기화
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*",
+                    **socketio_queue_options(SOCKETIO_MESSAGE_QUEUE, SOCKETIO_CHANNEL))
 
 # 전역 변수로 세션 관리
 similarity_scorer = SimilarityScorer()
 sessions = {}
 
-# 웹소켓 연결 유지용 변수
-ws_connection = None
-ws_lock = asyncio.Lock()
+# 세션 동시 요청 처리 정책 ('queue', 'reject', 'coalesce')
+SESSION_OVERLAP_POLICY = os.environ.get('SESSION_OVERLAP_POLICY', 'queue')
+SESSION_LOCK_TIMEOUT = float(os.environ.get('SESSION_LOCK_TIMEOUT', '30'))
+
+# LLM 호출 입장 제어 설정
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '2'))
+LLM_MAX_QUEUE = int(os.environ.get('LLM_MAX_QUEUE', '16'))
+LLM_MAX_WAIT = float(os.environ.get('LLM_MAX_WAIT', '10'))
+# 과부하 시 동작: 'degrade' (키워드 점수/기본 응답) 또는 'reject' (503)
+LLM_OVERLOAD_MODE = os.environ.get('LLM_OVERLOAD_MODE', 'degrade')
+# 사용자(세션) 한 명이 동시에 점유할 수 있는 LLM 슬롯 수
+LLM_MAX_PER_USER = int(os.environ.get('LLM_MAX_PER_USER', '1'))
+DEGRADED_CHAT_REPLY = "지금 이야기하는 친구들이 많아서 답이 조금 늦어지고 있어. 조금만 있다가 다시 말해줄래?"
+
+llm_admission = AdmissionController(LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE, LLM_MAX_WAIT, LLM_MAX_PER_USER)
+
+# 웹소켓 이벤트 전송 설정
 WS_URI = "wss://proxy4.aitrain.ktcloud.com:10290/ws"
 WS_COOKIE = "appproxy_permit=NzZkYjNiZDQwMjA0YjFjNzI5NzBhYmI0MjhlZjIzMmI0NDBlYzlmMDk5OWNlM2I4Zjk5NGZkY2U3NGEzZDgzNw=="
+WS_EVENT_QUEUE_SIZE = int(os.environ.get('WS_EVENT_QUEUE_SIZE', '1000'))
 
-# 트리거 키워드 (진단 테스트 시작 조건)
-TRIGGER_KEYWORDS = [
-    '우울', '슬프', '힘들', '어려', '걱정', '불안', '스트레스', '피곤', '외로',
-    '자살', '죽고', '끝내', '포기', '의미없', '희망없', '절망', '괴로', '고통'
-]
-
-# 3가지 테스트 질문 (각 20개)
-TEST_QUESTIONS = {
-    'cdi': [
-        "야, 요즘 공부는 어때? 어떤 기분이야?",
-        "친구들이나 다른 애들이랑 있을 때 어떤 느낌이야?",
-        "요즘 잠은 잘 자? 잠자리는 어때?",
-        "학교에서 선생님이나 어른들과 이야기할 때는 어때?",
-        "혼자 있을 때 어떤 기분이야? 외롭지 않아?",
-        "요즘 우울하거나 슬픈 기분이 자주 들어?",
-        "친구들과 놀 때 재미있어? 아니면 힘들어?",
-        "공부할 때 집중이 잘 돼? 아니면 어려워?",
-        "요즘 많이 울어? 눈물이 자주 나와?",
-        "밥은 잘 먹어? 식욕은 어때?",
-        "몸이 피곤하거나 아픈 곳 있어?",
-        "새로운 일을 시작할 때 두려워?",
-        "다른 애들보다 못하다고 생각해?",
-        "미래에 대해 걱정이 많아?",
-        "가족들과 잘 지내? 집에서 편해?",
-        "요즘 스트레스 받는 일이 많아?",
-        "기분이 자주 변해? 갑자기 화나거나?",
-        "혹시 자해하거나 죽고 싶은 생각 해봤어?",
-        "마지막으로, 요즘 가장 힘든 일이 뭐야?",
-        "그럼 마지막 질문이야. 앞으로 어떻게 하고 싶어?"
-    ],
-    'rcmas': [
-        "새로운 상황에 들어갈 때 얼마나 긴장돼?",
-        "다른 사람들이 너를 어떻게 생각하는지 걱정돼?",
-        "시험을 볼 때 얼마나 불안해?",
-        "새로운 친구를 사귈 때 어려워?",
-        "선생님 앞에서 발표할 때 떨려?",
-        "다른 애들보다 못하다고 생각해?",
-        "실수를 하면 얼마나 부끄러워?",
-        "새로운 일을 시작할 때 두려워?",
-        "다른 사람들이 너를 비웃을까 걱정돼?",
-        "혼자 있을 때 불안해?",
-        "새로운 환경에 적응하기 어려워?",
-        "다른 사람들과 비교될 때 스트레스받아?",
-        "실패할까봐 걱정돼?",
-        "다른 사람들의 시선이 부담스러워?",
-        "새로운 도전을 피하고 싶어?",
-        "다른 사람들이 너를 어떻게 볼지 걱정돼?",
-        "새로운 사람들과 만날 때 어색해?",
-        "다른 애들보다 뒤처질까 걱정돼?",
-        "새로운 상황에서 실수할까봐 두려워?",
-        "마지막으로, 가장 불안한 상황이 뭐야?"
-    ],
-    'bdi': [
-        "요즘 기분이 어떤가?",
-        "미래에 대해 어떻게 생각해?",
-        "실패했다고 느낄 때가 있어?",
-        "만족스럽지 않은 일이 많아?",
-        "죄책감을 느낄 때가 있어?",
-        "벌을 받을 것 같다고 생각해?",
-        "자신에 대해 실망해?",
-        "자신을 비난할 때가 있어?",
-        "자살에 대해 생각해본 적 있어?",
-        "요즘 많이 울어?",
-        "짜증이 자주 나?",
-        "다른 사람들에게 관심이 없어?",
-        "결정하기 어려워?",
-        "자신이 못생겼다고 생각해?",
-        "일하기 어려워?",
-        "잠을 잘 못 자?",
-        "피곤해?",
-        "식욕이 없어?",
-        "몸무게가 많이 변했어?",
-        "건강에 대해 걱정돼?"
-    ]
-}
-
-# 웹소켓 연결 유지 함수들
-async def ws_connect_loop():
-    """웹소켓 연결 유지 루프"""
-    global ws_connection
-    headers = {"Cookie": WS_COOKIE}
-    while True:
-        try:
-            async with websockets.connect(WS_URI, additional_headers=headers) as websocket:
-                ws_connection = websocket
-                print("웹소켓 연결 성공")
-                while True:
-                    # 연결 유지용 간단한 recv (서버 ping/pong 대기)
-                    await websocket.recv()
-        except Exception as e:
-            print("웹소켓 연결 에러:", e)
-            ws_connection = None
-            await asyncio.sleep(5)  # 재연결 대기
-
-async def send_ws_ping(message: str = "ping"):
-    """웹소켓 핑 전송"""
-    global ws_connection
-    async with ws_lock:
-        if ws_connection:
-            try:
-                await ws_connection.send(message)
-                print(f"핑 전송: {message}")
-            except Exception as e:
-                print("핑 전송 실패:", e)
-                ws_connection = None
-        else:
-            print("웹소켓 연결 없음, 핑 전송 불가")
+# 백그라운드 이벤트 퍼블리셔 (요청 핸들러는 큐에 넣기만 함)
+event_publisher = EventPublisher(
+    WS_URI,
+    headers={"Cookie": WS_COOKIE},
+    max_queue=WS_EVENT_QUEUE_SIZE
+)
 
 # SocketIO 이벤트 핸들러
 @socketio.on('connect')
@@ -169,6 +136,83 @@ def handle_leave_room(data):
     leave_room(room)
     emit('left_room', {'room': room})
 
+# 대시보드 실시간 델타 (DB 커밋 시 방별로 묶어서 push, 클라이언트 폴링 대체)
+DASHBOARD_DELTA_INTERVAL = float(os.environ.get('DASHBOARD_DELTA_INTERVAL', '0.25'))
+DASHBOARD_ADMIN_ROOM = 'dashboard:admin'
+DASHBOARD_EXPERT_ROOM = 'dashboard:expert'
+
+def dashboard_user_room(user_id):
+    return f"dashboard:user:{user_id}"
+
+change_feed = ChangeFeed(
+    lambda event, data, room: socketio.emit(event, data, to=room),
+    interval=DASHBOARD_DELTA_INTERVAL
+)
+
+# 델타 종류별 병합 키 (같은 주기 안에서는 마지막 상태만 전송)
+DELTA_KEYS = {
+    'session_created': 'id',
+    'session_updated': 'id',
+    'expert_score_updated': 'response_id'
+}
+
+def publish_dashboard_change(change_type, data):
+    """DB 변경 델타를 관리자/전문가 방과 해당 사용자 방으로 전달"""
+    rooms = [DASHBOARD_ADMIN_ROOM, DASHBOARD_EXPERT_ROOM]
+    if data.get('user_id'):
+        rooms.append(dashboard_user_room(data['user_id']))
+    key_field = DELTA_KEYS.get(change_type)
+    change_feed.publish(change_type, data, rooms, key=data.get(key_field) if key_field else None)
+
+db.add_change_listener(publish_dashboard_change)
+
+@socketio.on('subscribe_dashboard')
+def handle_subscribe_dashboard(data):
+    """대시보드 델타 구독 - 역할에 따라 관리자/전문가 방, 항상 본인 방에 참여
+    
+    로그인 응답의 socket_token을 함께 보내야 하며, 토큰을 발급받은 사용자로만 구독된다.
+    """
+    data = data or {}
+    token_user_id = socket_tokens.verify(data.get('token') or '')
+    if not token_user_id:
+        emit('dashboard_error', {'error': '구독 토큰이 없거나 만료되었습니다. 다시 로그인하세요.'})
+        return
+    user_id = data.get('user_id') or token_user_id
+    if user_id != token_user_id:
+        emit('dashboard_error', {'error': '다른 사용자의 대시보드는 구독할 수 없습니다.'})
+        return
+    user = db.get_user_by_id(user_id)
+    if not user:
+        emit('dashboard_error', {'error': '사용자를 찾을 수 없습니다.'})
+        return
+    
+    rooms = [dashboard_user_room(user_id)]
+    if user.get('role') == 'admin':
+        rooms.append(DASHBOARD_ADMIN_ROOM)
+    elif user.get('role') == 'expert':
+        rooms.append(DASHBOARD_EXPERT_ROOM)
+    for room in rooms:
+        join_room(room)
+    emit('dashboard_subscribed', {'rooms': rooms})
+
+@socketio.on('unsubscribe_dashboard')
+def handle_unsubscribe_dashboard(data):
+    user_id = (data or {}).get('user_id')
+    for room in (DASHBOARD_ADMIN_ROOM, DASHBOARD_EXPERT_ROOM, dashboard_user_room(user_id)):
+        leave_room(room)
+    emit('dashboard_unsubscribed', {})
+
+def run_llm_task(task, fallback, key=None, priority='chat'):
+    """입장 제어/공정 스케줄링을 거쳐 LLM 작업 실행 (과부하 시 대체 응답 또는 AdmissionRejected)"""
+    try:
+        with llm_admission.slot(key, priority):
+            return task()
+    except AdmissionRejected:
+        if LLM_OVERLOAD_MODE != 'degrade':
+            raise
+        llm_admission.record_degraded()
+        return fallback()
+
 class ConversationSession:
     def __init__(self, session_id, user_id=None):
         self.session_id = session_id
@@ -180,6 +224,8 @@ class ConversationSession:
         self.test_results = {}
         self.db_session_id = None
         self.responses = []  # 테스트 응답 저장
+        # 같은 세션의 메시지를 순서대로 하나씩 처리하기 위한 게이트
+        self.turn_gate = SessionTurnGate(SESSION_OVERLAP_POLICY, SESSION_LOCK_TIMEOUT)
         
     def detect_trigger(self, user_message):
         """트리거 키워드 감지"""
@@ -241,14 +287,20 @@ class ConversationSession:
         # 현재 질문에 대한 응답 저장
         if self.db_session_id:
             question_text = TEST_QUESTIONS[self.current_test][self.current_question_index]
-            keywords = db.extract_and_update_keywords(
-                self.current_test, str(self.current_question_index), user_message
-            )
             
             # 실제 점수 계산 - 질문 ID를 적절한 subcategory로 매핑
+            # (과부하로 거절될 수 있으므로 DB에 쓰기 전에 먼저 계산)
             subcategory = self._get_subcategory_for_question(self.current_test, self.current_question_index)
-            calculated_score = similarity_scorer.calculate_similarity_score(
-                user_message, self.current_test, subcategory
+            test_type = self.current_test
+            calculated_score = run_llm_task(
+                lambda: similarity_scorer.calculate_similarity_score(user_message, test_type, subcategory),
+                lambda: similarity_scorer.calculate_keyword_score(user_message, test_type, subcategory),
+                key=self.user_id or self.session_id,
+                priority='scoring'
+            )
+            
+            keywords = db.extract_and_update_keywords(
+                self.current_test, str(self.current_question_index), user_message
             )
             
             # 테스트 타입에 따른 그룹과 카테고리 설정
@@ -311,7 +363,8 @@ class ConversationSession:
                     status='completed',
                     completed_questions=len(TEST_QUESTIONS[self.current_test]),
                     total_score=actual_score,
-                    completed_at=datetime.now().isoformat()
+                    completed_at=datetime.now().isoformat(),
+                    durable=True
                 )
             
             # 다음 테스트 확인
@@ -400,8 +453,8 @@ def start_session():
 @app.route('/api/message', methods=['POST'])
 def process_message():
     """메시지 처리"""
-    # 웹소켓 핑 전송
-    asyncio.create_task(send_ws_ping("train api 호출"))
+    # 웹소켓 이벤트 전송 (큐에 넣기만 하므로 블로킹/예외 없음)
+    event_publisher.publish('ping', "train api 호출")
     
     data = request.get_json()
     
@@ -416,6 +469,33 @@ def process_message():
     
     session = sessions[session_id]
     
+    # 같은 세션의 요청은 직렬화하여 질문 인덱스/응답 목록이 꼬이지 않도록 함
+    try:
+        return session.turn_gate.run(
+            user_message, lambda message: _handle_session_message(session, session_id, message)
+        )
+    except SessionCoalesced:
+        return Response(
+            json.dumps({
+                'session_id': session_id,
+                'response': None,
+                'intent': 'coalesced',
+                'is_complete': False,
+                'diagnosis_result': None
+            }, ensure_ascii=False),
+            status=202,
+            mimetype='application/json; charset=utf-8'
+        )
+    except SessionBusyError as e:
+        return jsonify({'error': str(e)}), 409
+    except AdmissionRejected as e:
+        response = jsonify({'error': str(e), 'reason': e.reason})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+
+def _handle_session_message(session, session_id, user_message):
+    """세션 락을 잡은 상태에서 메시지 처리"""
     # 대화 히스토리에 사용자 메시지 추가
     session.conversation_history.append({
         'type': 'user',
@@ -446,7 +526,17 @@ def process_message():
             )
         else:
             # 일반 대화
-            response = get_chat_response(user_message, session.conversation_history)
+            try:
+                response = run_llm_task(
+                    lambda: get_chat_response(user_message, session.conversation_history),
+                    lambda: DEGRADED_CHAT_REPLY,
+                    key=session.user_id or session_id,
+                    priority='chat'
+                )
+            except AdmissionRejected:
+                # 거절된 메시지는 히스토리에 남기지 않음
+                session.conversation_history.pop()
+                raise
             session.conversation_history.append({
                 'type': 'assistant',
                 'content': response,
@@ -466,7 +556,11 @@ def process_message():
     
     else:
         # 테스트 모드
-        response, is_complete = session.process_test_response(user_message)
+        try:
+            response, is_complete = session.process_test_response(user_message)
+        except AdmissionRejected:
+            session.conversation_history.pop()
+            raise
         session.conversation_history.append({
             'type': 'assistant',
             'content': response,
@@ -505,6 +599,124 @@ def health_check():
         'active_sessions': len(sessions)
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """서버 내부 지표 조회"""
+    return jsonify({
+        'active_sessions': len(sessions),
+        'event_bus': event_publisher.stats(),
+        'llm_admission': llm_admission.stats(),
+        'db_writer': db.writer.stats(),
+        'db_connections': db.connections.stats(),
+        'progress_cache': db.progress_cache.stats(),
+        'change_feed': change_feed.stats(),
+        'db_profile': db.profiler.stats(),
+        'db_methods': db.profiler.method_stats(),
+        'cohort_analytics': cohort_analytics.stats()
+    })
+
+@app.route('/api/admin/slow-queries', methods=['GET'])
+def get_slow_queries():
+    """시작 이후 가장 느린 SQL 문장 상위 N개와 최근 느린 쿼리 기록 (관리자용)"""
+    try:
+        limit = max(1, min(int(request.args.get('limit', 20)), 500))
+        return jsonify({
+            'profile': db.profiler.stats(),
+            'statements': db.profiler.top_statements(limit, request.args.get('sort', 'max')),
+            'slow_log': db.profiler.slow_queries(limit)
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/admin/analytics/distribution', methods=['GET'])
+@tagged(analytics_version)
+def get_score_distribution():
+    """완료된 세션 점수 분포: 히스토그램, 백분위, 평균/표준편차 (관리자용)
+    
+    쿼리 파라미터: metric (total_score, ai_avg, expert_avg, gap_avg), test_type, bins,
+    date_from, date_to (YYYY-MM-DD), round, latest (1이면 사용자별 가장 최근 세션만)
+    """
+    try:
+        session_round = request.args.get('round')
+        return jsonify(cohort_analytics.distribution(
+            metric=request.args.get('metric', 'total_score'),
+            test_type=request.args.get('test_type'),
+            bins=int(request.args.get('bins', 20)),
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            session_round=int(session_round) if session_round else None,
+            latest=request.args.get('latest') == '1'
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/analytics/cohorts', methods=['GET'])
+@tagged(analytics_version)
+def get_cohort_comparison():
+    """코호트별 점수 비교: 테스트 유형/회차/완료 월별 세션 수, 평균, 사분위수 (관리자용)
+    
+    쿼리 파라미터: by (test_type, round, month), metric, test_type, date_from, date_to, latest
+    """
+    try:
+        return jsonify(cohort_analytics.compare(
+            by=request.args.get('by', 'round'),
+            metric=request.args.get('metric', 'total_score'),
+            test_type=request.args.get('test_type'),
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            latest=request.args.get('latest') == '1'
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# 스트리밍 내보내기: DB에서 이 행 수씩 읽어서 바로 전송
+EXPORT_CHUNK_ROWS = int(os.environ.get('EXPORT_CHUNK_ROWS', '1000'))
+
+@app.route('/api/admin/export/<dataset>', methods=['GET'])
+def export_dataset(dataset):
+    """세션/응답/그룹 점수 스트리밍 내보내기 (관리자용, CSV 또는 JSON Lines)
+    
+    dataset: sessions, responses, grouped_scores
+    쿼리 파라미터: format (csv, jsonl), compress (gzip), user_id (쉼표 구분 또는 여러 번),
+    test_type, status, date_from, date_to (세션 시작일 YYYY-MM-DD)
+    전체를 메모리에 모으지 않고 청크 단위로 전송한다 (Transfer-Encoding: chunked).
+    """
+    fmt = request.args.get('format', 'csv')
+    if fmt not in STREAM_FORMATS:
+        return jsonify({'error': f'지원하지 않는 내보내기 포맷입니다: {fmt}'}), 400
+    user_ids = [user_id for value in request.args.getlist('user_id')
+                for user_id in value.split(',') if user_id]
+    gzip_body = request.args.get('compress') == 'gzip'
+    
+    try:
+        columns, chunks = db.export_rows(
+            dataset,
+            user_ids=user_ids or None,
+            test_type=request.args.get('test_type'),
+            status=request.args.get('status'),
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            chunk_size=EXPORT_CHUNK_ROWS
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    mimetype, extension = STREAM_FORMATS[fmt]
+    filename = f"{dataset}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{extension}"
+    response = Response(stream_export(columns, chunks, fmt, gzip=gzip_body, level=RESPONSE_COMPRESS_LEVEL),
+                        content_type=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'no-store'
+    # 프록시(nginx 등)가 응답을 모았다가 보내지 않도록
+    response.headers['X-Accel-Buffering'] = 'no'
+    if gzip_body:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 # 사용자 인증 API
 @app.route('/api/auth/register', methods=['POST'])
 def register():
@@ -543,7 +755,9 @@ def login():
         if user:
             return jsonify({
                 'message': '로그인 성공',
-                'user': user
+                'user': user,
+                # 대시보드 델타 구독(subscribe_dashboard)에 사용
+                'socket_token': socket_tokens.issue(user['id'])
             })
         else:
             return jsonify({'error': '이메일 또는 비밀번호가 올바르지 않습니다.'}), 401
@@ -552,6 +766,7 @@ def login():
 
 # 대시보드 API
 @app.route('/api/dashboard/stats', methods=['GET'])
+@versioned(db.versions, lambda: ('users', 'sessions'))
 def get_dashboard_stats():
     """대시보드 통계"""
     try:
@@ -560,32 +775,46 @@ def get_dashboard_stats():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _session_page_response(page):
+    """세션 목록은 배열로 반환하고 다음 페이지 커서는 X-Next-Cursor 헤더로 전달"""
+    response = jsonify(page['sessions'])
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response
+
 @app.route('/api/dashboard/sessions', methods=['GET'])
+@versioned(db.versions, lambda: (f"user:{request.args.get('user_id')}",))
 def get_user_sessions():
-    """사용자 세션 목록"""
+    """사용자 세션 목록 (커서 기반 페이지네이션)"""
     user_id = request.args.get('user_id')
-    limit = int(request.args.get('limit', 50))
     
     if not user_id:
         return jsonify({'error': '사용자 ID가 필요합니다.'}), 400
     
     try:
-        sessions_data = db.get_user_sessions(user_id, limit)
-        return jsonify(sessions_data)
+        limit = max(1, min(int(request.args.get('limit', 50)), 1000))
+        page = db.get_user_sessions_page(user_id, limit, request.args.get('cursor'))
+        return _session_page_response(page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/admin/all-sessions', methods=['GET'])
+@versioned(db.versions, lambda: ('users', 'sessions'))
 def get_all_sessions():
-    """모든 사용자의 세션 조회 (관리자/전문가용)"""
+    """모든 사용자의 세션 조회 (관리자/전문가용, 커서 기반 페이지네이션)"""
     try:
-        limit = int(request.args.get('limit', 100))
-        all_sessions = db.get_all_sessions(limit)
-        return jsonify(all_sessions)
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+        page = db.get_all_sessions_page(limit, request.args.get('cursor'))
+        return _session_page_response(page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/dashboard/progress/<user_id>', methods=['GET'])
+@versioned(db.versions, lambda user_id: (f"user:{user_id}",))
 def get_user_progress(user_id):
     """사용자별 통합 진행률 조회"""
     try:
@@ -594,24 +823,67 @@ def get_user_progress(user_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/dashboard/trends/<user_id>', methods=['GET'])
+@versioned(db.versions, lambda user_id: (f"user:{user_id}",))
+def get_user_score_trends(user_id):
+    """사용자별 테스트 유형 점수 추이 (완료된 세션 기준, 통계 차트용)
+    
+    쿼리 파라미터: date_from, date_to (YYYY-MM-DD), points (유형별 최대 포인트 수), test_type
+    """
+    try:
+        trends = db.get_score_trends(
+            user_id,
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            points=int(request.args.get('points', TREND_DEFAULT_POINTS)),
+            test_type=request.args.get('test_type')
+        )
+        return jsonify(trends)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/admin/all-users-progress', methods=['GET'])
+@versioned(db.versions, lambda: ('users', 'sessions'))
 def get_all_users_progress():
-    """모든 사용자의 진행률 조회 (관리자용)"""
+    """모든 사용자의 진행률 조회 (관리자용, 커서 기반 페이지네이션)"""
     try:
         # 관리자 권한 확인 (실제로는 JWT 토큰이나 세션에서 확인해야 함)
         # 여기서는 간단히 구현
-        users_progress = db.get_all_users_progress()
-        return jsonify({
-            'users': users_progress,
-            'total_users': len(users_progress)
-        })
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+        page = db.get_users_progress_page(
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            sort=request.args.get('sort', 'created_at'),
+            order=request.args.get('order', 'desc'),
+            role=request.args.get('role'),
+            search=request.args.get('q')
+        )
+        return jsonify(page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _session_report_response(session_id, kind):
+    """완료된 세션의 저장된 보고서를 ETag와 함께 반환 (If-None-Match 일치 시 304)"""
+    report = db.get_session_report(session_id, kind)
+    if not report:
+        return None
+    body, etag = report
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
 @app.route('/api/dashboard/session/<session_id>', methods=['GET'])
+@versioned(db.versions, lambda session_id: ('sessions',))
 def get_session_detail(session_id):
     """세션 상세 정보"""
     try:
+        cached = _session_report_response(session_id, 'detail')
+        if cached is not None:
+            return cached
         session_data = db.get_session_detail(session_id)
         if session_data:
             return jsonify(session_data)
@@ -621,9 +893,13 @@ def get_session_detail(session_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/dashboard/session/<session_id>/grouped-scores', methods=['GET'])
+@versioned(db.versions, lambda session_id: ('sessions',))
 def get_session_grouped_scores(session_id):
     """세션별 그룹 점수 조회"""
     try:
+        cached = _session_report_response(session_id, 'grouped')
+        if cached is not None:
+            return cached
         grouped_scores = db.get_session_grouped_scores(session_id)
         return jsonify(grouped_scores)
     except Exception as e:
@@ -653,6 +929,67 @@ def update_expert_score(response_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# 한 번에 반영할 수 있는 전문가 점수 수
+EXPERT_SCORE_BATCH_MAX = int(os.environ.get('EXPERT_SCORE_BATCH_MAX', '500'))
+
+@app.route('/api/expert/scores', methods=['PUT'])
+def update_expert_scores():
+    """여러 응답의 전문가 점수를 한 번에 업데이트 (한 트랜잭션)
+    
+    요청: {"expert_id": (선택), "scores": [{"response_id", "score", "comment"(선택)}, ...]}
+    응답: 항목별 결과 (입력 순서)
+    """
+    data = request.get_json(silent=True)
+    items = data.get('scores') if isinstance(data, dict) else None
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': '점수 목록(scores)이 필요합니다.'}), 400
+    if len(items) > EXPERT_SCORE_BATCH_MAX:
+        return jsonify({'error': f'한 번에 최대 {EXPERT_SCORE_BATCH_MAX}개까지 업데이트할 수 있습니다.'}), 400
+    
+    try:
+        results = db.update_expert_scores(items, expert_id=data.get('expert_id'))
+        updated = sum(1 for result in results if result['ok'])
+        return jsonify({
+            'message': f'전문가 점수 {updated}개가 업데이트되었습니다.',
+            'updated': updated,
+            'failed': len(results) - updated,
+            'results': results
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/expert/search', methods=['GET'])
+@versioned(db.versions, lambda: ('sessions',))
+def search_responses():
+    """응답 전문 검색 (전문가용, 최신순 커서 기반 페이지네이션)
+    
+    쿼리 파라미터: q(필수), test_type, min_score, max_score, date_from, date_to (YYYY-MM-DD), limit, cursor
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': '검색어가 필요합니다.'}), 400
+    
+    try:
+        min_score = request.args.get('min_score')
+        max_score = request.args.get('max_score')
+        limit = max(1, min(int(request.args.get('limit', 50)), 200))
+        page = db.search_responses(
+            query,
+            test_type=request.args.get('test_type'),
+            min_score=float(min_score) if min_score else None,
+            max_score=float(max_score) if max_score else None,
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            limit=limit,
+            cursor=request.args.get('cursor')
+        )
+        return jsonify(page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 if __name__ == '__main__':
     print("Flask API 서버를 시작합니다...")
     print("API 엔드포인트:")
@@ -660,6 +997,11 @@ if __name__ == '__main__':
     print("  POST /api/start_session - 새 세션 시작")
     print("  POST /api/message - 메시지 처리")
     print("  GET /api/health - 헬스 체크")
+    print("  GET /api/metrics - 서버 지표")
+    print("  GET /api/admin/slow-queries - 느린 SQL 문장 상위 N개")
+    print("  GET /api/admin/analytics/distribution - 세션 점수 분포/백분위")
+    print("  GET /api/admin/analytics/cohorts - 코호트별 점수 비교")
+    print("  GET /api/admin/export/<dataset> - 세션/응답/그룹 점수 스트리밍 내보내기 (CSV/JSONL)")
     print("=== 사용자 인증 ===")
     print("  POST /api/auth/register - 사용자 회원가입")
     print("  POST /api/auth/login - 사용자 로그인")
@@ -668,19 +1010,26 @@ if __name__ == '__main__':
     print("  GET /api/dashboard/sessions - 사용자 세션 목록")
     print("  GET /api/dashboard/session/<id> - 세션 상세 정보")
     print("  GET /api/dashboard/session/<id>/grouped-scores - 세션 그룹별 점수")
+    print("  GET /api/dashboard/trends/<user_id> - 사용자 점수 추이")
     print("=== 전문가 점수 ===")
     print("  PUT /api/expert/score/<response_id> - 전문가 점수 업데이트")
+    print("  PUT /api/expert/scores - 전문가 점수 일괄 업데이트")
+    print("  GET /api/expert/search - 응답 전문 검색")
     print("=== 웹소켓 ===")
+    print("  subscribe_dashboard / unsubscribe_dashboard - 대시보드 델타(dashboard_delta) 구독")
     print("  WebSocket 연결 유지 중...")
     
-    # 웹소켓 연결 시작 (별도 스레드에서)
-    import threading
-    def start_ws_loop():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(ws_connect_loop())
+    # 웹소켓 이벤트 퍼블리셔 시작 (별도 스레드에서)
+    event_publisher.start()
+    
+    # 대시보드 델타 전송 스레드 (atexit은 역순이므로 쓰기 스레드보다 나중에 멈춤)
+    import atexit
+    change_feed.start()
+    atexit.register(change_feed.stop)
     
-    ws_thread = threading.Thread(target=start_ws_loop, daemon=True)
-    ws_thread.start()
+    # DB 쓰기 스레드 시작 (종료 시 남은 쓰기를 모두 커밋)
+    db.start_writer()
+    atexit.register(db.stop_writer)
     
-    socketio.run(app, host='0.0.0.0', port=18080, debug=True)
+    port = int(os.environ.get('PORT', '18080'))
+    socketio.run(app, host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Dashboard Endpoint Benchmark
+generate_data.py로 만든 대규모 데이터베이스에서 대시보드/관리자 조회 엔드포인트마다
+지연 시간(p50/p95/p99)과 처리량을 측정한다.
+
+- 기본: 각 엔드포인트가 호출하는 DatabaseManager/CohortAnalytics 메서드를 프로세스 안에서 직접 호출
+  (내보내기는 stream_export 본문을 끝까지 읽음)
+- --base-url: 실행 중인 API 서버에 HTTP로 요청 (서버는 AI_HELPER_DB_PATH로 같은 DB를 사용해야 함)
+
+요청마다 무작위 사용자/세션을 고르고, 직접 호출 모드는 기본적으로 진행률 캐시를 끄고 측정한다
+(--cache로 켤 수 있음). HTTP 모드는 If-None-Match를 보내지 않으므로 ETag 304는 발생하지 않는다.
+
+사용 예:
+    python generate_data.py --db bench.db --users 20000 --rounds 3
+    python bench_dashboard.py --db bench.db --requests 200
+    AI_HELPER_DB_PATH=bench.db python app.py &
+    python bench_dashboard.py --db bench.db --base-url http://localhost:18080
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import time
+import urllib.request
+from urllib.parse import urlencode
+
+# 코호트 비교 측정 기준
+COHORT_BY = ('test_type', 'round', 'month')
+
+# 응답 검색 측정용 검색어 (학습 데이터셋 답변에 자주 나오는 단어와 드문 단어)
+SEARCH_TERMS = ['친구', '공부', '없어', '재밌어', '잠을', '자신 없어', '걱정', '자해']
+
+
+def sample_ids(db_path, table, count, rng, where=''):
+    """rowid 범위에서 무작위로 골라 id 목록 반환 (ORDER BY random() 전체 스캔 없이)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+        if low is None:
+            return []
+        ids = []
+        for _ in range(count * 3):
+            row = conn.execute(f"SELECT id FROM {table} WHERE rowid >= ? {where} ORDER BY rowid LIMIT 1",
+                               (rng.randint(low, high),)).fetchone()
+            if row:
+                ids.append(row[0])
+            if len(ids) >= count:
+                break
+        return ids
+    finally:
+        conn.close()
+
+
+def deep_cursor(page_call, depth):
+    """depth번째 페이지의 커서 (keyset 페이지네이션이 깊은 페이지에서도 일정한지 확인용)"""
+    cursor = None
+    for _ in range(depth):
+        cursor = page_call(cursor)
+        if not cursor:
+            break
+    return cursor
+
+
+def drain_export(manager, dataset, fmt='csv', gzip=False, **filters):
+    """스트리밍 내보내기 본문을 끝까지 읽고 바이트 수 반환 (API 핸들러와 같은 경로)"""
+    from modules.stream_export import stream_export
+    columns, chunks = manager.export_rows(dataset, **filters)
+    return sum(len(data) for data in stream_export(columns, chunks, fmt, gzip=gzip))
+
+
+def build_direct_cases(manager, users, sessions, depth):
+    """엔드포인트별 (이름, 호출 함수) - 각 API 핸들러가 호출하는 DatabaseManager/CohortAnalytics 메서드"""
+    from modules.cohort_analytics import CohortAnalytics
+    analytics = CohortAnalytics(lambda: manager.connections.connection(readonly=True))
+    sessions_cursor = deep_cursor(lambda c: manager.get_all_sessions_page(100, c)['next_cursor'], depth)
+    users_cursor = deep_cursor(lambda c: manager.get_users_progress_page(limit=100, cursor=c)['next_cursor'], depth)
+    return [
+        ('GET /api/dashboard/stats', lambda rng: manager.get_dashboard_stats()),
+        ('GET /api/dashboard/sessions', lambda rng: manager.get_user_sessions_page(rng.choice(users), 50)),
+        ('GET /api/dashboard/progress/<user_id>', lambda rng: manager.get_user_progress_summary(rng.choice(users))),
+        ('GET /api/admin/all-sessions', lambda rng: manager.get_all_sessions_page(100)),
+        (f'GET /api/admin/all-sessions (page {depth + 1})',
+         lambda rng: manager.get_all_sessions_page(100, sessions_cursor)),
+        ('GET /api/admin/all-users-progress', lambda rng: manager.get_users_progress_page(limit=100)),
+        (f'GET /api/admin/all-users-progress (page {depth + 1})',
+         lambda rng: manager.get_users_progress_page(limit=100, cursor=users_cursor)),
+        ('GET /api/admin/all-users-progress?sort=username',
+         lambda rng: manager.get_users_progress_page(limit=100, sort='username')),
+        ('GET /api/admin/all-users-progress?q=', lambda rng: manager.get_users_progress_page(limit=100, search='user_1')),
+        ('GET /api/dashboard/session/<id>', lambda rng: manager.get_session_detail(rng.choice(sessions))),
+        ('GET /api/dashboard/session/<id>/grouped-scores',
+         lambda rng: manager.get_session_grouped_scores(rng.choice(sessions))),
+        ('GET /api/expert/search', lambda rng: manager.search_responses(rng.choice(SEARCH_TERMS), limit=50)),
+        ('GET /api/expert/search?test_type=&min_score=',
+         lambda rng: manager.search_responses(rng.choice(SEARCH_TERMS), test_type='bdi', min_score=2, limit=50)),
+        ('GET /api/dashboard/trends/<user_id>', lambda rng: manager.get_score_trends(rng.choice(users))),
+        ('GET /api/admin/analytics/distribution', lambda rng: analytics.distribution()),
+        ('GET /api/admin/analytics/distribution?test_type=&latest=1',
+         lambda rng: analytics.distribution(metric='gap_avg', test_type='bdi', latest=True)),
+        ('GET /api/admin/analytics/cohorts', lambda rng: analytics.compare(by=rng.choice(COHORT_BY))),
+        ('GET /api/admin/export/sessions?user_id=',
+         lambda rng: drain_export(manager, 'sessions', user_ids=[rng.choice(users)])),
+        ('GET /api/admin/export/responses?user_id=&format=jsonl',
+         lambda rng: drain_export(manager, 'responses', 'jsonl', user_ids=[rng.choice(users)])),
+        ('GET /api/admin/export/grouped_scores?compress=gzip',
+         lambda rng: drain_export(manager, 'grouped_scores', gzip=True, user_ids=rng.sample(users, min(20, len(users))))),
+    ]
+
+
+def http_get(base_url, path, params=None):
+    url = base_url.rstrip('/') + path + ('?' + urlencode(params) if params else '')
+    req = urllib.request.Request(url, headers={'Accept-Encoding': 'gzip'})
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        body = resp.read()
+        return resp.status, len(body), resp.headers.get('X-Next-Cursor')
+
+
+def build_http_cases(base_url, users, sessions, depth):
+    def next_cursor(path, key=None):
+        def call(cursor):
+            params = {'limit': 100}
+            if cursor:
+                params['cursor'] = cursor
+            url = base_url.rstrip('/') + path + '?' + urlencode(params)
+            with urllib.request.urlopen(url, timeout=60) as resp:
+                if key:
+                    return json.loads(resp.read()).get(key)
+                return resp.headers.get('X-Next-Cursor')
+        return call
+
+    sessions_cursor = deep_cursor(next_cursor('/api/admin/all-sessions'), depth)
+    users_cursor = deep_cursor(next_cursor('/api/admin/all-users-progress', 'next_cursor'), depth)
+    return [
+        ('GET /api/dashboard/stats', lambda rng: http_get(base_url, '/api/dashboard/stats')),
+        ('GET /api/dashboard/sessions',
+         lambda rng: http_get(base_url, '/api/dashboard/sessions', {'user_id': rng.choice(users)})),
+        ('GET /api/dashboard/progress/<user_id>',
+         lambda rng: http_get(base_url, f'/api/dashboard/progress/{rng.choice(users)}')),
+        ('GET /api/admin/all-sessions', lambda rng: http_get(base_url, '/api/admin/all-sessions')),
+        (f'GET /api/admin/all-sessions (page {depth + 1})',
+         lambda rng: http_get(base_url, '/api/admin/all-sessions', {'cursor': sessions_cursor} if sessions_cursor else None)),
+        ('GET /api/admin/all-users-progress', lambda rng: http_get(base_url, '/api/admin/all-users-progress')),
+        (f'GET /api/admin/all-users-progress (page {depth + 1})',
+         lambda rng: http_get(base_url, '/api/admin/all-users-progress', {'cursor': users_cursor} if users_cursor else None)),
+        ('GET /api/admin/all-users-progress?sort=username',
+         lambda rng: http_get(base_url, '/api/admin/all-users-progress', {'sort': 'username'})),
+        ('GET /api/admin/all-users-progress?q=',
+         lambda rng: http_get(base_url, '/api/admin/all-users-progress', {'q': 'user_1'})),
+        ('GET /api/dashboard/session/<id>',
+         lambda rng: http_get(base_url, f'/api/dashboard/session/{rng.choice(sessions)}')),
+        ('GET /api/dashboard/session/<id>/grouped-scores',
+         lambda rng: http_get(base_url, f'/api/dashboard/session/{rng.choice(sessions)}/grouped-scores')),
+        ('GET /api/expert/search',
+         lambda rng: http_get(base_url, '/api/expert/search', {'q': rng.choice(SEARCH_TERMS)})),
+        ('GET /api/expert/search?test_type=&min_score=',
+         lambda rng: http_get(base_url, '/api/expert/search',
+                              {'q': rng.choice(SEARCH_TERMS), 'test_type': 'bdi', 'min_score': 2})),
+        ('GET /api/dashboard/trends/<user_id>',
+         lambda rng: http_get(base_url, f'/api/dashboard/trends/{rng.choice(users)}')),
+        ('GET /api/admin/analytics/distribution', lambda rng: http_get(base_url, '/api/admin/analytics/distribution')),
+        ('GET /api/admin/analytics/distribution?test_type=&latest=1',
+         lambda rng: http_get(base_url, '/api/admin/analytics/distribution',
+                              {'metric': 'gap_avg', 'test_type': 'bdi', 'latest': 1})),
+        ('GET /api/admin/analytics/cohorts',
+         lambda rng: http_get(base_url, '/api/admin/analytics/cohorts', {'by': rng.choice(COHORT_BY)})),
+        ('GET /api/admin/export/sessions?user_id=',
+         lambda rng: http_get(base_url, '/api/admin/export/sessions', {'user_id': rng.choice(users)})),
+        ('GET /api/admin/export/responses?user_id=&format=jsonl',
+         lambda rng: http_get(base_url, '/api/admin/export/responses',
+                              {'user_id': rng.choice(users), 'format': 'jsonl'})),
+        ('GET /api/admin/export/grouped_scores?compress=gzip',
+         lambda rng: http_get(base_url, '/api/admin/export/grouped_scores',
+                              {'user_id': ','.join(rng.sample(users, min(20, len(users)))), 'compress': 'gzip'})),
+    ]
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+
+def measure(name, call, requests, warmup, rng):
+    for _ in range(warmup):
+        call(rng)
+    samples = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        t = time.perf_counter()
+        try:
+            call(rng)
+        except Exception as e:
+            errors += 1
+            if errors == 1:
+                print(f"  {name} 오류: {e}")
+        samples.append(time.perf_counter() - t)
+    duration = time.perf_counter() - started
+    samples.sort()
+    return {
+        'endpoint': name,
+        'requests': requests,
+        'errors': errors,
+        'rps': requests / duration if duration else 0.0,
+        'p50': percentile(samples, 0.50),
+        'p95': percentile(samples, 0.95),
+        'p99': percentile(samples, 0.99),
+        'max': samples[-1] * 1000 if samples else 0.0
+    }
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    users = sample_ids(args.db, 'users', args.sample, rng, "AND role = 'user'")
+    sessions = sample_ids(args.db, 'test_sessions', args.sample, rng, "AND status = 'completed'")
+    if not users or not sessions:
+        print("데이터가 없습니다. generate_data.py로 먼저 데이터를 생성하세요.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ('users', 'test_sessions', 'test_responses')}
+    conn.close()
+    print(f"데이터: 사용자 {counts['users']:,}명, 세션 {counts['test_sessions']:,}개, 응답 {counts['test_responses']:,}건")
+
+    manager = None
+    if args.base_url:
+        print(f"HTTP 모드: {args.base_url}")
+        cases = build_http_cases(args.base_url, users, sessions, args.depth)
+    else:
+        from database import DatabaseManager
+        manager = DatabaseManager(args.db, progress_cache_size=1024 if args.cache else 0)
+        print("직접 호출 모드 (DatabaseManager)")
+        cases = build_direct_cases(manager, users, sessions, args.depth)
+
+    if args.only:
+        cases = [case for case in cases if args.only in case[0]]
+
+    results = [measure(name, call, args.requests, args.warmup, rng) for name, call in cases]
+
+    print(f"\n{'엔드포인트':<60} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+    for r in results:
+        print(f"{r['endpoint']:<60} {r['rps']:>9.1f} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['p99']:>8.2f} "
+              f"{r['max']:>8.2f}" + (f"  오류 {r['errors']}" if r['errors'] else ''))
+
+    if manager is not None and args.profile:
+        print("\n[누적 시간 상위 SQL 문장]")
+        for statement in manager.profiler.top_statements(args.profile, sort='total'):
+            print(f"  {statement['total_ms']:>10.1f}ms  {statement['count']:>6}회  "
+                  f"p95 {statement['p95_ms']}ms  {statement['sql'][:100]}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'counts': counts, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="대시보드 엔드포인트 벤치마크")
+    parser.add_argument('--db', default='bench.db', help="generate_data.py로 만든 데이터베이스")
+    parser.add_argument('--base-url', help="API 서버 주소 (없으면 DatabaseManager 직접 호출)")
+    parser.add_argument('--requests', type=int, default=100, help="엔드포인트별 측정 요청 수")
+    parser.add_argument('--warmup', type=int, default=5, help="엔드포인트별 예열 요청 수")
+    parser.add_argument('--depth', type=int, default=20, help="깊은 페이지 측정 시 넘길 페이지 수")
+    parser.add_argument('--sample', type=int, default=500, help="무작위로 고를 사용자/세션 수")
+    parser.add_argument('--cache', action='store_true', help="직접 호출 모드에서 진행률 캐시 사용")
+    parser.add_argument('--only', help="이름에 이 문자열이 들어간 엔드포인트만 측정")
+    parser.add_argument('--profile', type=int, default=10, help="누적 시간 상위 SQL 문장 출력 수 (0이면 생략)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    raise SystemExit(run(args))
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - DB Micro-benchmark
+호출마다 연결을 새로 여는 기존 방식과 스레드별 연결 재사용(WAL + PRAGMA 튜닝) 방식의
+DatabaseManager 메서드 초당 호출 수를 비교한다.
+
+--users-progress N 옵션을 주면 N명의 사용자로 관리자 진행률 조회
+(기존 N+1 방식 vs 단일 그룹 쿼리 + keyset 페이지)를 비교한다.
+
+사용 예:
+    python bench_db.py --db ai_helper_eval.db --seconds 2
+    python bench_db.py --users-progress 100000
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from database import DatabaseManager, ConnectionManager, PersistenceWriter, _summarize_progress
+
+
+class LegacyConnectionManager(ConnectionManager):
+    """기존 동작 재현: 호출마다 sqlite3.connect, 기본 저널 모드, PRAGMA 없음"""
+
+    def open(self, readonly: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        self.opened_count += 1
+        return conn
+
+
+def build_manager(db_path, mode):
+    if mode == 'legacy':
+        # 일반 생성자로 만든 뒤(이후 추가되는 속성도 모두 초기화됨) 연결 방식만 기존 방식으로 교체
+        manager = DatabaseManager(db_path, pooled=False, progress_cache_size=0)  # 캐시 없이 매번 조회
+        manager.close()
+        # 시드 과정에서 설정된 WAL을 기존 기본값(rollback journal)으로 되돌림
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+        manager.connections = LegacyConnectionManager(db_path, pooled=False)
+        manager.writer = PersistenceWriter(manager.connections.open)
+        manager.profiler.configure(enabled=False)
+        return manager
+    return DatabaseManager(db_path, pooled=True)
+
+
+def seed(db_path):
+    """벤치마크용 최소 데이터 생성"""
+    manager = DatabaseManager(db_path)
+    user_id = manager.create_user('bench_user', 'bench@bench.local', 'bench')
+    session_id = manager.create_test_session(user_id, 'cdi', 20)
+    manager.close()
+    return user_id, session_id
+
+
+def measure(name, func, seconds):
+    calls = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        func()
+        calls += 1
+    elapsed = time.perf_counter() - started
+    return calls / elapsed
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix='bench_db_')
+    try:
+        results = {}
+        for mode in ('legacy', 'pooled'):
+            db_path = os.path.join(workdir, f"{mode}.db")
+            if args.db and os.path.exists(args.db):
+                shutil.copy(args.db, db_path)
+            user_id, session_id = seed(db_path)
+            manager = build_manager(db_path, mode)
+
+            cases = {
+                'get_user_by_id': lambda: manager.get_user_by_id(user_id),
+                'get_test_session': lambda: manager.get_test_session(session_id),
+                'get_user_progress_summary': lambda: manager.get_user_progress_summary(user_id),
+                'get_dashboard_stats': lambda: manager.get_dashboard_stats(),
+                'update_test_session': lambda: manager.update_test_session(session_id, completed_questions=1),
+            }
+            results[mode] = {name: measure(name, func, args.seconds) for name, func in cases.items()}
+            manager.connections.close_all()
+
+        print(f"{'메서드':<28}{'기존(calls/s)':>16}{'재사용(calls/s)':>18}{'배율':>8}")
+        for name in results['legacy']:
+            before = results['legacy'][name]
+            after = results['pooled'][name]
+            print(f"{name:<28}{before:>16.0f}{after:>18.0f}{after / before:>8.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def legacy_all_users_progress(manager):
+    """기존 get_all_users_progress 구현 (사용자마다 집계 쿼리 1회, N+1)"""
+    with manager._read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, username, email, full_name, role, created_at
+            FROM users WHERE role != 'admin' ORDER BY created_at DESC
+        """)
+        users = [dict(row) for row in cursor.fetchall()]
+        for user in users:
+            cursor.execute("""
+                SELECT test_type, COUNT(*) as total_sessions,
+                       SUM(completed_questions) as total_completed_questions,
+                       SUM(total_questions) as total_questions,
+                       MAX(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as is_completed,
+                       MAX(started_at) as last_activity
+                FROM test_sessions WHERE user_id = ? GROUP BY test_type
+            """, (user['id'],))
+            user['progress'] = _summarize_progress(cursor.fetchall())
+        return users
+
+
+def populate_users(manager, user_count, sessions_per_user=3):
+    """사용자 및 세션 대량 생성"""
+    base = datetime(2025, 1, 1)
+    users = []
+    sessions = []
+    for i in range(user_count):
+        user_id = str(uuid.uuid4())
+        created_at = (base + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S')
+        users.append((user_id, f"user{i}", f"user{i}@bench.local", 'x', f"사용자{i}", 'user', created_at))
+        for j, test_type in enumerate(('cdi', 'rcmas', 'bdi')[:sessions_per_user]):
+            sessions.append((str(uuid.uuid4()), user_id, test_type, 'completed', 20, 20, 10.0, created_at))
+    with manager._connection() as conn:
+        conn.executemany("""
+            INSERT INTO users (id, username, email, password_hash, full_name, role, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, users)
+        conn.executemany("""
+            INSERT INTO test_sessions (id, user_id, test_type, status, total_questions,
+                                       completed_questions, total_score, started_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, sessions)
+        conn.execute("ANALYZE")
+
+
+def best_of(func, repeat):
+    """func를 repeat번 실행하여 (마지막 결과, 가장 짧은 시간(초)) 반환"""
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run_users_progress(args):
+    workdir = tempfile.mkdtemp(prefix='bench_users_')
+    try:
+        manager = DatabaseManager(os.path.join(workdir, 'users.db'))
+        started = time.perf_counter()
+        populate_users(manager, args.users_progress)
+        print(f"사용자 {args.users_progress}명 생성: {time.perf_counter() - started:.1f}초")
+
+        # 전체 조회는 실행마다 편차가 커서 여러 번 중 가장 빠른 시간으로 비교
+        legacy, legacy_time = best_of(lambda: legacy_all_users_progress(manager), args.repeat)
+        everything, single_time = best_of(manager.get_all_users_progress, args.repeat)
+
+        started = time.perf_counter()
+        page = manager.get_users_progress_page(limit=100)
+        first_page_time = time.perf_counter() - started
+
+        cursor = page['next_cursor']
+        for _ in range(50):
+            cursor = manager.get_users_progress_page(limit=100, cursor=cursor)['next_cursor']
+        started = time.perf_counter()
+        manager.get_users_progress_page(limit=100, cursor=cursor)
+        deep_page_time = time.perf_counter() - started
+
+        print(f"{'방식':<32}{'사용자':>10}{'시간(ms)':>12}")
+        print(f"{'기존 N+1 전체 조회':<32}{len(legacy):>10}{legacy_time * 1000:>12.1f}")
+        print(f"{'목록 + 세션 1회 집계 전체 조회':<32}{len(everything):>10}{single_time * 1000:>12.1f}")
+        print(f"{'keyset 첫 페이지 (100명)':<32}{len(page['users']):>10}{first_page_time * 1000:>12.1f}")
+        print(f"{'keyset 52번째 페이지 (100명)':<32}{100:>10}{deep_page_time * 1000:>12.1f}")
+        print(f"total_users (카운터): {page['total_users']}")
+        manager.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="DatabaseManager 연결 관리 벤치마크")
+    parser.add_argument('--db', default='ai_helper_eval.db', help="복사해서 사용할 원본 데이터베이스")
+    parser.add_argument('--seconds', type=float, default=1.0, help="메서드별 측정 시간(초)")
+    parser.add_argument('--users-progress', type=int, default=0,
+                        help="지정한 사용자 수로 관리자 진행률 조회 벤치마크 실행")
+    parser.add_argument('--repeat', type=int, default=5, help="진행률 전체 조회 반복 횟수 (가장 빠른 시간 사용)")
+    args = parser.parse_args()
+    if args.users_progress:
+        run_users_progress(args)
+    else:
+        run(args)
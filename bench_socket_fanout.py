@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Socket.IO Cross-node Fan-out Benchmark
+여러 Socket.IO 노드 프로세스를 메시지 큐로 묶고, 한 노드에서 room으로 emit한 이벤트가
+다른 노드에 연결된 클라이언트까지 전달되는지와 전달 지연(p50/p95/p99)을 측정한다.
+
+노드는 app.py와 같은 socketio_queue_options()로 설정한 최소 Flask-SocketIO 앱이다.
+--queue를 주지 않으면 로컬 브로커(localqueue)를 띄워서 사용한다.
+
+사용 예:
+    python bench_socket_fanout.py --nodes 3 --clients 30 --messages 200
+    python bench_socket_fanout.py --queue redis://localhost:6379/0
+"""
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+ROOM = 'fanout-bench'
+
+
+def run_node(args):
+    """노드 프로세스: room 참여 핸들러와 emit 트리거용 HTTP 엔드포인트만 있는 앱"""
+    from flask import Flask, request, jsonify
+    from flask_socketio import SocketIO, join_room
+    from modules.socket_queue import socketio_queue_options
+
+    app = Flask(__name__)
+    socketio = SocketIO(app, cors_allowed_origins="*", **socketio_queue_options(args.queue))
+
+    @socketio.on('join')
+    def handle_join(data):
+        join_room(data.get('room', ROOM))
+        return True
+
+    @app.route('/emit', methods=['POST'])
+    def emit_event():
+        payload = request.get_json()
+        socketio.emit('fanout', {'seq': payload['seq'], 'sent': time.time(), 'origin': args.port},
+                      to=payload.get('room', ROOM))
+        return jsonify({'ok': True})
+
+    @app.route('/health')
+    def health():
+        return jsonify({'status': 'ok'})
+
+    socketio.run(app, host='127.0.0.1', port=args.port, allow_unsafe_werkzeug=True)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return True
+        except Exception:
+            time.sleep(0.2)
+    return False
+
+
+def post_json(url, payload):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'), method='POST')
+    req.add_header('Content-Type', 'application/json')
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.status
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+
+def run_benchmark(args):
+    import socketio
+
+    broker = None
+    queue_url = args.queue
+    if not queue_url:
+        from modules.socket_queue import LocalQueueBroker
+        broker = LocalQueueBroker(port=0).start()
+        queue_url = broker.url
+    print(f"메시지 큐: {queue_url}")
+
+    ports = [free_port() for _ in range(args.nodes)]
+    nodes = [subprocess.Popen([sys.executable, __file__, '--node', '--port', str(port), '--queue', queue_url])
+             for port in ports]
+    clients = []
+    try:
+        for port in ports:
+            if not wait_for(f"http://127.0.0.1:{port}/health"):
+                raise RuntimeError(f"노드 시작 실패: {port}")
+
+        lock = threading.Lock()
+        latencies = []
+        received = {}  # (클라이언트 노드 포트, 보낸 노드 포트) -> 수신 지연 목록
+
+        # 클라이언트를 노드들에 골고루 연결하고 같은 room에 참여
+        for i in range(args.clients):
+            port = ports[i % len(ports)]
+            client = socketio.Client()
+
+            def on_fanout(data, port=port):
+                elapsed = time.time() - data['sent']
+                with lock:
+                    latencies.append(elapsed)
+                    received.setdefault((port, data['origin']), []).append(elapsed)
+
+            client.on('fanout', on_fanout)
+            client.connect(f"http://127.0.0.1:{port}", transports=['websocket'])
+            client.call('join', {'room': ROOM})
+            clients.append(client)
+
+        origin = ports[0]
+        started = time.perf_counter()
+        for seq in range(args.messages):
+            post_json(f"http://127.0.0.1:{origin}/emit", {'seq': seq, 'room': ROOM})
+            if args.interval > 0:
+                time.sleep(args.interval)
+
+        expected = args.messages * args.clients
+        deadline = time.time() + args.timeout
+        while time.time() < deadline:
+            with lock:
+                if len(latencies) >= expected:
+                    break
+            time.sleep(0.05)
+        duration = time.perf_counter() - started
+
+        with lock:
+            ordered = sorted(latencies)
+            by_node = {key: sorted(values) for key, values in received.items()}
+
+        print(f"\n=== 노드 간 fan-out ({args.nodes}개 노드, 클라이언트 {args.clients}명, 메시지 {args.messages}개) ===")
+        print(f"전달: {len(ordered)}/{expected}  소요: {duration:.2f}초  "
+              f"처리량: {len(ordered) / duration:.0f} deliveries/s")
+        print(f"지연(ms) p50={percentile(ordered, 0.50):.1f} p95={percentile(ordered, 0.95):.1f} "
+              f"p99={percentile(ordered, 0.99):.1f} max={(ordered[-1] * 1000 if ordered else 0):.1f}")
+        print("\n[노드별 수신 (emit 노드 → 클라이언트 노드)]")
+        for port in ports:
+            kind = '같은 노드' if port == origin else '다른 노드'
+            values = by_node.get((port, origin), [])
+            print(f"  {origin} → {port} ({kind}): {len(values)}건  "
+                  f"p50={percentile(values, 0.50):.1f}ms p95={percentile(values, 0.95):.1f}ms")
+
+        cross_node = sum(len(values) for (port, _), values in by_node.items() if port != origin)
+        if args.nodes > 1 and cross_node == 0:
+            print("다른 노드로 전달된 이벤트가 없습니다. 메시지 큐 설정을 확인하세요.")
+            return 1
+        return 0 if len(ordered) >= expected else 1
+    finally:
+        # 클라이언트 종료는 연결마다 close 핸드셰이크를 기다리므로 동시에 진행
+        closers = [threading.Thread(target=client.disconnect) for client in clients]
+        for closer in closers:
+            closer.start()
+        for closer in closers:
+            closer.join(timeout=10)
+        for node in nodes:
+            node.terminate()
+        for node in nodes:
+            node.wait(timeout=10)
+        if broker is not None:
+            broker.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Socket.IO 메시지 큐 노드 간 fan-out 벤치마크")
+    parser.add_argument('--nodes', type=int, default=2, help="노드 프로세스 수")
+    parser.add_argument('--clients', type=int, default=10, help="클라이언트 수 (노드에 골고루 연결)")
+    parser.add_argument('--messages', type=int, default=100, help="room으로 보낼 메시지 수")
+    parser.add_argument('--interval', type=float, default=0.01, help="메시지 간 간격(초)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="모든 전달을 기다릴 최대 시간(초)")
+    parser.add_argument('--queue', help="메시지 큐 URL (없으면 로컬 브로커 사용)")
+    parser.add_argument('--node', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.node:
+        run_node(args)
+    else:
+        sys.exit(run_benchmark(args))
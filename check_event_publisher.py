@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Event Publisher Check
+실제 웹소켓 서버 대신 로컬 대체 객체(connect 주입)를 써서 EventPublisher의 동작을 확인한다.
+
+    1. publish()는 연결 상태와 관계없이 블로킹되지 않는다
+    2. 큐가 가득 차면 이벤트를 버리고 드롭 수를 센다
+    3. 연결 실패 시 지수 백오프(최대 backoff_max)로 재연결한다
+    4. 재연결 후 쌓여 있던 이벤트를 순서대로 배치 전송한다
+
+사용 예:
+    python check_event_publisher.py
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from modules.event_bus import EventPublisher
+
+
+class LocalWebSocket:
+    """websockets 연결 대체 객체: 보낸 메시지를 기록하고, close() 전까지 recv()는 대기"""
+
+    def __init__(self):
+        self.sent = []
+        self._closed = asyncio.Event()
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def recv(self):
+        await self._closed.wait()
+        raise ConnectionError("연결이 닫혔습니다.")
+
+    def close(self):
+        self._closed.set()
+
+
+class LocalServer:
+    """connect 팩토리: 처음 fail_times번은 연결 실패, 이후에는 LocalWebSocket 연결"""
+
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.attempts = []
+        self.sockets = []
+
+    def connect(self):
+        server = self
+
+        class _Connection:
+            async def __aenter__(self):
+                server.attempts.append(time.monotonic())
+                if len(server.attempts) <= server.fail_times:
+                    raise ConnectionRefusedError("로컬 서버 연결 거부")
+                websocket = LocalWebSocket()
+                server.sockets.append(websocket)
+                return websocket
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Connection()
+
+    def events(self):
+        return [event for websocket in self.sockets for message in websocket.sent for event in message['events']]
+
+
+def wait_until(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def check_publish_never_blocks(args):
+    """연결이 계속 실패하는 동안에도 publish()는 즉시 반환"""
+    server = LocalServer(fail_times=10 ** 9)
+    publisher = EventPublisher('ws://local', max_queue=args.events, connect=server.connect,
+                               backoff_initial=0.01, backoff_max=0.05)
+    publisher.start()
+    try:
+        started = time.perf_counter()
+        for i in range(args.events):
+            publisher.publish('check', i)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        publisher.stop()
+    per_event_us = elapsed_ms * 1000 / args.events
+    ok = per_event_us < args.max_publish_us and publisher.stats()['queue_depth'] == args.events
+    return ok, f"{args.events}건 {elapsed_ms:.1f}ms (건당 {per_event_us:.1f}µs), 큐 {publisher.stats()['queue_depth']}건"
+
+
+def check_drop_counting(args):
+    """큐가 가득 차면 드롭하고 published + dropped = 시도 수"""
+    publisher = EventPublisher('ws://local', max_queue=100, connect=LocalServer(fail_times=10 ** 9).connect)
+    accepted = sum(1 for i in range(150) if publisher.publish('check', i))
+    stats = publisher.stats()
+    ok = accepted == 100 and stats['published'] == 100 and stats['dropped'] == 50 and stats['queue_depth'] == 100
+    return ok, f"수락 {accepted}건, 드롭 {stats['dropped']}건, 큐 {stats['queue_depth']}건"
+
+
+def check_reconnect_backoff(args):
+    """연결 실패 간격이 initial, 2x, 4x ... 로 늘고 backoff_max에서 멈춘 뒤, 연결되면 밀린 이벤트 전송"""
+    initial, maximum, fail_times = 0.05, 0.2, 5
+    server = LocalServer(fail_times=fail_times)
+    publisher = EventPublisher('ws://local', connect=server.connect, batch_size=10, batch_interval=0.01,
+                               backoff_initial=initial, backoff_max=maximum)
+    for i in range(25):
+        publisher.publish('check', i)
+    publisher.start()
+    try:
+        delivered = wait_until(lambda: len(server.events()) == 25, timeout=5.0)
+    finally:
+        publisher.stop()
+        for websocket in server.sockets:
+            websocket.close()
+
+    gaps = [b - a for a, b in zip(server.attempts, server.attempts[1:])]
+    expected = [min(initial * 2 ** i, maximum) for i in range(fail_times)]
+    # 대기는 최소 예상 간격 이상이어야 하고, 스케줄링 지연을 감안해 여유를 둠
+    backoff_ok = len(gaps) >= fail_times and all(
+        want * 0.9 <= got <= want + args.slack for got, want in zip(gaps, expected))
+    order_ok = [event['data'] for event in server.events()] == list(range(25))
+    stats = publisher.stats()
+    ok = delivered and backoff_ok and order_ok and stats['reconnects'] == fail_times
+    detail = (f"간격(초) {[round(gap, 3) for gap in gaps[:fail_times]]} / 예상 {expected}, "
+              f"재연결 {stats['reconnects']}회, 전송 {stats['sent']}건({stats['batches']}배치), 순서 {'유지' if order_ok else '깨짐'}")
+    return ok, detail
+
+
+CHECKS = [
+    ("publish 비블로킹", check_publish_never_blocks),
+    ("큐 초과 드롭 카운트", check_drop_counting),
+    ("재연결 지수 백오프", check_reconnect_backoff),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EventPublisher 동작 확인 (로컬 웹소켓 대체 객체 사용)")
+    parser.add_argument('--events', type=int, default=10000, help="비블로킹 확인에 쓸 이벤트 수")
+    parser.add_argument('--max-publish-us', type=float, default=100.0, help="publish() 건당 허용 시간(µs)")
+    parser.add_argument('--slack', type=float, default=0.1, help="백오프 간격 허용 오차(초)")
+    args = parser.parse_args()
+
+    failed = 0
+    for name, check in CHECKS:
+        ok, detail = check(args)
+        print(f"[{'OK' if ok else 'FAIL'}] {name}: {detail}")
+        failed += not ok
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
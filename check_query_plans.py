@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Query Plan Check
+주요 조회 쿼리(database.HOT_QUERIES)의 EXPLAIN QUERY PLAN에서 인덱스 없는 전체 스캔(SCAN)이나
+준비 오류가 있으면 실패(종료 코드 1)한다. 메서드들이 같은 문장을 실행하므로 인덱스/쿼리 변경 후
+CI에서 돌리면 된다.
+
+--db를 주지 않으면 임시 파일에 마이그레이션만 적용한 빈 데이터베이스로 확인한다.
+
+사용 예:
+    python check_query_plans.py
+    python check_query_plans.py --db ai_helper_eval.db --verbose
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from database import DatabaseManager, HOT_QUERIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주요 쿼리 실행 계획 검사")
+    parser.add_argument('--db', help="검사할 데이터베이스 (기본: 임시 빈 데이터베이스)")
+    parser.add_argument('--verbose', action='store_true', help="모든 쿼리의 실행 계획 출력")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(args.db or os.path.join(temp_dir, 'plans.db'))
+        try:
+            problems = manager.verify_query_plans()
+            if args.verbose:
+                for name, (sql, params) in HOT_QUERIES.items():
+                    if name not in problems:
+                        print(f"[OK] {name}")
+                        for step in manager.explain_query_plan(sql, params):
+                            print(f"       {step}")
+        finally:
+            manager.close()
+
+    for name, plan in problems.items():
+        print(f"[FAIL] {name}")
+        for step in plan:
+            print(f"       {step}")
+    print(f"\n주요 쿼리 {len(HOT_QUERIES)}개 중 전체 스캔/오류 {len(problems)}개")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Dashboard Rollup Consistency Check
+트리거로 유지되는 대시보드 롤업(dashboard_rollups)을 원본 테이블에서 다시 계산한 값과 비교한다.
+
+사용 예:
+    python check_rollups.py --db ai_helper_eval.db
+    python check_rollups.py --db ai_helper_eval.db --repair
+"""
+
+import argparse
+import sys
+
+from database import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 롤업 정합성 검사")
+    parser.add_argument('--db', default='ai_helper_eval.db', help="검사할 데이터베이스")
+    parser.add_argument('--repair', action='store_true', help="차이가 있으면 롤업을 다시 계산하여 덮어씀")
+    args = parser.parse_args()
+
+    manager = DatabaseManager(args.db)
+    try:
+        differences = manager.check_dashboard_rollups(repair=args.repair)
+    finally:
+        manager.close()
+
+    if not differences:
+        print("롤업이 원본 데이터와 일치합니다.")
+        return 0
+
+    print(f"{'범위':<10}{'항목':<18}{'저장된 값':>14}{'재계산 값':>14}")
+    for scope, fields in differences.items():
+        for field, (stored, expected) in fields.items():
+            print(f"{scope:<10}{field:<18}{stored:>14}{expected:>14}")
+    if args.repair:
+        print("롤업을 다시 계산한 값으로 복구했습니다.")
+        return 0
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
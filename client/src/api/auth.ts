@@ -25,6 +25,7 @@ export interface RegisterRequest {
 export interface AuthResponse {
   user: User;
   message: string;
+  socket_token: string;  // 대시보드 델타 구독용 토큰
 }
 
 export const authAPI = {
@@ -41,6 +42,7 @@ export const authAPI = {
   logout: () => {
     localStorage.removeItem('auth_token');
     localStorage.removeItem('user');
+    localStorage.removeItem('socket_token');
   },
 
   getCurrentUser: (): User | null => {
@@ -54,5 +56,11 @@ export const authAPI = {
 
   setUser: (user: User) => {
     localStorage.setItem('user', JSON.stringify(user));
+  },
+
+  getSocketToken: (): string | null => localStorage.getItem('socket_token'),
+
+  setSocketToken: (token: string) => {
+    localStorage.setItem('socket_token', token);
   }
 };
@@ -37,6 +37,83 @@ export interface ExpertFeedback {
   expert_username: string;
 }
 
+export interface ResponseSearchResult extends Omit<TestResponse, 'detected_intent'> {
+  user_id: string;
+  username?: string;
+  test_type: string;
+}
+
+export interface ResponseSearchParams {
+  q: string;
+  test_type?: string;
+  min_score?: number;
+  max_score?: number;
+  date_from?: string; // YYYY-MM-DD
+  date_to?: string;   // YYYY-MM-DD (포함)
+  limit?: number;
+  cursor?: string;
+}
+
+// 점수 추이 포인트 (여러 세션을 합친 구간이면 sessions > 1, first_completed_at 포함)
+export interface ScoreTrendPoint {
+  completed_at: string;
+  sessions: number;
+  session_round: number;
+  total_score: number;
+  ai_avg: number | null;
+  expert_avg: number | null;
+  session_id?: string;
+  first_completed_at?: string;
+}
+
+export interface ScoreTrends {
+  user_id: string;
+  date_from: string | null;
+  date_to: string | null;
+  points: number;
+  series: { [testType: string]: ScoreTrendPoint[] };
+  downsampled: { [testType: string]: boolean };
+}
+
+// 모집단 점수 분석 (완료된 세션 기준)
+export type AnalyticsMetric = 'total_score' | 'ai_avg' | 'expert_avg' | 'gap_avg';
+
+export interface AnalyticsFilter {
+  metric?: AnalyticsMetric;
+  test_type?: string;
+  date_from?: string; // YYYY-MM-DD
+  date_to?: string;   // YYYY-MM-DD (포함)
+  latest?: '1';       // 사용자별 가장 최근 세션만
+}
+
+export interface ScoreDistribution {
+  metric: AnalyticsMetric;
+  test_type: string | null;
+  sessions: number;
+  users: number;
+  count: number;
+  mean: number | null;
+  std: number | null;
+  min: number | null;
+  max: number | null;
+  percentiles: { [key: string]: number };  // p10, p25, p50, ...
+  histogram: { counts: number[]; edges: number[] };
+}
+
+export interface CohortComparison {
+  by: 'test_type' | 'round' | 'month';
+  metric: AnalyticsMetric;
+  test_type: string | null;
+  groups: Array<{
+    cohort: string | number;
+    count: number;
+    mean: number | null;
+    p25: number | null;
+    median: number | null;
+    p75: number | null;
+  }>;
+}
+
 export interface DashboardStats {
   overall_stats: {
     total_sessions: number;
@@ -63,23 +140,24 @@ export const dashboardAPI = {
     return response.data;
   },
 
-  getUserSessions: async (userId: string, limit: number = 50): Promise<TestSession[]> => {
+  // 다음 페이지 커서는 응답 헤더 X-Next-Cursor로 전달됨
+  getUserSessions: async (userId: string, limit: number = 50, cursor?: string): Promise<TestSession[]> => {
     console.log('API: Getting user sessions for:', userId);
     const response = await apiClient.get('/dashboard/sessions', {
-      params: { user_id: userId, limit }
+      params: { user_id: userId, limit, cursor }
     });
     console.log('API: User sessions response:', response.data);
     return response.data;
   },
 
-  getAllSessions: async (limit: number = 100): Promise<Array<TestSession & {
+  getAllSessions: async (limit: number = 100, cursor?: string): Promise<Array<TestSession & {
     username: string;
     email: string;
     full_name?: string;
   }>> => {
     console.log('API: Getting all sessions');
     const response = await apiClient.get('/admin/all-sessions', {
-      params: { limit }
+      params: { limit, cursor }
     });
     console.log('API: All sessions response:', response.data);
     return response.data;
@@ -106,7 +184,25 @@ export const dashboardAPI = {
     return response.data;
   },
 
-  getAllUsersProgress: async (): Promise<{
+  // 테스트 유형별 점수 추이 (서버에서 미리 계산, 기간이 길면 points개로 줄여서 반환)
+  getScoreTrends: async (userId: string, params: {
+    date_from?: string; // YYYY-MM-DD
+    date_to?: string;   // YYYY-MM-DD (포함)
+    points?: number;
+    test_type?: string;
+  } = {}): Promise<ScoreTrends> => {
+    const response = await apiClient.get(`/dashboard/trends/${userId}`, { params });
+    return response.data;
+  },
+
+  getAllUsersProgress: async (params: {
+    limit?: number;
+    cursor?: string;
+    sort?: 'created_at' | 'username';
+    order?: 'asc' | 'desc';
+    role?: string;
+    q?: string;
+  } = {}): Promise<{
     users: Array<{
       id: string;
       username: string;
@@ -132,8 +228,19 @@ export const dashboardAPI = {
       };
     }>;
     total_users: number;
+    next_cursor: string | null;
   }> => {
-    const response = await apiClient.get('/admin/all-users-progress');
+    const response = await apiClient.get('/admin/all-users-progress', { params });
+    return response.data;
+  },
+
+  getScoreDistribution: async (params: AnalyticsFilter & { bins?: number; round?: number } = {}): Promise<ScoreDistribution> => {
+    const response = await apiClient.get('/admin/analytics/distribution', { params });
+    return response.data;
+  },
+
+  getCohortComparison: async (params: AnalyticsFilter & { by?: CohortComparison['by'] } = {}): Promise<CohortComparison> => {
+    const response = await apiClient.get('/admin/analytics/cohorts', { params });
     return response.data;
   },
 
@@ -177,5 +284,41 @@ export const dashboardAPI = {
     const response = await apiClient.put(`/expert/score/${responseId}`, { score });
     console.log('API: Expert score update response:', response.data);
     return response.data;
+  },
+
+  // 여러 응답의 전문가 점수를 한 번에 업데이트 (항목별 결과 반환)
+  updateExpertScores: async (
+    scores: Array<{ response_id: string; score: number; comment?: string }>,
+    expertId?: string
+  ): Promise<{
+    message: string;
+    updated: number;
+    failed: number;
+    results: Array<{ response_id: string; ok: boolean; error?: string }>;
+  }> => {
+    const response = await apiClient.put('/expert/scores', { scores, expert_id: expertId });
+    return response.data;
+  },
+
+  // 응답 전문 검색 (최신순, next_cursor로 다음 페이지)
+  searchResponses: async (params: ResponseSearchParams): Promise<{
+    results: ResponseSearchResult[];
+    next_cursor: string | null;
+  }> => {
+    const response = await apiClient.get('/expert/search', { params });
+    return response.data;
+  },
+
+  // 스트리밍 내보내기 다운로드 URL (axios로 받으면 전체를 메모리에 모으므로 링크/창으로 열어서 받음)
+  getExportUrl: (dataset: 'sessions' | 'responses' | 'grouped_scores', params: {
+    format?: 'csv' | 'jsonl';
+    compress?: 'gzip';
+    user_id?: string;   // 쉼표로 구분한 사용자 ID 목록
+    test_type?: string;
+    status?: string;
+    date_from?: string; // YYYY-MM-DD (세션 시작일)
+    date_to?: string;   // YYYY-MM-DD (포함)
+  } = {}): string => {
+    return apiClient.getUri({ url: `/admin/export/${dataset}`, params });
   }
 };
@@ -28,6 +28,7 @@ const LoginForm: React.FC<LoginFormProps> = ({ onLoginSuccess, onSwitchToRegiste
       const response = await authAPI.login(formData);
       authAPI.setAuthToken(response.message); // message 필드에 토큰이 있다고 가정
       authAPI.setUser(response.user);
+      authAPI.setSocketToken(response.socket_token);
       onLoginSuccess(response.user);
     } catch (err: any) {
       setError(err.response?.data?.error || '로그인에 실패했습니다.');
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { dashboardAPI } from '../../api/dashboard';
+import { useDashboardFeed, DashboardDelta } from '../../hooks/useDashboardFeed';
 
 // 타입 정의를 인라인으로 이동
 interface User {
@@ -47,6 +48,9 @@ interface AdminUserProgressProps {
 
 const AdminUserProgress: React.FC<AdminUserProgressProps> = ({ currentUser, onViewUserStats, overallProgressSummary }) => {
   const [users, setUsers] = useState<UserWithProgress[]>([]);
+  const [totalUsers, setTotalUsers] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
@@ -56,11 +60,37 @@ const AdminUserProgress: React.FC<AdminUserProgressProps> = ({ currentUser, onVi
     loadAllUsersProgress();
   }, [currentUser.id]); // currentUser.id 변경 시 다시 로드
 
+  // 세션이 바뀐 사용자의 진행률만 다시 조회하여 교체 (전체 목록 재조회 없음)
+  // 목록을 불러온 뒤 가입한 사용자는 첫 페이지(최신 가입순)를 다시 받아 목록 앞에 추가
+  useDashboardFeed(currentUser.id, async (deltas: DashboardDelta[]) => {
+    const changedUserIds = new Set<string>();
+    deltas.forEach(delta => {
+      if ((delta.type === 'session_created' || delta.type === 'session_updated') && delta.data.user_id) {
+        changedUserIds.add(delta.data.user_id);
+      }
+    });
+    const knownUserIds = new Set(users.map(u => u.id));
+    if (Array.from(changedUserIds).some(userId => !knownUserIds.has(userId))) {
+      await refreshFirstPage();
+    }
+    for (const userId of changedUserIds) {
+      if (!knownUserIds.has(userId)) continue;
+      try {
+        const progress = await dashboardAPI.getUserProgress(userId);
+        setUsers(prev => prev.map(u => (u.id === userId ? { ...u, progress } : u)));
+      } catch (err) {
+        console.error('Error refreshing user progress:', err);
+      }
+    }
+  });
+
   const loadAllUsersProgress = async () => {
     try {
       setLoading(true);
       const response = await dashboardAPI.getAllUsersProgress();
       setUsers(response.users || []);
+      setTotalUsers(response.total_users || 0);
+      setNextCursor(response.next_cursor || null);
     } catch (err: any) {
       setError(err.response?.data?.error || '사용자 진행률을 불러오는데 실패했습니다.');
     } finally {
@@ -68,6 +98,36 @@ const AdminUserProgress: React.FC<AdminUserProgressProps> = ({ currentUser, onVi
     }
   };
 
+  // 첫 페이지를 다시 받아 모르는 사용자는 앞에 추가하고, 이미 있는 사용자는 새 값으로 교체
+  const refreshFirstPage = async () => {
+    try {
+      const response = await dashboardAPI.getAllUsersProgress();
+      const fresh = response.users || [];
+      const freshById = new Map(fresh.map(u => [u.id, u]));
+      setUsers(prev => {
+        const known = new Set(prev.map(u => u.id));
+        return [...fresh.filter(u => !known.has(u.id)), ...prev.map(u => freshById.get(u.id) || u)];
+      });
+      setTotalUsers(response.total_users || 0);
+    } catch (err) {
+      console.error('Error refreshing user list:', err);
+    }
+  };
+
+  const loadMoreUsers = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const response = await dashboardAPI.getAllUsersProgress({ cursor: nextCursor });
+      setUsers(prev => [...prev, ...(response.users || [])]);
+      setNextCursor(response.next_cursor || null);
+    } catch (err: any) {
+      setError(err.response?.data?.error || '사용자 진행률을 불러오는데 실패했습니다.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getTestTypeLabel = (testType: string) => {
     switch (testType) {
       case 'cdi':
@@ -143,7 +203,7 @@ const AdminUserProgress: React.FC<AdminUserProgressProps> = ({ currentUser, onVi
           </h3>
           <div className="flex items-center space-x-4">
             <span className="text-sm text-gray-500">
-              총 {users.length}명의 사용자
+              총 {totalUsers || users.length}명의 사용자
             </span>
             <button
               onClick={loadAllUsersProgress}
@@ -308,6 +368,17 @@ const AdminUserProgress: React.FC<AdminUserProgressProps> = ({ currentUser, onVi
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <div className="text-center mt-4">
+                <button
+                  onClick={loadMoreUsers}
+                  disabled={loadingMore}
+                  className="btn-unified btn-unified-ghost btn-unified-sm"
+                >
+                  {loadingMore ? '불러오는 중...' : '더 보기'}
+                </button>
+              </div>
+            )}
           </div>
         )}
 
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { dashboardAPI } from '../../api/dashboard';
+import { useDashboardFeed, DashboardDelta } from '../../hooks/useDashboardFeed';
 // User 인터페이스를 인라인으로 정의
 interface User {
   id: string;
@@ -51,6 +52,25 @@ const SessionList: React.FC<SessionListProps> = ({ user, onViewDetailedReport })
     loadSessions();
   }, [user.id]);
 
+  // 서버 델타로 목록 갱신 (폴링 대신): 변경된 세션만 병합, 새 세션이 생기면 목록 다시 조회
+  useDashboardFeed(user.id, (deltas: DashboardDelta[]) => {
+    if (deltas.some(delta => delta.type === 'session_created')) {
+      loadSessions();
+      return;
+    }
+    const updates = new Map<string, Partial<TestSession>>();
+    deltas.forEach(delta => {
+      if (delta.type === 'session_updated') {
+        updates.set(delta.data.id, delta.data);
+      }
+    });
+    if (updates.size > 0) {
+      setSessions(prev => prev.map(session =>
+        updates.has(session.id) ? { ...session, ...updates.get(session.id) } : session
+      ));
+    }
+  });
+
   const loadSessions = async () => {
     try {
       setLoading(true);
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { dashboardAPI } from '../../api/dashboard';
+import { dashboardAPI, ScoreTrends, ScoreTrendPoint } from '../../api/dashboard';
 import {
   Chart as ChartJS,
   CategoryScale,
@@ -70,6 +70,7 @@ interface UserTestStatsProps {
 
 const UserTestStats: React.FC<UserTestStatsProps> = ({ user, onBack }) => {
   const [sessions, setSessions] = useState<TestSession[]>([]);
+  const [trends, setTrends] = useState<ScoreTrends | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -80,8 +81,13 @@ const UserTestStats: React.FC<UserTestStatsProps> = ({ user, onBack }) => {
   const loadUserSessions = async () => {
     try {
       setLoading(true);
-      const response = await dashboardAPI.getUserSessions(user.id);
+      // 점수 추이는 서버에서 미리 계산된 값을 사용 (실패하면 세션 목록으로 그림)
+      const [response, trendData] = await Promise.all([
+        dashboardAPI.getUserSessions(user.id),
+        dashboardAPI.getScoreTrends(user.id).catch(() => null)
+      ]);
       setSessions(response);
+      setTrends(trendData);
     } catch (err: any) {
       console.error('Error loading user sessions:', err);
       setError('세션 정보를 불러오는데 실패했습니다.');
@@ -98,6 +104,18 @@ const UserTestStats: React.FC<UserTestStatsProps> = ({ user, onBack }) => {
     return 'text-red-600'; // 낮은 점수
   };
 
+  // 그래프 포인트 (오름차순): 서버 추이가 있으면 사용, 없으면 세션 목록에서 계산
+  const getTrendPoints = (testType: string, testSessions: TestSession[]): ScoreTrendPoint[] =>
+    trends?.series[testType] ??
+    [...testSessions].sort((a, b) => a.session_round - b.session_round).map(session => ({
+      completed_at: session.completed_at || session.started_at,
+      sessions: 1,
+      session_round: session.session_round,
+      total_score: session.total_score,
+      ai_avg: null,
+      expert_avg: null
+    }));
+
   // 테스트 타입별로 그룹화
   const groupedSessions = sessions.reduce((acc, session) => {
     if (!acc[session.test_type]) {
@@ -207,9 +225,8 @@ const UserTestStats: React.FC<UserTestStatsProps> = ({ user, onBack }) => {
                   <div className="h-80">
                     <Line
                       data={{
-                        // 그래프 라벨은 오름차순으로 유지하기 위해 정렬된 세션의 복사본을 만들어 사용
-                        labels: [...testSessions].sort((a, b) => a.session_round - b.session_round).map(session => 
-                          `${session.session_round}회차\n${new Date(session.completed_at || session.started_at).toLocaleDateString('ko-KR', {
+                        labels: getTrendPoints(testType, testSessions).map(point =>
+                          `${point.session_round}회차\n${new Date(point.completed_at.replace(' ', 'T')).toLocaleDateString('ko-KR', {
                             month: 'short',
                             day: 'numeric'
                           })}`
@@ -217,8 +234,7 @@ const UserTestStats: React.FC<UserTestStatsProps> = ({ user, onBack }) => {
                         datasets: [
                           {
                             label: '점수',
-                            // 데이터 역시 오름차순으로 유지하기 위해 정렬된 세션의 복사본을 만들어 사용
-                            data: [...testSessions].sort((a, b) => a.session_round - b.session_round).map(session => session.total_score),
+                            data: getTrendPoints(testType, testSessions).map(point => point.total_score),
                             borderColor: '#4f46e5', // indigo-600
                             backgroundColor: 'rgba(79, 70, 229, 0.1)', // indigo-600 with 0.1 opacity
                             borderWidth: 3,
@@ -250,7 +266,12 @@ const UserTestStats: React.FC<UserTestStatsProps> = ({ user, onBack }) => {
                                 return context[0].label.replace('\n', ' - ');
                               },
                               label: function(context) {
-                                return `점수: ${context.parsed.y.toFixed(1)}`;
+                                const point = getTrendPoints(testType, testSessions)[context.dataIndex];
+                                const averages = [
+                                  point?.ai_avg != null ? `AI 평균 ${point.ai_avg.toFixed(2)}` : null,
+                                  point?.expert_avg != null ? `전문가 평균 ${point.expert_avg.toFixed(2)}` : null
+                                ].filter(Boolean).join(' / ');
+                                return `점수: ${context.parsed.y.toFixed(1)}${averages ? ` (${averages})` : ''}`;
                               }
                             }
                           }
@@ -0,0 +1,46 @@
+import { useEffect, useRef } from 'react';
+import { io } from 'socket.io-client';
+import { authAPI } from '../api/auth';
+
+export interface DashboardDelta {
+    type: 'session_created' | 'session_updated' | 'response_saved' | 'expert_score_updated';
+    data: any;
+    ts: number;
+}
+
+// 서버가 DB 변경 시 보내는 대시보드 델타(dashboard_delta)를 구독
+// 관리자/전문가는 전체 변경을, 일반 사용자는 본인 변경만 받는다.
+// 구독에는 로그인 응답으로 받은 socket_token이 필요하다 (토큰의 사용자로만 구독됨).
+export const useDashboardFeed = (
+    userId: string | undefined,
+    onDeltas: (deltas: DashboardDelta[]) => void,
+    url: string = 'http://localhost:5001'
+) => {
+    const handlerRef = useRef(onDeltas);
+    handlerRef.current = onDeltas;
+
+    useEffect(() => {
+        if (!userId) return;
+
+        const socket = io(url, {
+            transports: ['websocket', 'polling'],
+            timeout: 20000
+        });
+
+        // 재연결 시에도 다시 구독
+        socket.on('connect', () => {
+            socket.emit('subscribe_dashboard', { user_id: userId, token: authAPI.getSocketToken() });
+        });
+
+        socket.on('dashboard_delta', (payload: { deltas: DashboardDelta[] }) => {
+            if (payload?.deltas?.length) {
+                handlerRef.current(payload.deltas);
+            }
+        });
+
+        return () => {
+            socket.emit('unsubscribe_dashboard', { user_id: userId });
+            socket.close();
+        };
+    }, [userId, url]);
+};
@@ -5,113 +5,2307 @@ SQLite 데이터베이스를 사용한 사용자 계정 및 테스트 히스토
 
 import sqlite3
 import uuid
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Callable, Iterator
 import json
+import base64
+import functools
 import hashlib
+import math
 import os
+import re
+from collections import Counter, OrderedDict, deque
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """실행 시간을 QueryProfiler에 기록하는 커서
+
+    결과 행이 있는 문장은 첫 fetch가 끝날 때까지의 시간을 문장 시간으로 기록한다
+    (SQLite는 execute 시점에 첫 행만 계산하고 나머지는 fetch하면서 계산하기 때문).
+    fetch 없이 순회만 한 경우에는 다음 execute나 close 시점에 execute 시간만 기록된다.
+    """
+    
+    _pending = None
+    
+    def _finish(self, extra: float = 0.0, rows: int = 0):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        sql, params, elapsed = pending
+        profiler = self.connection.profiler
+        if profiler is not None:
+            profiler.record_statement(self.connection, sql, params, elapsed + extra, rows)
+    
+    def execute(self, sql, parameters=()):
+        self._finish()
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        self._pending = (sql, parameters, time.perf_counter() - started)
+        if self.description is None:
+            self._finish(rows=max(self.rowcount, 0))
+        return self
+    
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        started = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        # 실행 계획 조회용으로 첫 행의 파라미터만 남김
+        first = seq_of_parameters[0] if isinstance(seq_of_parameters, (list, tuple)) and seq_of_parameters else ()
+        self._pending = (sql, first, time.perf_counter() - started)
+        self._finish(rows=max(self.rowcount, 0))
+        return self
+    
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._finish(time.perf_counter() - started, 0 if row is None else 1)
+        return row
+    
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._finish(time.perf_counter() - started, len(rows))
+        return rows
+    
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._finish(time.perf_counter() - started, len(rows))
+        return rows
+    
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """cursor()/execute()가 ProfiledCursor를 사용하는 연결"""
+    
+    profiler = None
+    
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+    
+    # 기본 Connection.execute()는 cursor()를 거치지 않고 기본 커서를 만들기 때문에 직접 구현
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class ConnectionManager:
+    """스레드별 SQLite 연결 관리
+
+    스레드마다 읽기/쓰기 연결과 읽기 전용 연결을 하나씩 유지하여 매 호출마다
+    연결을 새로 여는 비용을 없애고, 연결별 prepared statement 캐시를 재사용한다.
+    WAL 모드에서는 읽기 전용 연결(대시보드 조회)이 쓰기를 막지 않는다.
+
+    스레드별 연결은 스레드가 끝나면(thread-local 해제 시) 바로 닫히므로 요청마다 스레드를
+    만드는 서버에서도 연결/파일 디스크립터가 쌓이지 않는다. open()으로 직접 연 연결은
+    관리 대상이 아니며 연 쪽에서 닫아야 한다.
+    """
+    
+    PRAGMAS = (
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA busy_timeout = 5000",
+        "PRAGMA cache_size = -20000",       # 약 20MB 페이지 캐시
+        "PRAGMA mmap_size = 268435456",     # 256MB 메모리 매핑
+        "PRAGMA temp_store = MEMORY",
+    )
+    
+    def __init__(self, db_path: str, pooled: bool = True, cached_statements: int = 256,
+                 profiler: 'QueryProfiler' = None):
+        self.db_path = db_path
+        self.pooled = pooled
+        self.cached_statements = cached_statements
+        self.profiler = profiler
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = set()
+        self._wal_enabled = False
+        self.opened_count = 0
+        self.closed_count = 0
+    
+    def open(self, readonly: bool = False) -> sqlite3.Connection:
+        """설정이 적용된 새 연결 생성"""
+        if readonly and self.db_path != ':memory:':
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.db_path)}?mode=ro", uri=True,
+                                   check_same_thread=False, cached_statements=self.cached_statements,
+                                   factory=ProfiledConnection)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=self.cached_statements, factory=ProfiledConnection)
+        conn.row_factory = sqlite3.Row
+        conn.profiler = self.profiler
+        if not readonly and not self._wal_enabled:
+            # journal_mode는 데이터베이스 파일에 유지되므로 한 번만 설정
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._wal_enabled = True
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self.opened_count += 1
+        return conn
+    
+    def _release(self, conn: sqlite3.Connection):
+        """스레드별 연결 종료 및 관리 목록에서 제거 (스레드 종료 시 또는 close_all)"""
+        with self._lock:
+            if conn not in self._connections:
+                return
+            self._connections.discard(conn)
+            self.closed_count += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def get(self, readonly: bool = False) -> sqlite3.Connection:
+        """현재 스레드의 연결 반환 (없으면 생성)"""
+        if not self.pooled:
+            return self.open(readonly)
+        attr = 'ro_conn' if readonly else 'rw_conn'
+        conn = getattr(self._local, attr, None)
+        if conn is None:
+            conn = self.open(readonly)
+            # 스레드가 끝나면 thread-local 값이 해제되면서 연결도 닫힘
+            holder = _ThreadConnection(conn)
+            weakref.finalize(holder, self._release, conn)
+            with self._lock:
+                self._connections.add(conn)
+            setattr(self._local, attr, holder)
+            return conn
+        return conn.conn
+    
+    @contextmanager
+    def connection(self, readonly: bool = False):
+        """트랜잭션 범위의 연결 (정상 종료 시 커밋, 예외 시 롤백)"""
+        conn = self.get(readonly)
+        try:
+            with conn:
+                yield conn
+        finally:
+            if not self.pooled:
+                conn.close()
+    
+    def close_all(self):
+        """관리 중인 모든 스레드별 연결 종료"""
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            self._release(conn)
+        self._local = threading.local()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'pooled': self.pooled,
+                'open_thread_connections': len(self._connections),
+                'opened': self.opened_count,
+                'closed': self.closed_count
+            }
+
+
+class _ThreadConnection:
+    """thread-local에 보관하는 연결 홀더 (해제되면 finalize로 연결을 닫기 위한 약한 참조 대상)"""
+    
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class PersistenceWriter:
+    """단일 쓰기 스레드 (write-behind + group commit)
+
+    요청 핸들러는 쓰기 작업(cursor를 받는 함수)을 큐에 넣고 바로 반환한다.
+    쓰기 스레드는 group_interval 동안 모인 작업을 하나의 트랜잭션으로 적용하여
+    커밋/fsync 횟수와 SQLite 잠금 경합을 줄인다.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, connect: Callable, group_interval: float = 0.005, max_batch: int = 256):
+        self._connect = connect
+        self.group_interval = group_interval
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        
+        self.committed_ops = 0
+        self.committed_groups = 0
+        self.failed_ops = 0
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """쓰기 스레드 시작"""
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+    
+    def submit(self, op: Callable) -> Future:
+        """쓰기 작업 등록 (Future는 커밋 후 결과/예외로 완료됨)"""
+        future = Future()
+        self._queue.put((op, future))
+        return future
+    
+    def flush(self, timeout: float = None) -> bool:
+        """지금까지 등록된 쓰기 작업이 모두 커밋될 때까지 대기"""
+        if not self.running:
+            return True
+        try:
+            self.submit(lambda cursor: None).result(timeout)
+            return True
+        except Exception:
+            return False
+    
+    def stop(self, timeout: float = 10.0):
+        """남은 작업을 모두 커밋한 후 쓰기 스레드 종료"""
+        if not self.running:
+            return
+        self._queue.put((self._STOP, None))
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def stats(self) -> Dict:
+        return {
+            'running': self.running,
+            'queue_depth': self._queue.qsize(),
+            'committed_ops': self.committed_ops,
+            'committed_groups': self.committed_groups,
+            'failed_ops': self.failed_ops
+        }
+    
+    def _run(self):
+        conn = self._connect()
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                # group commit: 짧은 시간 동안 추가 작업을 모음
+                deadline = time.monotonic() + self.group_interval
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                
+                ops = []
+                for op, future in batch:
+                    if op is self._STOP:
+                        stopping = True
+                    else:
+                        ops.append((op, future))
+                if stopping:
+                    # 종료 요청 이후 남아있는 작업까지 모두 처리
+                    while True:
+                        try:
+                            op, future = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if op is not self._STOP:
+                            ops.append((op, future))
+                if ops:
+                    self._apply(conn, ops)
+        finally:
+            conn.close()
+    
+    def _apply(self, conn, ops):
+        """작업 묶음을 하나의 트랜잭션으로 적용 (실패 시 개별 트랜잭션으로 재시도)"""
+        results = []
+        try:
+            cursor = conn.cursor()
+            for op, _ in ops:
+                results.append(op(cursor))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            for op, future in ops:
+                try:
+                    result = op(conn.cursor())
+                    conn.commit()
+                    future.set_result(result)
+                    self.committed_ops += 1
+                except Exception as e:
+                    conn.rollback()
+                    self.failed_ops += 1
+                    print(f"DB 쓰기 실패: {e}")
+                    future.set_exception(e)
+            self.committed_groups += 1
+            return
+        
+        for (_, future), result in zip(ops, results):
+            future.set_result(result)
+        self.committed_ops += len(ops)
+        self.committed_groups += 1
+
+
+class ProgressCache:
+    """사용자별 진행률 요약/세션 목록 LRU 캐시
+
+    항목은 (user_id, 조회 이름, 인자) 키로 저장되며, 해당 사용자의 세션이
+    생성/수정되어 커밋되면 그 사용자의 항목만 무효화된다.
+    조회 도중 무효화가 일어난 경우 오래된 결과가 저장되지 않도록
+    조회 시작 시점의 tick과 사용자별 마지막 무효화 tick을 비교한다.
+    반환된 값은 캐시와 공유되므로 호출자가 수정하면 안 된다.
+    """
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._tick = 0
+        # 사용자별 마지막 무효화 tick (최근 것만 유지, 밀려난 tick 이전 조회는 저장하지 않음)
+        self._invalidated_at = OrderedDict()
+        self._floor = 0
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_skips = 0
+    
+    def get_or_load(self, user_id: str, name: str, args: Tuple, loader: Callable):
+        """캐시된 값을 반환하고, 없으면 loader()로 조회하여 저장"""
+        key = (user_id, name, args)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            started_tick = self._tick
+        
+        value = loader()
+        
+        with self._lock:
+            if started_tick < self._floor or self._invalidated_at.get(user_id, -1) > started_tick:
+                self.stale_skips += 1
+                return value
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._discard_key(old_key)
+                self.evictions += 1
+        return value
+    
+    def _discard_key(self, key):
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+    
+    def invalidate(self, user_id: str):
+        """사용자의 캐시 항목 모두 제거"""
+        if not user_id:
+            return
+        with self._lock:
+            self._tick += 1
+            self._invalidated_at[user_id] = self._tick
+            self._invalidated_at.move_to_end(user_id)
+            while len(self._invalidated_at) > self.max_entries * 4:
+                _, tick = self._invalidated_at.popitem(last=False)
+                self._floor = max(self._floor, tick)
+            for key in self._keys_by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+            self.invalidations += 1
+    
+    def clear(self):
+        with self._lock:
+            self._tick += 1
+            self._floor = self._tick
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self._invalidated_at.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'users': len(self._keys_by_user),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'stale_skips': self.stale_skips
+            }
+
+
+class DataVersions:
+    """데이터 범위별 변경 카운터 (HTTP ETag 계산용)
+
+    'users', 'sessions', 'user:<id>' 같은 범위마다 커밋 후 1씩 증가하는 번호를 유지한다.
+    응답 본문을 해시하지 않고 이 번호들로 ETag를 만들 수 있다.
+    boot 토큰은 프로세스가 다시 시작되어 번호가 0부터 시작해도 ETag가 겹치지 않게 한다.
+    """
+    
+    def __init__(self, max_scopes: int = 100000):
+        self.boot = uuid.uuid4().hex[:8]
+        self.max_scopes = max_scopes
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()
+        self._tick = 0
+        self._floor = 0
+    
+    def bump(self, *scopes: str):
+        with self._lock:
+            self._tick += 1
+            for scope in scopes:
+                self._versions[scope] = self._tick
+                self._versions.move_to_end(scope)
+            while len(self._versions) > self.max_scopes:
+                _, version = self._versions.popitem(last=False)
+                self._floor = max(self._floor, version)
+    
+    def snapshot(self, *scopes: str) -> Tuple[int, ...]:
+        """범위별 현재 번호 (기록이 밀려난 범위는 밀려난 번호 중 최댓값으로 대신함)"""
+        with self._lock:
+            return tuple(self._versions.get(scope, self._floor) for scope in scopes)
+
+
+class LatencyStats:
+    """호출 수, 누적/최대 시간, 반환 행 수, 지연 히스토그램"""
+    
+    # 히스토그램 버킷 상한 (ms) - 마지막 버킷은 그 이상 전부
+    BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+    
+    __slots__ = ('count', 'errors', 'total', 'max', 'rows', 'buckets')
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(self.BUCKETS_MS) + 1)
+    
+    def add(self, elapsed_ms: float, rows: int = 0, failed: bool = False):
+        self.count += 1
+        self.total += elapsed_ms
+        if elapsed_ms > self.max:
+            self.max = elapsed_ms
+        self.rows += rows
+        if failed:
+            self.errors += 1
+        index = 0
+        for bound in self.BUCKETS_MS:
+            if elapsed_ms <= bound:
+                break
+            index += 1
+        self.buckets[index] += 1
+    
+    def percentile(self, p: float) -> float:
+        """히스토그램 버킷 상한으로 추정한 백분위 (ms)"""
+        if not self.count:
+            return 0.0
+        target = self.count * p
+        seen = 0
+        for bound, count in zip(self.BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+    
+    def to_dict(self) -> Dict:
+        histogram = {f"le_{bound}": count for bound, count in zip(self.BUCKETS_MS, self.buckets)}
+        histogram['inf'] = self.buckets[-1]
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': round(self.total, 3),
+            'avg_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max, 3),
+            'p50_ms': round(self.percentile(0.50), 3),
+            'p95_ms': round(self.percentile(0.95), 3),
+            'p99_ms': round(self.percentile(0.99), 3),
+            'rows': self.rows,
+            'histogram': histogram
+        }
+
+
+def _describe_param(value) -> str:
+    """느린 쿼리 기록용 파라미터 표시 - 숫자/NULL만 값을 남기고 문자열/바이트는 길이만 남김
+
+    비밀번호 해시, 학생 답변, 이메일 같은 값이 로그나 관리자 API로 나가지 않도록 한다.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return repr(value)
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}(len={len(value)})"
+    return type(value).__name__
+
+
+def _redact_params(params) -> str:
+    if isinstance(params, dict):
+        return '{' + ', '.join(f"{key!r}: {_describe_param(value)}" for key, value in params.items()) + '}'
+    if isinstance(params, (tuple, list)):
+        return '(' + ', '.join(_describe_param(value) for value in params) + ')'
+    return '()'
+
+
+def _result_rows(result) -> int:
+    """메서드 반환값에서 행 수 추정 (목록이면 길이, 페이지 dict면 안의 목록 길이)"""
+    if result is None or result is False or isinstance(result, Future):
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, dict):
+        for value in result.values():
+            if isinstance(value, list):
+                return len(value)
+    return 1
+
+
+class QueryProfiler:
+    """DatabaseManager 메서드와 SQL 문장별 실행 시간 통계
+
+    - 메서드: 호출 수, 지연 히스토그램, 반환 행 수 (중첩 호출은 각각 포함 시간으로 기록)
+    - 문장: 공백을 정리한 SQL 문자열별 같은 통계
+    - slow_threshold_ms 이상 걸린 문장은 파라미터 형식(숫자는 값, 문자열은 길이만)과
+      EXPLAIN QUERY PLAN을 함께 기록하고 출력한다.
+    쓰기 스레드에서 실행된 문장은 호출한 메서드를 알 수 없으므로 'writer'로 표시된다.
+    """
+    
+    def __init__(self, slow_threshold_ms: float = 50.0, max_slow_entries: int = 200,
+                 max_statements: int = 2000, enabled: bool = True):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_statements = max_statements
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._methods = {}
+        self._statements = {}
+        self._plans = {}
+        self._normalized = {}
+        self.slow_log = deque(maxlen=max_slow_entries)
+        self.slow_count = 0
+    
+    def configure(self, slow_threshold_ms: float = None, enabled: bool = None):
+        if slow_threshold_ms is not None:
+            self.slow_threshold_ms = slow_threshold_ms
+        if enabled is not None:
+            self.enabled = enabled
+    
+    def call(self, name: str, method: Callable, *args, **kwargs):
+        """메서드를 실행하고 시간/행 수를 기록 (실행 중 문장은 이 메서드 이름으로 기록됨)"""
+        if not self.enabled:
+            return method(*args, **kwargs)
+        local = self._local
+        outer = getattr(local, 'method', None)
+        local.method = name
+        result = None
+        failed = True
+        started = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            local.method = outer
+            with self._lock:
+                stats = self._methods.get(name)
+                if stats is None:
+                    stats = self._methods[name] = LatencyStats()
+                stats.add(elapsed_ms, 0 if failed else _result_rows(result), failed)
+    
+    def _normalize(self, sql: str) -> str:
+        normalized = self._normalized.get(sql)
+        if normalized is None:
+            normalized = ' '.join(sql.split())
+            if len(self._normalized) < self.max_statements * 4:
+                self._normalized[sql] = normalized
+        return normalized
+    
+    def record_statement(self, conn, sql: str, params, elapsed: float, rows: int):
+        if not self.enabled:
+            return
+        elapsed_ms = elapsed * 1000
+        statement = self._normalize(sql)
+        method = getattr(self._local, 'method', None) or 'writer'
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    statement = '(기타)'
+                    stats = self._statements.get(statement)
+                if stats is None:
+                    stats = self._statements[statement] = LatencyStats()
+            stats.add(elapsed_ms, rows)
+        if elapsed_ms >= self.slow_threshold_ms:
+            self._log_slow(conn, statement, params, elapsed_ms, rows, method)
+    
+    def _capture_plan(self, conn, statement: str, params) -> List[str]:
+        """EXPLAIN QUERY PLAN 결과 (문장별로 한 번만 조회)"""
+        plan = self._plans.get(statement)
+        if plan is not None:
+            return plan
+        if not statement.upper().startswith(('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')):
+            return []
+        try:
+            # 기본 커서를 사용해 계획 조회 자체는 기록되지 않게 함
+            rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()
+            plan = [row[3] for row in rows]
+        except sqlite3.Error as e:
+            plan = [f"(실행 계획 조회 실패: {e})"]
+        with self._lock:
+            if len(self._plans) < self.max_statements:
+                self._plans[statement] = plan
+        return plan
+    
+    def _log_slow(self, conn, statement: str, params, elapsed_ms: float, rows: int, method: str):
+        plan = self._capture_plan(conn, statement, params)
+        entry = {
+            'at': datetime.now().isoformat(),
+            'method': method,
+            'sql': statement,
+            'params': _redact_params(params)[:500],
+            'elapsed_ms': round(elapsed_ms, 3),
+            'rows': rows,
+            'plan': plan
+        }
+        with self._lock:
+            self.slow_log.append(entry)
+            self.slow_count += 1
+        print(f"느린 쿼리 {elapsed_ms:.1f}ms [{method}] {statement[:300]} params={entry['params'][:200]}")
+        for step in plan:
+            print(f"  {step}")
+    
+    SORT_KEYS = {
+        'max': lambda item: item[1].max,
+        'total': lambda item: item[1].total,
+        'avg': lambda item: item[1].total / item[1].count if item[1].count else 0.0,
+        'count': lambda item: item[1].count,
+    }
+    
+    def top_statements(self, limit: int = 20, sort: str = 'max') -> List[Dict]:
+        """정렬 기준(max/total/avg/count) 상위 문장 목록"""
+        if sort not in self.SORT_KEYS:
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}")
+        with self._lock:
+            ranked = sorted(self._statements.items(), key=self.SORT_KEYS[sort], reverse=True)[:limit]
+            return [dict(stats.to_dict(), sql=statement, plan=self._plans.get(statement))
+                    for statement, stats in ranked]
+    
+    def method_stats(self) -> Dict[str, Dict]:
+        """메서드별 통계 (누적 시간 내림차순)"""
+        with self._lock:
+            ranked = sorted(self._methods.items(), key=lambda item: item[1].total, reverse=True)
+            return {name: stats.to_dict() for name, stats in ranked}
+    
+    def slow_queries(self, limit: int = 50) -> List[Dict]:
+        """최근 느린 쿼리 기록 (최신순)"""
+        with self._lock:
+            return list(self.slow_log)[::-1][:limit]
+    
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._statements.clear()
+            self._plans.clear()
+            self.slow_log.clear()
+            self.slow_count = 0
+            self.started_at = time.time()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'since': datetime.fromtimestamp(self.started_at).isoformat(),
+                'slow_threshold_ms': self.slow_threshold_ms,
+                'methods': len(self._methods),
+                'statements': len(self._statements),
+                'statement_calls': sum(stats.count for stats in self._statements.values()),
+                'statement_time_ms': round(sum(stats.total for stats in self._statements.values()), 3),
+                'slow_queries': self.slow_count
+            }
+
+
+def _profiled(name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.profiler.call(name, method, self, *args, **kwargs)
+    return wrapper
+
+
+def profile_methods(cls, exclude: Tuple[str, ...] = ()):
+    """클래스의 공개 메서드를 QueryProfiler로 감쌈 (self.profiler 필요)"""
+    for name, value in list(vars(cls).items()):
+        if name.startswith('_') or name in exclude or not callable(value):
+            continue
+        setattr(cls, name, _profiled(name, value))
+    return cls
+
+
+def _migration_001_base_tables(cursor):
+    """기본 테이블 생성"""
+    # 사용자 계정 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id TEXT PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            full_name TEXT,
+            role TEXT DEFAULT 'user',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # 테스트 세션 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS test_sessions (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            test_type TEXT NOT NULL,
+            status TEXT DEFAULT 'in_progress',
+            total_questions INTEGER DEFAULT 0,
+            completed_questions INTEGER DEFAULT 0,
+            total_score REAL DEFAULT 0.0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    """)
+    
+    # 테스트 문항 응답 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS test_responses (
+            id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            question_text TEXT NOT NULL,
+            user_response TEXT NOT NULL,
+            detected_intent TEXT,
+            calculated_score REAL,
+            expert_score REAL,
+            keywords TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES test_sessions (id)
+        )
+    """)
+    
+    # 전문가 피드백 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS expert_feedback (
+            id TEXT PRIMARY KEY,
+            response_id TEXT NOT NULL,
+            expert_id TEXT NOT NULL,
+            feedback_score REAL NOT NULL,
+            feedback_comment TEXT,
+            keywords_suggested TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (response_id) REFERENCES test_responses (id),
+            FOREIGN KEY (expert_id) REFERENCES users (id)
+        )
+    """)
+    
+    # 평가 템플릿 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS evaluation_templates (
+            id TEXT PRIMARY KEY,
+            test_type TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            keywords TEXT NOT NULL,
+            weights TEXT,
+            version INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # 키워드 추출 히스토리 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS keyword_extraction_history (
+            id TEXT PRIMARY KEY,
+            test_type TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            extracted_keywords TEXT NOT NULL,
+            frequency_count INTEGER DEFAULT 1,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (test_type, question_id) REFERENCES evaluation_templates (test_type, question_id)
+        )
+    """)
+
+
+def _migration_002_response_group_columns(cursor):
+    """test_responses에 question_group/question_category 컬럼 추가"""
+    cursor.execute("PRAGMA table_info(test_responses)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if 'question_group' not in columns:
+        cursor.execute("ALTER TABLE test_responses ADD COLUMN question_group INTEGER")
+    if 'question_category' not in columns:
+        cursor.execute("ALTER TABLE test_responses ADD COLUMN question_category TEXT")
+
+
+def _migration_003_hot_query_indexes(cursor):
+    """조회 쿼리용 (커버링) 인덱스 생성"""
+    statements = [
+        # 관리자 제외 사용자 목록/수 (role != 'admin' ORDER BY created_at)
+        "CREATE INDEX IF NOT EXISTS idx_users_created_role ON users (created_at, role)",
+        # 사용자별 세션 목록 (user_id = ? ORDER BY started_at)
+        "CREATE INDEX IF NOT EXISTS idx_test_sessions_user_started ON test_sessions (user_id, started_at)",
+        # 사용자별 진행률 요약 (user_id = ? GROUP BY test_type) - 커버링
+        """CREATE INDEX IF NOT EXISTS idx_test_sessions_user_progress ON test_sessions
+           (user_id, test_type, status, completed_questions, total_questions, started_at)""",
+        # 전체 세션 목록 (ORDER BY started_at DESC LIMIT ?)
+        "CREATE INDEX IF NOT EXISTS idx_test_sessions_started ON test_sessions (started_at)",
+        # 테스트 유형별 통계 (GROUP BY test_type) - 커버링
+        "CREATE INDEX IF NOT EXISTS idx_test_sessions_type_stats ON test_sessions (test_type, status, total_score)",
+        # 세션별 응답 목록 (session_id = ? ORDER BY created_at)
+        "CREATE INDEX IF NOT EXISTS idx_test_responses_session_created ON test_responses (session_id, created_at)",
+        # 세션별 그룹 점수 (session_id = ? GROUP BY question_group, question_category) - 커버링
+        """CREATE INDEX IF NOT EXISTS idx_test_responses_session_group ON test_responses
+           (session_id, question_group, question_category, calculated_score, expert_score)""",
+        # 응답별 전문가 피드백 (response_id = ? ORDER BY created_at)
+        "CREATE INDEX IF NOT EXISTS idx_expert_feedback_response ON expert_feedback (response_id, created_at)",
+        # 최신 평가 템플릿 (test_type = ? AND question_id = ? ORDER BY version DESC)
+        "CREATE INDEX IF NOT EXISTS idx_evaluation_templates_lookup ON evaluation_templates (test_type, question_id, version)",
+        # 키워드 빈도 조회 (test_type = ? AND question_id = ? AND extracted_keywords = ?)
+        """CREATE INDEX IF NOT EXISTS idx_keyword_history_lookup ON keyword_extraction_history
+           (test_type, question_id, extracted_keywords, frequency_count)""",
+    ]
+    for statement in statements:
+        cursor.execute(statement)
+
+
+def _compact_keyword_history(cursor) -> int:
+    """keyword_extraction_history의 중복 행을 (test_type, question_id, keyword)당 한 행으로 합침
+
+    기존 INSERT OR REPLACE는 매번 새 uuid로 삽입되어 실제로는 교체되지 않았으므로
+    중복 행 수가 곧 실제 등장 횟수다. 합친 행 수(삭제된 행 수)를 반환한다.
+    행마다 한 번의 등장이었던 UPSERT 이전 데이터에만 맞으므로 마이그레이션 4에서만 호출한다
+    (이후에는 frequency_count가 누적 값이라 다시 실행하면 횟수가 1로 초기화된다).
+    """
+    cursor.execute("SELECT COUNT(*) FROM keyword_extraction_history")
+    before = cursor.fetchone()[0]
+    cursor.execute("""
+        CREATE TEMP TABLE keyword_history_compacted AS
+        SELECT MIN(id) AS id, test_type, question_id, extracted_keywords,
+               COUNT(*) AS frequency_count, MAX(last_updated) AS last_updated
+        FROM keyword_extraction_history
+        GROUP BY test_type, question_id, extracted_keywords
+    """)
+    cursor.execute("DELETE FROM keyword_extraction_history")
+    cursor.execute("""
+        INSERT INTO keyword_extraction_history
+        (id, test_type, question_id, extracted_keywords, frequency_count, last_updated)
+        SELECT id, test_type, question_id, extracted_keywords, frequency_count, last_updated
+        FROM keyword_history_compacted
+    """)
+    cursor.execute("DROP TABLE keyword_history_compacted")
+    cursor.execute("SELECT COUNT(*) FROM keyword_extraction_history")
+    return before - cursor.fetchone()[0]
+
+
+def _migration_004_keyword_frequency_unique(cursor):
+    """키워드 이력 중복 정리 후 (test_type, question_id, keyword) 유니크 키 추가"""
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'index' AND name = 'uq_keyword_history_key'
+    """)
+    if cursor.fetchone():
+        return
+    _compact_keyword_history(cursor)
+    cursor.execute("DROP INDEX IF EXISTS idx_keyword_history_lookup")
+    cursor.execute("""
+        CREATE UNIQUE INDEX uq_keyword_history_key
+        ON keyword_extraction_history (test_type, question_id, extracted_keywords)
+    """)
+
+
+def _migration_005_user_counters(cursor):
+    """역할별 사용자 수 카운터(트리거로 유지)와 사용자 목록 keyset 인덱스 추가"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_role_counts (
+            role TEXT PRIMARY KEY,
+            user_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("DELETE FROM user_role_counts")
+    cursor.execute("""
+        INSERT INTO user_role_counts (role, user_count)
+        SELECT COALESCE(role, ''), COUNT(*) FROM users GROUP BY COALESCE(role, '')
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_insert AFTER INSERT ON users
+        BEGIN
+            INSERT INTO user_role_counts (role, user_count) VALUES (COALESCE(NEW.role, ''), 1)
+            ON CONFLICT (role) DO UPDATE SET user_count = user_count + 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_delete AFTER DELETE ON users
+        BEGIN
+            UPDATE user_role_counts SET user_count = user_count - 1 WHERE role = COALESCE(OLD.role, '');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_update AFTER UPDATE OF role ON users
+        BEGIN
+            UPDATE user_role_counts SET user_count = user_count - 1 WHERE role = COALESCE(OLD.role, '');
+            INSERT INTO user_role_counts (role, user_count) VALUES (COALESCE(NEW.role, ''), 1)
+            ON CONFLICT (role) DO UPDATE SET user_count = user_count + 1;
+        END
+    """)
+    # (created_at, id) keyset 페이지네이션용
+    cursor.execute("DROP INDEX IF EXISTS idx_users_created_role")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_created_id ON users (created_at, id, role)")
+
+
+def _migration_006_session_round(cursor):
+    """test_sessions.session_round 저장 컬럼 추가 및 세션 목록 keyset 인덱스 교체"""
+    cursor.execute("PRAGMA table_info(test_sessions)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if 'session_round' not in columns:
+        cursor.execute("ALTER TABLE test_sessions ADD COLUMN session_round INTEGER")
+    # 기존 세션의 회차를 한 번만 계산하여 저장
+    cursor.execute("""
+        UPDATE test_sessions
+        SET session_round = numbered.session_round
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY user_id, test_type
+                ORDER BY started_at ASC
+            ) AS session_round
+            FROM test_sessions
+        ) AS numbered
+        WHERE test_sessions.id = numbered.id AND test_sessions.session_round IS NULL
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_test_sessions_user_started")
+    cursor.execute("DROP INDEX IF EXISTS idx_test_sessions_started")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_started ON test_sessions (user_id, started_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_started ON test_sessions (started_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_round ON test_sessions (user_id, test_type, session_round)")
+
+
+def _migration_007_dashboard_rollups(cursor):
+    """대시보드 통계용 롤업 테이블(트리거로 유지) 추가"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_rollups (
+            scope TEXT PRIMARY KEY,
+            session_count INTEGER NOT NULL DEFAULT 0,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            response_count INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            score_count INTEGER NOT NULL DEFAULT 0,
+            user_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    rebuild_dashboard_rollups(cursor)
+    add_session = _ROLLUP_SESSION_DELTA.format(sign='+', row='NEW')
+    remove_session = _ROLLUP_SESSION_DELTA.format(sign='-', row='OLD')
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_session_insert AFTER INSERT ON test_sessions
+        BEGIN
+            INSERT OR IGNORE INTO dashboard_rollups (scope) VALUES (NEW.test_type);
+            {add_session}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_session_delete AFTER DELETE ON test_sessions
+        BEGIN
+            {remove_session}
+        END
+    """)
+    # 답변마다 갱신되는 completed_questions 등은 롤업과 무관하므로 관련 컬럼이 바뀔 때만 실행
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_session_update AFTER UPDATE ON test_sessions
+        WHEN OLD.test_type IS NOT NEW.test_type OR OLD.user_id IS NOT NEW.user_id
+          OR OLD.status IS NOT NEW.status OR OLD.total_score IS NOT NEW.total_score
+        BEGIN
+            {remove_session}
+            INSERT OR IGNORE INTO dashboard_rollups (scope) VALUES (NEW.test_type);
+            {add_session}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_response_insert AFTER INSERT ON test_responses
+        BEGIN
+            {_ROLLUP_RESPONSE_DELTA.format(sign='+', row='NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_response_delete AFTER DELETE ON test_responses
+        BEGIN
+            {_ROLLUP_RESPONSE_DELTA.format(sign='-', row='OLD')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_response_move AFTER UPDATE OF session_id ON test_responses
+        WHEN OLD.session_id IS NOT NEW.session_id
+        BEGIN
+            {_ROLLUP_RESPONSE_DELTA.format(sign='-', row='OLD')}
+            {_ROLLUP_RESPONSE_DELTA.format(sign='+', row='NEW')}
+        END
+    """)
+
+
+def _migration_008_session_reports(cursor):
+    """완료된 세션 보고서 캐시 테이블 추가 및 기존 완료 세션 보고서 생성"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS session_reports (
+            session_id TEXT PRIMARY KEY,
+            detail_json TEXT NOT NULL,
+            detail_etag TEXT NOT NULL,
+            grouped_json TEXT NOT NULL,
+            grouped_etag TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES test_sessions (id)
+        )
+    """)
+    cursor.execute("SELECT id FROM test_sessions WHERE status = 'completed'")
+    for (session_id,) in cursor.fetchall():
+        refresh_session_report(cursor, session_id)
+
+
+def _migration_009_response_search(cursor):
+    """응답 전문 검색 색인(FTS5, 글자 bigram + 필터 facets)과 동기화 트리거 추가 후 기존 응답 색인"""
+    # doc_id(INTEGER PRIMARY KEY)가 FTS rowid - VACUUM해도 바뀌지 않음
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS response_search_docs (
+            doc_id INTEGER PRIMARY KEY,
+            response_id TEXT NOT NULL UNIQUE,
+            indexed INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_response_search_pending
+        ON response_search_docs (doc_id) WHERE indexed = 0
+    """)
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS response_search
+        USING fts5(terms, facets, tokenize = 'unicode61 remove_diacritics 0')
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_search_response_insert AFTER INSERT ON test_responses
+        BEGIN
+            INSERT OR IGNORE INTO response_search_docs (response_id) VALUES (NEW.id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_search_response_update
+        AFTER UPDATE OF id, session_id, user_response, keywords, calculated_score, expert_score, created_at
+        ON test_responses
+        BEGIN
+            DELETE FROM response_search WHERE rowid =
+                (SELECT doc_id FROM response_search_docs WHERE response_id = OLD.id);
+            DELETE FROM response_search_docs WHERE response_id = OLD.id;
+            INSERT OR IGNORE INTO response_search_docs (response_id) VALUES (NEW.id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_search_response_delete AFTER DELETE ON test_responses
+        BEGIN
+            DELETE FROM response_search WHERE rowid =
+                (SELECT doc_id FROM response_search_docs WHERE response_id = OLD.id);
+            DELETE FROM response_search_docs WHERE response_id = OLD.id;
+        END
+    """)
+    # 오래된 응답부터 색인되도록 작성 시각 순으로 등록 (doc_id 내림차순 = 최신순)
+    cursor.execute("""
+        INSERT OR IGNORE INTO response_search_docs (response_id)
+        SELECT id FROM test_responses ORDER BY created_at, id
+    """)
+    sync_response_search(cursor)
+
+
+# 10번 마이그레이션 당시의 추이 채우기 쿼리 - 이후 컬럼(gap_avg/slot/seq)이 추가되어도 적용된
+# 마이그레이션이 같은 결과를 내도록 고정해 둔다 (새 컬럼은 11번 마이그레이션이 채움)
+_SCORE_TREND_UPSERT_V10 = """
+    INSERT INTO score_trends
+    (user_id, completed_at, session_id, test_type, session_round, total_score,
+     ai_avg, expert_avg, response_count, expert_count)
+    SELECT ts.user_id, datetime(COALESCE(ts.completed_at, ts.started_at)), ts.id, ts.test_type,
+           ts.session_round, ts.total_score, AVG(tr.calculated_score), AVG(tr.expert_score),
+           COUNT(tr.id), COUNT(tr.expert_score)
+    FROM test_sessions ts
+    LEFT JOIN test_responses tr ON tr.session_id = ts.id
+    WHERE {where} AND ts.status = 'completed'
+    GROUP BY ts.id
+    ON CONFLICT (session_id) DO UPDATE SET
+        user_id = excluded.user_id,
+        completed_at = excluded.completed_at,
+        test_type = excluded.test_type,
+        session_round = excluded.session_round,
+        total_score = excluded.total_score,
+        ai_avg = excluded.ai_avg,
+        expert_avg = excluded.expert_avg,
+        response_count = excluded.response_count,
+        expert_count = excluded.expert_count
+"""
+
+
+def _migration_010_score_trends(cursor):
+    """사용자별 점수 추이 테이블 추가 및 기존 완료 세션 채우기"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS score_trends (
+            user_id TEXT NOT NULL,
+            completed_at TIMESTAMP NOT NULL,
+            session_id TEXT NOT NULL UNIQUE,
+            test_type TEXT NOT NULL,
+            session_round INTEGER,
+            total_score REAL,
+            ai_avg REAL,
+            expert_avg REAL,
+            response_count INTEGER NOT NULL DEFAULT 0,
+            expert_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, completed_at, session_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(_SCORE_TREND_UPSERT_V10.format(where="1"))
+
+
+def _migration_011_score_trend_changes(cursor):
+    """점수 추이 변경 번호(seq)/고정 위치(slot) 및 AI-전문가 점수 차이 컬럼 추가
+    
+    slot은 행이 처음 추가될 때 1부터 빈틈없이 매기는 번호로 바뀌지 않고, seq는 변경 워터마크다.
+    추가/수정한 문장마다 그때까지의 최댓값보다 커지지만 한 문장이 바꾼 행들은 같은 seq를 가질 수
+    있어 행별 고유 번호는 아니다. 메모리 컬럼 캐시(modules/cohort_analytics.py)는 마지막으로 읽은
+    seq보다 큰 행만 읽어 slot 위치에 덮어쓰므로 이것으로 충분하다.
+    """
+    cursor.execute("PRAGMA table_info(score_trends)")
+    columns = {row[1] for row in cursor.fetchall()}
+    for column, definition in (('gap_avg', 'REAL'), ('slot', 'INTEGER'), ('seq', 'INTEGER')):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE score_trends ADD COLUMN {column} {definition}")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_score_trends_slot ON score_trends (slot)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_score_trends_seq ON score_trends (seq)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_score_trends_slot
+        AFTER INSERT ON score_trends
+        BEGIN
+            UPDATE score_trends
+            SET slot = (SELECT COALESCE(MAX(slot), 0) + 1 FROM score_trends),
+                seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM score_trends)
+            WHERE session_id = NEW.session_id;
+        END
+    """)
+    # 기존 행의 gap_avg 계산(10번 이후 완료된 세션도 채움) 후 모든 행 번호를 완료 시각 순으로 다시 매김
+    cursor.execute(_SCORE_TREND_UPSERT.format(where="1"))
+    cursor.execute("UPDATE score_trends SET slot = NULL")
+    cursor.execute("""
+        UPDATE score_trends
+        SET slot = numbered.n, seq = numbered.n
+        FROM (
+            SELECT session_id, ROW_NUMBER() OVER (ORDER BY completed_at, session_id) AS n
+            FROM score_trends
+        ) AS numbered
+        WHERE score_trends.session_id = numbered.session_id
+    """)
+
+
+def _migration_012_export_changes(cursor):
+    """스냅샷 내보내기용 변경 로그(export_changes)와 기록 트리거 추가
+    
+    seq는 AUTOINCREMENT라 내보낸 뒤 로그를 지워도 다시 작아지지 않는다.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS export_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_export_changes_table_seq
+        ON export_changes (table_name, seq, row_id)
+    """)
+    for table in EXPORT_TABLES:
+        for event in ('INSERT', 'UPDATE'):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_export_{table}_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO export_changes (table_name, row_id) VALUES ('{table}', NEW.id);
+                END
+            """)
+
+
+def _migration_013_stable_search_docs(cursor):
+    """응답 수정 시 검색 문서 번호(doc_id)를 유지하도록 갱신 트리거 교체
+    
+    기존 트리거는 문서 행을 지우고 다시 등록해서 전문가 점수만 바꿔도 doc_id가 새 번호가 되었다.
+    이제 FTS 행만 지우고 같은 doc_id를 색인 대기(indexed = 0)로 돌려 sync_response_search가
+    같은 rowid로 다시 넣는다.
+    """
+    cursor.execute("DROP TRIGGER IF EXISTS trg_search_response_update")
+    cursor.execute("""
+        CREATE TRIGGER trg_search_response_update
+        AFTER UPDATE OF id, session_id, user_response, keywords, calculated_score, expert_score, created_at
+        ON test_responses
+        BEGIN
+            DELETE FROM response_search WHERE rowid =
+                (SELECT doc_id FROM response_search_docs WHERE response_id = OLD.id AND indexed = 1);
+            UPDATE response_search_docs SET response_id = NEW.id, indexed = 0 WHERE response_id = OLD.id;
+            INSERT OR IGNORE INTO response_search_docs (response_id) VALUES (NEW.id);
+        END
+    """)
+
+
+def _migration_014_bulk_load_flag(cursor):
+    """대량 적재 중에는 응답 롤업 트리거를 건너뛰도록 플래그 테이블과 조건 추가
+    
+    bulk_insert가 자기 쓰기 트랜잭션 안에서만 'bulk_loading' 행을 넣었다가 커밋 전에 지우므로
+    다른 연결의 쓰기는 항상 트리거를 실행한다. 적재 중에 스키마를 바꾸지 않아도 된다.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS write_flags (
+            name TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("DROP TRIGGER IF EXISTS trg_rollup_response_insert")
+    cursor.execute(f"""
+        CREATE TRIGGER trg_rollup_response_insert AFTER INSERT ON test_responses
+        WHEN NOT EXISTS (SELECT 1 FROM write_flags WHERE name = 'bulk_loading')
+        BEGIN
+            {_ROLLUP_RESPONSE_DELTA.format(sign='+', row='NEW')}
+        END
+    """)
+
+
+def _migration_015_export_changes_opt_in(cursor):
+    """스냅샷 내보내기를 켠 경우에만 변경 로그를 기록하도록 트리거 교체
+    
+    답변마다 세션 행이 갱신되므로 내보내기를 쓰지 않는 설치에서도 로그가 계속 커졌다.
+    이제 write_flags에 'export_changes' 행이 있을 때만 기록하며, 스냅샷 내보내기가 첫 실행에서
+    켠다(enable_export_changes). 그동안 쌓인 로그는 지우고, 다음 내보내기는 전체 내보내기가 된다.
+    """
+    for table in EXPORT_TABLES:
+        for event in ('INSERT', 'UPDATE'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_export_{table}_{event.lower()}")
+            cursor.execute(f"""
+                CREATE TRIGGER trg_export_{table}_{event.lower()}
+                AFTER {event} ON {table}
+                WHEN EXISTS (SELECT 1 FROM write_flags WHERE name = 'export_changes')
+                BEGIN
+                    INSERT INTO export_changes (table_name, row_id) VALUES ('{table}', NEW.id);
+                END
+            """)
+    cursor.execute("DELETE FROM export_changes")
+
+
+# 스키마 마이그레이션 목록 (버전 순서대로, 각 마이그레이션은 여러 번 실행해도 안전해야 함)
+MIGRATIONS = [
+    (1, '기본 테이블 생성', _migration_001_base_tables),
+    (2, 'test_responses 그룹/카테고리 컬럼 추가', _migration_002_response_group_columns),
+    (3, '조회 쿼리용 인덱스 추가', _migration_003_hot_query_indexes),
+    (4, '키워드 빈도 유니크 키 추가', _migration_004_keyword_frequency_unique),
+    (5, '사용자 수 카운터 및 keyset 인덱스 추가', _migration_005_user_counters),
+    (6, '세션 회차 저장 및 세션 목록 keyset 인덱스', _migration_006_session_round),
+    (7, '대시보드 집계 롤업 테이블 추가', _migration_007_dashboard_rollups),
+    (8, '완료된 세션 보고서 캐시 추가', _migration_008_session_reports),
+    (9, '응답 전문 검색 색인 추가', _migration_009_response_search),
+    (10, '사용자별 점수 추이 테이블 추가', _migration_010_score_trends),
+    (11, '점수 추이 변경 번호 및 AI-전문가 점수 차이 추가', _migration_011_score_trend_changes),
+    (12, '스냅샷 내보내기 변경 로그 추가', _migration_012_export_changes),
+    (13, '응답 수정 시 검색 문서 번호 유지', _migration_013_stable_search_docs),
+    (14, '대량 적재 중 응답 롤업 트리거 생략 플래그', _migration_014_bulk_load_flag),
+    (15, '스냅샷 내보내기를 켠 경우에만 변경 로그 기록', _migration_015_export_changes_opt_in),
+]
+
+
+# 대시보드 집계 롤업: scope는 테스트 유형, '*'는 전체
+ROLLUP_FIELDS = ('session_count', 'completed_count', 'response_count', 'score_sum', 'score_count', 'user_count')
+
+# 롤업 값을 원본 테이블에서 처음부터 계산 (마이그레이션 초기값 및 정합성 검사용)
+ROLLUP_REBUILD_SQL = """
+    WITH per_session AS (
+        SELECT ts.test_type, ts.user_id, ts.status, ts.total_score,
+               (SELECT COUNT(*) FROM test_responses tr WHERE tr.session_id = ts.id) AS responses
+        FROM test_sessions ts
+    )
+    SELECT test_type AS scope, COUNT(*) AS session_count,
+           SUM(status IS 'completed') AS completed_count, SUM(responses) AS response_count,
+           COALESCE(SUM(total_score), 0) AS score_sum, COUNT(total_score) AS score_count,
+           COUNT(DISTINCT user_id) AS user_count
+    FROM per_session GROUP BY test_type
+    UNION ALL
+    SELECT '*', COUNT(*), COALESCE(SUM(status IS 'completed'), 0), COALESCE(SUM(responses), 0),
+           COALESCE(SUM(total_score), 0), COUNT(total_score), COUNT(DISTINCT user_id)
+    FROM per_session
+"""
+
+# 세션 한 건을 롤업에 더하거나(+) 빼는(-) 트리거 본문
+_ROLLUP_SESSION_DELTA = """
+    UPDATE dashboard_rollups SET
+        session_count = session_count {sign} 1,
+        completed_count = completed_count {sign} ({row}.status IS 'completed'),
+        score_sum = score_sum {sign} COALESCE({row}.total_score, 0),
+        score_count = score_count {sign} ({row}.total_score IS NOT NULL),
+        response_count = response_count {sign} (
+            SELECT COUNT(*) FROM test_responses tr WHERE tr.session_id = {row}.id),
+        user_count = user_count {sign} NOT EXISTS (
+            SELECT 1 FROM test_sessions s
+            WHERE s.user_id = {row}.user_id AND s.id != {row}.id
+              AND (dashboard_rollups.scope = '*' OR s.test_type = {row}.test_type))
+    WHERE scope IN ({row}.test_type, '*');
+"""
+
+# 응답 한 건을 해당 세션의 테스트 유형 및 전체 롤업에 반영
+_ROLLUP_RESPONSE_DELTA = """
+    UPDATE dashboard_rollups SET response_count = response_count {sign} 1
+    WHERE scope IN (SELECT test_type FROM test_sessions WHERE id = {row}.session_id
+                    UNION ALL
+                    SELECT '*' FROM test_sessions WHERE id = {row}.session_id);
+"""
+
+# 대량 적재 시 응답 롤업을 세션별로 합산해서 반영 (파라미터: 응답 수, 세션 id)
+_ROLLUP_RESPONSE_BULK = """
+    UPDATE dashboard_rollups SET response_count = response_count + ?1
+    WHERE scope IN (SELECT test_type FROM test_sessions WHERE id = ?2
+                    UNION ALL
+                    SELECT '*' FROM test_sessions WHERE id = ?2)
+"""
+
+
+def _rollup_average(rollup: Dict) -> Optional[float]:
+    """롤업 합계로 평균 점수 계산 (점수가 없으면 None, AVG와 동일)"""
+    if not rollup['score_count']:
+        return None
+    return rollup['score_sum'] / rollup['score_count']
+
+
+def rebuild_dashboard_rollups(cursor):
+    """대시보드 롤업을 원본 테이블에서 다시 계산하여 덮어씀"""
+    cursor.execute("DELETE FROM dashboard_rollups")
+    cursor.execute(f"INSERT INTO dashboard_rollups (scope, {', '.join(ROLLUP_FIELDS)}) {ROLLUP_REBUILD_SQL}")
+
+
+def _query_session_detail(cursor, session_id: str) -> Optional[Dict]:
+    """세션 정보 + 응답 + 전문가 피드백"""
+    # 세션 정보
+    cursor.execute(HOT_QUERIES['session_detail'][0], (session_id,))
+    
+    session = cursor.fetchone()
+    if not session:
+        return None
+    
+    session_dict = dict(session)
+    
+    # 세션의 응답들
+    cursor.execute(HOT_QUERIES['get_test_responses'][0], (session_id,))
+    
+    responses = [dict(row) for row in cursor.fetchall()]
+    session_dict['responses'] = responses
+    
+    # 전문가 피드백 (response_id를 통해 조인)
+    cursor.execute(HOT_QUERIES['session_expert_feedback'][0], (session_id,))
+    
+    feedback = [dict(row) for row in cursor.fetchall()]
+    session_dict['expert_feedback'] = feedback
+    
+    return session_dict
+
+
+def _query_session_grouped_scores(cursor, session_id: str) -> Dict:
+    """세션의 그룹별/전체 점수 통계"""
+    # 그룹별 점수 통계
+    cursor.execute(HOT_QUERIES['get_session_grouped_scores'][0], (session_id,))
+    
+    grouped_scores = [dict(row) for row in cursor.fetchall()]
+    
+    # 전체 점수
+    cursor.execute(HOT_QUERIES['session_overall_scores'][0], (session_id,))
+    
+    overall_stats = dict(cursor.fetchone())
+    
+    return {
+        'grouped_scores': grouped_scores,
+        'overall_stats': overall_stats
+    }
+
+
+# 변경 알림(대시보드 델타)에 포함하는 세션 컬럼
+SESSION_DELTA_COLUMNS = ("id, user_id, test_type, status, total_questions, completed_questions, "
+                         "total_score, session_round, started_at, completed_at")
+
+# bulk_insert()가 받는 테이블별 행 튜플의 열 순서
+BULK_INSERT_COLUMNS = {
+    'users': ('id', 'username', 'email', 'password_hash', 'full_name', 'role', 'created_at'),
+    'test_sessions': ('id', 'user_id', 'test_type', 'status', 'total_questions', 'completed_questions',
+                      'total_score', 'session_round', 'started_at', 'completed_at'),
+    'test_responses': ('id', 'session_id', 'question_id', 'question_text', 'user_response', 'detected_intent',
+                       'calculated_score', 'expert_score', 'keywords', 'question_group', 'question_category',
+                       'created_at'),
+    'expert_feedback': ('id', 'response_id', 'expert_id', 'feedback_score', 'feedback_comment',
+                        'keywords_suggested', 'created_at'),
+}
+
+
+def _bulk_insert_sql(table: str) -> str:
+    columns = BULK_INSERT_COLUMNS[table]
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+def _expert_score_delta(cursor, response_id: str, session_id: str, score: float) -> Dict:
+    """전문가 점수 변경 델타 (세션 소유자 포함)"""
+    owner = cursor.execute("SELECT user_id FROM test_sessions WHERE id = ?", (session_id,)).fetchone()
+    return {
+        'response_id': response_id,
+        'session_id': session_id,
+        'user_id': owner[0] if owner else None,
+        'expert_score': score
+    }
+
+
+# 전문가 점수 허용 범위
+EXPERT_SCORE_MIN = 0.0
+EXPERT_SCORE_MAX = 5.0
+
+
+# 완료된 세션 보고서 종류 (session_reports 컬럼 접두사)
+SESSION_REPORT_KINDS = ('detail', 'grouped')
+
+
+def _report_document(value) -> Tuple[str, str]:
+    """보고서 JSON 문자열과 강한 ETag(내용 해시)"""
+    body = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return body, hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def refresh_session_report(cursor, session_id: str) -> bool:
+    """완료된 세션의 보고서(상세/그룹 점수)를 다시 만들어 저장 (완료 전이면 아무것도 하지 않음)"""
+    cursor.execute("SELECT status FROM test_sessions WHERE id = ?", (session_id,))
+    row = cursor.fetchone()
+    if not row or row[0] != 'completed':
+        return False
+    detail_json, detail_etag = _report_document(_query_session_detail(cursor, session_id))
+    grouped_json, grouped_etag = _report_document(_query_session_grouped_scores(cursor, session_id))
+    cursor.execute("""
+        INSERT INTO session_reports (session_id, detail_json, detail_etag, grouped_json, grouped_etag, updated_at)
+        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (session_id) DO UPDATE SET
+            detail_json = excluded.detail_json,
+            detail_etag = excluded.detail_etag,
+            grouped_json = excluded.grouped_json,
+            grouped_etag = excluded.grouped_etag,
+            updated_at = excluded.updated_at
+    """, (session_id, detail_json, detail_etag, grouped_json, grouped_etag))
+    return True
+
+
+# 응답 전문 검색: 한국어는 조사가 붙고 두 글자 단어가 많아 공백 단위 토큰이나
+# trigram(3글자 미만 검색 불가)으로는 '자해' 같은 검색이 안 되므로 글자 bigram으로 색인한다.
+# 색인할 응답은 트리거가 response_search_docs에 (indexed = 0)으로 등록하고,
+# bigram 계산은 SQL로 할 수 없어 sync_response_search()가 Python에서 처리한다.
+_SEARCH_WORD = re.compile(r'\w+')
+
+
+def search_terms(text: str) -> List[str]:
+    """텍스트를 글자 bigram 토큰 목록으로 변환 (한 글자 단어는 그 글자 그대로)"""
+    terms = []
+    for word in _SEARCH_WORD.findall((text or '').lower()):
+        if len(word) == 1:
+            terms.append(word)
+        else:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def search_match_query(query: str) -> str:
+    """검색어를 FTS5 MATCH 식으로 변환 - 단어마다 bigram 구(phrase), 단어끼리는 AND
+
+    '자해' -> "자해", '자해 생각들' -> "자해" AND "생각 각들", 한 글자 단어는 접두어 검색.
+    검색할 단어가 없으면 ValueError.
+    """
+    parts = []
+    for word in _SEARCH_WORD.findall((query or '').lower()):
+        if len(word) == 1:
+            parts.append(f'"{word}"*')
+        else:
+            parts.append('"' + ' '.join(search_terms(word)) + '"')
+    if not parts:
+        raise ValueError("검색어가 필요합니다.")
+    return ' AND '.join(parts)
+
+
+def _response_search_text(user_response: str, keywords: Optional[str]) -> str:
+    """응답 본문과 (본문에 없는) 키워드를 합친 색인 토큰 문자열"""
+    words = user_response or ''
+    if keywords:
+        try:
+            extra = [kw for kw in json.loads(keywords) if isinstance(kw, str) and kw not in words]
+        except (TypeError, ValueError):
+            extra = []
+        if extra:
+            words = words + ' ' + ' '.join(extra)
+    return ' '.join(search_terms(words))
+
+
+# 검색 필터(테스트 유형/점수/월)를 FTS 안에서 거를 수 있도록 facets 열에 넣는 토큰
+# 점수는 0~SEARCH_SCORE_MAX 범위의 누적 토큰(scorege k: 점수 >= k, scorele k: 점수 <= k)으로 넣어
+# 최소/최대 점수 조건을 토큰 하나로 표현한다. 정확한 조건은 검색 쿼리에서 다시 확인한다.
+SEARCH_SCORE_MAX = 5
+SEARCH_MAX_MONTHS = 36
+
+
+def _response_search_facets(test_type: str, score: Optional[float], created_at: Optional[str]) -> str:
+    facets = [test_type.lower()] if test_type else []
+    if score is not None:
+        facets.extend(f"scorege{k}" for k in range(0, min(math.floor(score), SEARCH_SCORE_MAX) + 1))
+        facets.extend(f"scorele{k}" for k in range(max(math.ceil(score), 0), SEARCH_SCORE_MAX + 1))
+    if created_at:
+        facets.append('m' + created_at[:7].replace('-', ''))
+    return ' '.join(facets)
+
+
+def _search_months(date_from: Optional[str], date_to: Optional[str]) -> Optional[List[str]]:
+    """기간에 걸친 월 토큰 목록 (한쪽이 없거나 너무 길면 None - FTS에서 거르지 않음)"""
+    if not date_from or not date_to:
+        return None
+    try:
+        year, month = int(date_from[:4]), int(date_from[5:7])
+        end = (int(date_to[:4]), int(date_to[5:7]))
+    except ValueError:
+        raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+    months = []
+    while (year, month) <= end:
+        months.append(f"m{year:04d}{month:02d}")
+        if len(months) > SEARCH_MAX_MONTHS:
+            return None
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def sync_response_search(cursor, batch_size: int = 5000) -> int:
+    """색인 대기 중인 응답을 검색 색인에 반영하고 반영한 수를 반환"""
+    synced = 0
+    while True:
+        cursor.execute("""
+            SELECT d.doc_id, tr.user_response, tr.keywords, ts.test_type,
+                   COALESCE(tr.expert_score, tr.calculated_score), tr.created_at
+            FROM response_search_docs d
+            CROSS JOIN test_responses tr ON tr.id = d.response_id  -- 대기 목록(부분 인덱스)부터 읽도록 고정
+            LEFT JOIN test_sessions ts ON ts.id = tr.session_id
+            WHERE d.indexed = 0
+            ORDER BY d.doc_id
+            LIMIT ?
+        """, (batch_size,))
+        rows = cursor.fetchall()
+        if not rows:
+            return synced
+        cursor.executemany("INSERT INTO response_search (rowid, terms, facets) VALUES (?, ?, ?)",
+                           [(row[0], _response_search_text(row[1], row[2]),
+                             _response_search_facets(row[3], row[4], row[5])) for row in rows])
+        cursor.executemany("UPDATE response_search_docs SET indexed = 1 WHERE doc_id = ?",
+                           [(row[0],) for row in rows])
+        synced += len(rows)
+
+
+# 점수 추이: 완료된 세션마다 한 행 (사용자, 완료 시각) 순으로 클러스터링하여
+# 통계 화면의 기간 조회가 사용자 범위의 연속 구간 읽기 한 번으로 끝나도록 한다.
+# 수정된 행의 seq를 올려 컬럼 캐시가 변경분만 읽게 한다 (새 행의 slot/seq는 트리거가 매김).
+# seq 서브쿼리는 문장마다 한 번만 계산되므로 한 번에 수정된 행들은 같은 seq를 받는다 - 행별 번호가
+# 아닌 문장 단위 워터마크이며, 캐시는 "seq > 마지막으로 읽은 seq"로만 읽으므로 빠지는 행은 없다.
+_SCORE_TREND_UPSERT = """
+    INSERT INTO score_trends
+    (user_id, completed_at, session_id, test_type, session_round, total_score,
+     ai_avg, expert_avg, gap_avg, response_count, expert_count)
+    SELECT ts.user_id, datetime(COALESCE(ts.completed_at, ts.started_at)), ts.id, ts.test_type,
+           ts.session_round, ts.total_score, AVG(tr.calculated_score), AVG(tr.expert_score),
+           AVG(tr.expert_score - tr.calculated_score), COUNT(tr.id), COUNT(tr.expert_score)
+    FROM test_sessions ts
+    LEFT JOIN test_responses tr ON tr.session_id = ts.id
+    WHERE {where} AND ts.status = 'completed'
+    GROUP BY ts.id
+    ON CONFLICT (session_id) DO UPDATE SET
+        user_id = excluded.user_id,
+        completed_at = excluded.completed_at,
+        test_type = excluded.test_type,
+        session_round = excluded.session_round,
+        total_score = excluded.total_score,
+        ai_avg = excluded.ai_avg,
+        expert_avg = excluded.expert_avg,
+        gap_avg = excluded.gap_avg,
+        response_count = excluded.response_count,
+        expert_count = excluded.expert_count,
+        seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM score_trends)
+"""
+
+# 추이 조회 시 테스트 유형별 기본/최대 포인트 수
+TREND_DEFAULT_POINTS = 100
+TREND_MAX_POINTS = 1000
+
+
+def refresh_score_trends(cursor, session_ids) -> int:
+    """완료된 세션들의 추이 행을 추가/갱신 (완료 전 세션은 건너뜀)"""
+    session_ids = list(session_ids)
+    if not session_ids:
+        return 0
+    cursor.execute(HOT_QUERIES['refresh_score_trends'][0], (json.dumps(session_ids),))
+    return cursor.rowcount
+
+
+def _trend_point(rows) -> Dict:
+    """같은 구간에 속한 추이 행들을 한 포인트로 합침 (전문가 평균은 채점된 응답 수로 가중)"""
+    last = rows[-1]
+    responses = sum(row['response_count'] for row in rows)
+    experts = sum(row['expert_count'] for row in rows)
+    point = {
+        'completed_at': last['completed_at'],
+        'sessions': len(rows),
+        'session_round': last['session_round'],
+        'total_score': sum(row['total_score'] or 0 for row in rows) / len(rows),
+        'ai_avg': (sum((row['ai_avg'] or 0) * row['response_count'] for row in rows) / responses
+                   if responses else None),
+        'expert_avg': (sum(row['expert_avg'] * row['expert_count'] for row in rows if row['expert_count'])
+                       / experts if experts else None),
+    }
+    if len(rows) == 1:
+        point['session_id'] = last['session_id']
+    else:
+        point['first_completed_at'] = rows[0]['completed_at']
+    return point
+
+
+def downsample_trend(rows, points: int) -> List[Dict]:
+    """시간순 추이 행을 최대 points개의 같은 시간 폭 구간으로 평균 (행이 적으면 그대로)"""
+    if len(rows) <= points:
+        return [_trend_point([row]) for row in rows]
+    start = rows[0]['jd']
+    width = (rows[-1]['jd'] - start) / points or 1.0
+    buckets = OrderedDict()
+    for row in rows:
+        index = min(int((row['jd'] - start) / width), points - 1)
+        buckets.setdefault(index, []).append(row)
+    return [_trend_point(bucket) for bucket in buckets.values()]
+
+
+def _check_dates(*values: Optional[str]):
+    """'YYYY-MM-DD' 형식 날짜 파라미터 검사 (None/빈 값은 건너뜀)"""
+    for value in values:
+        if value:
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+
+# 스냅샷 내보내기(modules/snapshot_export.py) 대상 테이블: 내보내기를 켠 경우(write_flags의
+# 'export_changes' 행) 추가/수정된 행을 변경 로그에 남긴다. 로그는 내보내기가 끝날 때 지워지고,
+# 내보내기가 멈춰도 앱 시작 시 trim_export_changes가 보존 한도(EXPORT_CHANGES_MAX_ROWS)를 넘는
+# 오래된 행을 정리한다.
+EXPORT_TABLES = ('users', 'test_sessions', 'test_responses', 'expert_feedback')
+
+
+# 스트리밍 내보내기 데이터셋: (열 이름, SELECT 목록, FROM, 세션 안에서의 정렬)
+# 모두 세션 인덱스 순서(started_at, id 또는 user_id, started_at, id)로 읽고 응답은 세션별 인덱스로
+# 이어 붙이므로, 전체 결과를 정렬/그룹화하는 임시 B-tree 없이 첫 행부터 바로 내보낼 수 있다.
+# 그룹 점수는 전체 GROUP BY 대신 세션마다 상관 서브쿼리로 묶어서 json_each로 펼친다.
+STREAM_EXPORTS = {
+    'sessions': (
+        ('session_id', 'user_id', 'username', 'full_name', 'test_type', 'session_round', 'status',
+         'total_questions', 'completed_questions', 'total_score', 'started_at', 'completed_at'),
+        "ts.id, ts.user_id, u.username, u.full_name, ts.test_type, ts.session_round, ts.status, "
+        "ts.total_questions, ts.completed_questions, ts.total_score, ts.started_at, ts.completed_at",
+        "test_sessions ts JOIN users u ON u.id = ts.user_id",
+        "",
+    ),
+    'responses': (
+        ('response_id', 'session_id', 'user_id', 'username', 'test_type', 'session_round', 'question_id',
+         'question_group', 'question_category', 'question_text', 'user_response', 'calculated_score',
+         'expert_score', 'keywords', 'created_at'),
+        "tr.id, ts.id, ts.user_id, u.username, ts.test_type, ts.session_round, tr.question_id, "
+        "tr.question_group, tr.question_category, tr.question_text, tr.user_response, tr.calculated_score, "
+        "tr.expert_score, tr.keywords, tr.created_at",
+        "test_sessions ts JOIN users u ON u.id = ts.user_id "
+        "JOIN test_responses tr INDEXED BY idx_test_responses_session_created ON tr.session_id = ts.id",
+        ", tr.created_at",
+    ),
+    'grouped_scores': (
+        ('session_id', 'user_id', 'username', 'test_type', 'session_round', 'status', 'question_group',
+         'question_category', 'question_count', 'avg_ai_score', 'avg_expert_score', 'total_ai_score',
+         'total_expert_score'),
+        "ts.id, ts.user_id, u.username, ts.test_type, ts.session_round, ts.status, "
+        + ", ".join(f"json_extract(g.value, '$[{i}]')" for i in range(7)),
+        """test_sessions ts JOIN users u ON u.id = ts.user_id
+        JOIN json_each((
+            SELECT json_group_array(json_array(question_group, question_category, question_count,
+                                               avg_ai_score, avg_expert_score, total_ai_score, total_expert_score))
+            FROM (
+                SELECT question_group, question_category, COUNT(*) AS question_count,
+                       AVG(calculated_score) AS avg_ai_score, AVG(expert_score) AS avg_expert_score,
+                       SUM(calculated_score) AS total_ai_score, SUM(expert_score) AS total_expert_score
+                FROM test_responses
+                WHERE session_id = ts.id
+                GROUP BY question_group, question_category
+            )
+        )) g""",
+        "",
+    ),
+}
+
+
+def encode_cursor(values: List) -> str:
+    """keyset 페이지네이션 위치를 불투명한 커서 토큰으로 인코딩"""
+    raw = json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> List:
+    """커서 토큰 디코딩 (잘못된 토큰이면 ValueError)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError("유효하지 않은 커서입니다.")
+    if not isinstance(values, list):
+        raise ValueError("유효하지 않은 커서입니다.")
+    return values
+
+
+def _summarize_progress(rows) -> Dict:
+    """테스트 유형별 세션 집계 행들로 진행률 요약 생성"""
+    test_progress = {}
+    total_completed = 0
+    total_questions = 0
+    
+    for row in rows:
+        test_type = row['test_type']
+        completed = row['total_completed_questions'] or 0
+        questions = row['total_questions'] or 0
+        
+        test_progress[test_type] = {
+            'completed_questions': completed,
+            'total_questions': questions,
+            'progress_percentage': (completed / questions * 100) if questions > 0 else 0,
+            'is_completed': bool(row['is_completed']),
+            'last_activity': row['last_activity']
+        }
+        
+        total_completed += completed
+        total_questions += questions
+    
+    # 전체 진행률 계산
+    overall_progress = (total_completed / total_questions * 100) if total_questions > 0 else 0
+    
+    return {
+        'overall_progress': {
+            'completed_questions': total_completed,
+            'total_questions': total_questions,
+            'progress_percentage': overall_progress
+        },
+        'test_progress': test_progress
+    }
+
+
+# 사용자 진행률 목록 정렬 기준 (keyset 컬럼)
+USER_PROGRESS_SORTS = {
+    'created_at': ('created_at', 'id'),
+    'username': ('username',),
+}
+
+
+def _session_page_query(user_id: Optional[str], keyset: Optional[List], limit: int) -> Tuple[str, List]:
+    """세션 목록 페이지 쿼리 (user_id가 없으면 전체 사용자, keyset은 이전 페이지 마지막 (started_at, id))"""
+    if user_id:
+        sql = "SELECT ts.* FROM test_sessions ts WHERE ts.user_id = ?"
+        params = [user_id]
+    else:
+        sql = ("SELECT ts.*, u.username, u.email, u.full_name FROM test_sessions ts "
+               "JOIN users u ON ts.user_id = u.id WHERE 1 = 1")
+        params = []
+    if keyset:
+        sql += " AND (ts.started_at, ts.id) < (?, ?)"
+        params.extend(keyset)
+    sql += " ORDER BY ts.started_at DESC, ts.id DESC LIMIT ?"
+    params.append(limit)
+    return sql, params
+
+
+def _users_filter(role: str = None, search: str = None) -> Tuple[List[str], List]:
+    """관리자 사용자 목록의 (WHERE 조건 목록, 파라미터) - 관리자 제외, 역할/검색어 필터"""
+    conditions = ["role != 'admin'"]
+    params = []
+    if role:
+        conditions.append("role = ?")
+        params.append(role)
+    if search:
+        pattern = '%' + search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        conditions.append("(username LIKE ? ESCAPE '\\' OR email LIKE ? ESCAPE '\\' OR full_name LIKE ? ESCAPE '\\')")
+        params.extend([pattern, pattern, pattern])
+    return conditions, params
+
+
+def _users_count_query(role: str = None, search: str = None) -> Tuple[str, List]:
+    """필터에 맞는 사용자 수 쿼리 (검색어가 없으면 user_role_counts 카운터를 쓰는 get_user_count 사용)"""
+    conditions, params = _users_filter(role, search)
+    return f"SELECT COUNT(*) FROM users WHERE {' AND '.join(conditions)}", params
+
+
+# 사용자별/테스트 유형별 세션 집계 - (user_id, test_type, ...) 커버링 인덱스 순서로 읽으므로 정렬 없이 묶인다
+_USER_SESSION_PROGRESS = """
+    SELECT 
+        user_id,
+        test_type,
+        COUNT(*) as total_sessions,
+        SUM(completed_questions) as total_completed_questions,
+        SUM(total_questions) as total_questions,
+        MAX(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as is_completed,
+        MAX(started_at) as last_activity
+    FROM test_sessions
+    {where}
+    GROUP BY user_id, test_type
+"""
+
+
+def _users_page_query(limit: Optional[int], keyset: Optional[List], sort: str = 'created_at',
+                      order: str = 'desc', role: str = None, search: str = None) -> Tuple[str, List]:
+    """관리자 사용자 목록 쿼리 (정렬/keyset/필터 적용, limit이 없으면 전체)"""
+    keys = USER_PROGRESS_SORTS[sort]
+    direction = 'DESC' if order == 'desc' else 'ASC'
+    conditions, params = _users_filter(role, search)
+    if keyset:
+        comparison = '<' if order == 'desc' else '>'
+        conditions.append(f"({', '.join(keys)}) {comparison} ({', '.join('?' for _ in keys)})")
+        params.extend(keyset)
+    
+    order_by = ', '.join(f"{key} {direction}" for key in keys)
+    limit_clause = "LIMIT ?" if limit else ""
+    if limit:
+        params.append(limit)
+    
+    sql = f"""
+            SELECT id, username, email, full_name, role, created_at
+            FROM users
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {order_by}
+            {limit_clause}
+    """
+    return sql, params
+
+
+def _users_progress_query(limit: int, keyset: Optional[List], sort: str = 'created_at',
+                          order: str = 'desc', role: str = None, search: str = None) -> Tuple[str, List]:
+    """사용자 페이지 + 해당 사용자들의 테스트 유형별 세션 집계 쿼리"""
+    keys = USER_PROGRESS_SORTS[sort]
+    direction = 'DESC' if order == 'desc' else 'ASC'
+    page_sql, params = _users_page_query(limit, keyset, sort, order, role, search)
+    agg_sql = _USER_SESSION_PROGRESS.format(where="WHERE user_id IN (SELECT id FROM page)")
+    
+    sql = f"""
+        WITH page AS ({page_sql})
+        SELECT page.*, agg.*
+        FROM page
+        LEFT JOIN ({agg_sql}) agg ON agg.user_id = page.id
+        ORDER BY {', '.join(f"page.{key} {direction}" for key in keys)}
+    """
+    return sql, params
+
+
+def _export_query(dataset: str, user_ids: List[str] = None, test_type: str = None, status: str = None,
+                  date_from: str = None, date_to: str = None) -> Tuple[str, List]:
+    """스트리밍 내보내기 쿼리 (STREAM_EXPORTS 참고)"""
+    _, select, source, within_session = STREAM_EXPORTS[dataset]
+    conditions, params = [], []
+    if user_ids:
+        conditions.append("ts.user_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(list(user_ids)))
+    if test_type:
+        conditions.append("ts.test_type = ?")
+        params.append(test_type)
+    if status:
+        conditions.append("ts.status = ?")
+        params.append(status)
+    if date_from:
+        conditions.append("ts.started_at >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append("ts.started_at < date(?, '+1 day')")
+        params.append(date_to)
+    
+    sql = f"SELECT {select} FROM {source}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    # 사용자를 지정하면 (user_id, started_at, id) 인덱스를 사용자 순서대로 읽음
+    order = "ts.user_id, ts.started_at, ts.id" if user_ids else "ts.started_at, ts.id"
+    sql += f" ORDER BY {order}{within_session}"
+    return sql, params
+
+
+def _search_query(query: str, test_type: str = None, min_score: float = None, max_score: float = None,
+                  date_from: str = None, date_to: str = None, limit: int = 50,
+                  keyset: Optional[List] = None) -> Tuple[str, List]:
+    """응답 전문 검색 쿼리 - 응답 작성 시각 최신순 (keyset은 이전 페이지 마지막 (created_at, id))"""
+    # 필터 조건도 facets 토큰으로 FTS 안에서 먼저 거르고, 정확한 조건은 아래 WHERE에서 확인
+    match = f"terms : ({search_match_query(query)})"
+    if test_type:
+        if not _SEARCH_WORD.fullmatch(test_type):
+            raise ValueError(f"지원하지 않는 테스트 유형입니다: {test_type}")
+        match += f" AND facets : {test_type.lower()}"
+    if min_score is not None and 0 <= min_score <= SEARCH_SCORE_MAX:
+        match += f" AND facets : scorege{math.floor(min_score)}"
+    if max_score is not None and 0 <= max_score <= SEARCH_SCORE_MAX:
+        match += f" AND facets : scorele{math.ceil(max_score)}"
+    months = _search_months(date_from, date_to)
+    if months:
+        match += f" AND facets : ({' OR '.join(months)})"
+    
+    conditions = ["response_search MATCH ?"]
+    params = [match]
+    if keyset:
+        conditions.append("(tr.created_at, tr.id) < (?, ?)")
+        params.extend(keyset)
+    if test_type:
+        conditions.append("ts.test_type = ?")
+        params.append(test_type)
+    if min_score is not None:
+        conditions.append("COALESCE(tr.expert_score, tr.calculated_score) >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        conditions.append("COALESCE(tr.expert_score, tr.calculated_score) <= ?")
+        params.append(max_score)
+    if date_from:
+        conditions.append("tr.created_at >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append("tr.created_at < date(?, '+1 day')")
+        params.append(date_to)
+    params.append(limit)
+    
+    sql = f"""
+        SELECT tr.id, tr.session_id, ts.user_id, u.username, ts.test_type,
+               tr.question_id, tr.question_text, tr.user_response, tr.calculated_score,
+               tr.expert_score, tr.keywords, tr.created_at
+        FROM response_search s
+        JOIN response_search_docs d ON d.doc_id = s.rowid
+        JOIN test_responses tr ON tr.id = d.response_id
+        JOIN test_sessions ts ON ts.id = tr.session_id
+        LEFT JOIN users u ON u.id = ts.user_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY tr.created_at DESC, tr.id DESC
+        LIMIT ?
+    """
+    return sql, params
+
+
+def _session_report_query(kind: str) -> str:
+    return f"SELECT {kind}_json, {kind}_etag FROM session_reports WHERE session_id = ?"
+
+
+# 역할/범위별 한 행씩만 있는 카운터/롤업 테이블 (전체 스캔해도 되는 테이블)
+PLAN_SMALL_TABLES = {'user_role_counts', 'dashboard_rollups'}
+
+# 주요 조회 쿼리: 이름 → (SQL, 예시 파라미터)
+# 각 메서드는 여기의 문장(또는 같은 쿼리 생성 함수)을 그대로 실행하고, verify_query_plans()와
+# check_query_plans.py는 같은 문장의 실행 계획에서 인덱스 없는 전체 스캔을 찾는다.
+HOT_QUERIES = {
+    'authenticate_user': ("SELECT id, username, email, full_name, role, created_at FROM users "
+                          "WHERE email = ? AND password_hash = ?", ('', '')),
+    'get_user_by_id': ("SELECT id, username, email, full_name, role, created_at FROM users WHERE id = ?", ('',)),
+    'get_user_count': ("SELECT SUM(user_count) FROM user_role_counts WHERE role NOT IN ('admin', '')", ()),
+    'get_user_count_role': ("SELECT user_count FROM user_role_counts WHERE role = ?", ('user',)),
+    'get_users_progress_page': _users_progress_query(101, None),
+    'get_users_progress_page_keyset': _users_progress_query(101, ['', '']),
+    'get_all_users_progress_users': _users_page_query(None, None),
+    'get_all_users_progress_sessions': (_USER_SESSION_PROGRESS.format(where=""), ()),
+    'create_test_session': (f"INSERT INTO test_sessions (id, user_id, test_type, total_questions, session_round) "
+                            f"SELECT ?, ?, ?, ?, COALESCE(MAX(session_round), 0) + 1 FROM test_sessions "
+                            f"WHERE user_id = ? AND test_type = ? RETURNING {SESSION_DELTA_COLUMNS}",
+                            ('', '', '', 0, '', '')),
+    'get_test_session': ("SELECT * FROM test_sessions WHERE id = ?", ('',)),
+    'get_user_test_sessions': ("SELECT * FROM test_sessions WHERE user_id = ? "
+                               "ORDER BY started_at DESC LIMIT ?", ('', 50)),
+    'get_user_progress_summary': ("SELECT test_type, COUNT(*) as total_sessions, "
+                                  "SUM(completed_questions) as total_completed_questions, "
+                                  "SUM(total_questions) as total_questions, "
+                                  "MAX(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as is_completed, "
+                                  "MAX(started_at) as last_activity "
+                                  "FROM test_sessions WHERE user_id = ? GROUP BY test_type", ('',)),
+    'get_all_sessions': _session_page_query(None, None, 101),
+    'get_all_sessions_keyset': _session_page_query(None, ['', ''], 101),
+    'get_user_sessions': _session_page_query('user', None, 51),
+    'get_user_sessions_keyset': _session_page_query('user', ['', ''], 51),
+    # 대시보드 롤업 트리거(마이그레이션 7) 본문의 조회 - 적용된 마이그레이션은 바꾸지 않으므로 같은 문장의 사본
+    'rollup_session_responses': ("SELECT COUNT(*) FROM test_responses tr WHERE tr.session_id = ?", ('',)),
+    'rollup_user_has_sessions': ("SELECT 1 FROM test_sessions s WHERE s.user_id = ? AND s.id != ? "
+                                 "AND s.test_type = ?", ('', '', '')),
+    'session_detail': ("SELECT ts.*, u.username, u.full_name FROM test_sessions ts "
+                       "JOIN users u ON ts.user_id = u.id WHERE ts.id = ?", ('',)),
+    'get_test_responses': ("SELECT * FROM test_responses WHERE session_id = ? ORDER BY created_at ASC", ('',)),
+    'session_expert_feedback': ("SELECT ef.*, tr.session_id FROM expert_feedback ef "
+                                "JOIN test_responses tr ON ef.response_id = tr.id "
+                                "WHERE tr.session_id = ? ORDER BY ef.created_at DESC", ('',)),
+    'get_session_grouped_scores': ("SELECT question_group, question_category, COUNT(*) as question_count, "
+                                   "AVG(calculated_score) as avg_ai_score, AVG(expert_score) as avg_expert_score, "
+                                   "SUM(calculated_score) as total_ai_score, SUM(expert_score) as total_expert_score "
+                                   "FROM test_responses WHERE session_id = ? "
+                                   "GROUP BY question_group, question_category ORDER BY question_group", ('',)),
+    'session_overall_scores': ("SELECT COUNT(*) as total_questions, AVG(calculated_score) as overall_avg_ai_score, "
+                               "AVG(expert_score) as overall_avg_expert_score, "
+                               "SUM(calculated_score) as overall_total_ai_score, "
+                               "SUM(expert_score) as overall_total_expert_score "
+                               "FROM test_responses WHERE session_id = ?", ('',)),
+    'get_expert_feedback': ("SELECT ef.*, u.username as expert_username FROM expert_feedback ef "
+                            "JOIN users u ON ef.expert_id = u.id "
+                            "WHERE ef.response_id = ? ORDER BY ef.created_at DESC", ('',)),
+    'get_session_report': (_session_report_query('detail'), ('',)),
+    'get_evaluation_template': ("SELECT * FROM evaluation_templates WHERE test_type = ? AND question_id = ? "
+                                "ORDER BY version DESC LIMIT 1", ('', '')),
+    # ON CONFLICT 대상에 맞는 유니크 인덱스가 없으면 준비 단계에서 오류가 나므로 함께 확인됨
+    'extract_and_update_keywords': ("INSERT INTO keyword_extraction_history "
+                                    "(id, test_type, question_id, extracted_keywords, frequency_count, last_updated) "
+                                    "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                                    "ON CONFLICT (test_type, question_id, extracted_keywords) DO UPDATE SET "
+                                    "frequency_count = frequency_count + excluded.frequency_count, "
+                                    "last_updated = excluded.last_updated", ('', '', '', '', 1)),
+    'response_search_pending': ("SELECT doc_id FROM response_search_docs WHERE indexed = 0 LIMIT 1", ()),
+    'search_responses': _search_query('학교', limit=51),
+    'search_responses_keyset': _search_query('학교', test_type='cdi', date_from='2026-01-01', limit=51,
+                                             keyset=['2026-01-01 00:00:00', '']),
+    'refresh_score_trends': (_SCORE_TREND_UPSERT.format(where="ts.id IN (SELECT value FROM json_each(?))"),
+                             ('[]',)),
+    'get_score_trends': ("SELECT *, julianday(completed_at) AS jd FROM score_trends "
+                         "WHERE user_id = ? AND completed_at >= ? AND completed_at < date(?, '+1 day') "
+                         "ORDER BY completed_at, session_id", ('', '', '')),
+    'score_trend_changes': ("SELECT slot, seq, user_id, test_type, CAST(strftime('%s', completed_at) AS INTEGER), "
+                            "session_round, total_score, ai_avg, expert_avg, gap_avg, expert_count "
+                            "FROM score_trends WHERE seq > ? ORDER BY seq", (0,)),
+    'export_changed_rows': ("SELECT DISTINCT row_id FROM export_changes "
+                            "WHERE table_name = ? AND seq > ? AND seq <= ?", ('', 0, 0)),
+    'export_sessions': _export_query('sessions', date_from='2026-01-01'),
+    'export_responses': _export_query('responses', test_type='cdi'),
+    'export_responses_users': _export_query('responses', user_ids=['']),
+    'export_grouped_scores': _export_query('grouped_scores', status='completed'),
+}
+
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "ai_helper_eval.db"):
+    def __init__(self, db_path: str = "ai_helper_eval.db", pooled: bool = True,
+                 progress_cache_size: int = 1024):
         """데이터베이스 매니저 초기화"""
         self.db_path = db_path
+        self.profiler = QueryProfiler()
+        self.connections = ConnectionManager(db_path, pooled=pooled, profiler=self.profiler)
+        self.writer = PersistenceWriter(self.connections.open)
+        self.progress_cache = ProgressCache(progress_cache_size)
+        self.versions = DataVersions()
+        self._change_listeners = []
         self.init_database()
     
+    def _connection(self):
+        """읽기/쓰기 연결 (스레드별 재사용)"""
+        return self.connections.connection()
+    
+    def _read_connection(self):
+        """읽기 전용 연결 - 대시보드 조회가 쓰기를 막지 않도록 분리"""
+        return self.connections.connection(readonly=True)
+    
+    def start_writer(self):
+        """write-behind 쓰기 스레드 시작 (이후 테스트 진행 관련 쓰기는 큐를 거침)"""
+        self.writer.start()
+    
+    def stop_writer(self):
+        """대기 중인 쓰기를 모두 커밋하고 쓰기 스레드 종료"""
+        self.writer.stop()
+    
+    def add_change_listener(self, listener: Callable):
+        """커밋된 변경 델타를 받을 콜백 등록 - listener(change_type, data)
+        
+        쓰기 스레드에서 호출될 수 있으므로 listener는 빨리 반환해야 한다.
+        """
+        self._change_listeners.append(listener)
+    
+    def _publish_change(self, change_type: str, data: Dict):
+        for listener in self._change_listeners:
+            try:
+                listener(change_type, data)
+            except Exception as e:
+                print(f"변경 알림 실패 ({change_type}): {e}")
+    
+    def _session_committed(self, change_type: str, session: Optional[Dict]):
+        """세션 생성/수정 커밋 후 - 캐시 무효화와 변경 델타 알림"""
+        if not session:
+            return
+        self._sessions_changed(session['user_id'])
+        self._publish_change(change_type, session)
+    
+    def _sessions_changed(self, user_id: Optional[str] = None):
+        """세션 관련 쓰기 커밋 후 호출 - 사용자 캐시 무효화 및 변경 번호 증가"""
+        if user_id:
+            self.progress_cache.invalidate(user_id)
+            self.versions.bump('sessions', f"user:{user_id}")
+        else:
+            self.versions.bump('sessions')
+    
+    def _write(self, op: Callable, durable: bool = False, on_commit: Callable = None):
+        """쓰기 작업 실행 - 쓰기 스레드가 동작 중이면 큐에 넣고, 아니면 바로 커밋
+        
+        durable=True이면 커밋이 끝날 때까지 기다린 뒤 결과를 반환한다.
+        큐에 넣기만 한 경우에는 Future를 반환한다.
+        on_commit(result)는 커밋 직후 호출된다 (캐시 무효화용).
+        """
+        if self.writer.running:
+            future = self.writer.submit(op)
+            if durable:
+                # 완료 콜백보다 호출자가 먼저 깨어날 수 있으므로 반환 전에 호출자 스레드에서 적용
+                result = future.result()
+                if on_commit is not None:
+                    on_commit(result)
+                return result
+            if on_commit is not None:
+                future.add_done_callback(
+                    lambda f: on_commit(f.result()) if f.exception() is None else None)
+            return future
+        
+        with self._connection() as conn:
+            result = op(conn.cursor())
+            conn.commit()
+        if on_commit is not None:
+            on_commit(result)
+        return result
+    
     def init_database(self):
-        """데이터베이스 테이블 초기화"""
-        with sqlite3.connect(self.db_path) as conn:
+        """데이터베이스 스키마 초기화 (미적용 마이그레이션 실행 후 통계 갱신)"""
+        with self._connection() as conn:
             cursor = conn.cursor()
-            
-            # 사용자 계정 테이블
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id TEXT PRIMARY KEY,
-                    username TEXT UNIQUE NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    full_name TEXT,
-                    role TEXT DEFAULT 'user',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # 테스트 세션 테이블
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS test_sessions (
-                    id TEXT PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    test_type TEXT NOT NULL,
-                    status TEXT DEFAULT 'in_progress',
-                    total_questions INTEGER DEFAULT 0,
-                    completed_questions INTEGER DEFAULT 0,
-                    total_score REAL DEFAULT 0.0,
-                    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id)
-                )
-            """)
-            
-            # 테스트 문항 응답 테이블
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS test_responses (
-                    id TEXT PRIMARY KEY,
-                    session_id TEXT NOT NULL,
-                    question_id TEXT NOT NULL,
-                    question_text TEXT NOT NULL,
-                    user_response TEXT NOT NULL,
-                    detected_intent TEXT,
-                    calculated_score REAL,
-                    expert_score REAL,
-                    keywords TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (session_id) REFERENCES test_sessions (id)
-                )
-            """)
-            
-            # 전문가 피드백 테이블
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS expert_feedback (
-                    id TEXT PRIMARY KEY,
-                    response_id TEXT NOT NULL,
-                    expert_id TEXT NOT NULL,
-                    feedback_score REAL NOT NULL,
-                    feedback_comment TEXT,
-                    keywords_suggested TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (response_id) REFERENCES test_responses (id),
-                    FOREIGN KEY (expert_id) REFERENCES users (id)
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            cursor.execute("SELECT version FROM schema_migrations")
+            applied = {row[0] for row in cursor.fetchall()}
             
-            # 평가 템플릿 테이블
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS evaluation_templates (
-                    id TEXT PRIMARY KEY,
-                    test_type TEXT NOT NULL,
-                    question_id TEXT NOT NULL,
-                    keywords TEXT NOT NULL,
-                    weights TEXT,
-                    version INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            pending = [m for m in MIGRATIONS if m[0] not in applied]
+            for version, description, migrate in pending:
+                migrate(cursor)
+                cursor.execute("""
+                    INSERT INTO schema_migrations (version, description) VALUES (?, ?)
+                """, (version, description))
+                print(f"DB 마이그레이션 적용: {version} - {description}")
             
-            # 키워드 추출 히스토리 테이블
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS keyword_extraction_history (
-                    id TEXT PRIMARY KEY,
-                    test_type TEXT NOT NULL,
-                    question_id TEXT NOT NULL,
-                    extracted_keywords TEXT NOT NULL,
-                    frequency_count INTEGER DEFAULT 1,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (test_type, question_id) REFERENCES evaluation_templates (test_type, question_id)
-                )
-            """)
+            conn.commit()
             
+            # 새 인덱스가 생겼으면 통계를 다시 수집하여 쿼리 플래너가 활용하도록 함
+            if pending:
+                cursor.execute("ANALYZE")
+            cursor.execute("PRAGMA optimize")
+    
+    def get_schema_version(self) -> int:
+        """현재 적용된 스키마 버전"""
+        with self._read_connection() as conn:
+            row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+            return row[0] or 0
+    
+    def enable_export_changes(self) -> bool:
+        """스냅샷 내보내기용 변경 로그 기록을 켬 (이미 켜져 있었으면 False)
+        
+        꺼져 있던 동안의 변경은 로그에 없으므로 True가 반환되면 전체 내보내기가 필요하다.
+        """
+        def op(cursor):
+            return cursor.execute("INSERT OR IGNORE INTO write_flags (name) VALUES ('export_changes')").rowcount > 0
+        return self._write(op, durable=True)
+    
+    def disable_export_changes(self) -> int:
+        """변경 로그 기록을 끄고 남은 로그 삭제 (삭제한 행 수 반환)"""
+        def op(cursor):
+            cursor.execute("DELETE FROM write_flags WHERE name = 'export_changes'")
+            return cursor.execute("DELETE FROM export_changes").rowcount
+        return self._write(op, durable=True)
+    
+    def prune_export_changes(self, up_to_seq: int) -> int:
+        """스냅샷으로 내보낸 변경 로그(seq <= up_to_seq) 삭제"""
+        def op(cursor):
+            return cursor.execute("DELETE FROM export_changes WHERE seq <= ?", (up_to_seq,)).rowcount
+        return self._write(op, durable=True)
+
+    def trim_export_changes(self, max_rows: int) -> int:
+        """변경 로그를 최근 max_rows개(seq 기준)만 남기고 삭제 (0 이하이면 정리하지 않음)
+        
+        내보내기를 켠 뒤 더 이상 돌리지 않는 설치에서도 로그가 끝없이 커지지 않게 하는 보존 한도다.
+        내보내지 않은 변경분이 지워지면 다음 내보내기는 빈틈을 감지하고 전체 내보내기로 전환한다.
+        """
+        if max_rows <= 0:
+            return 0
+        def op(cursor):
+            high = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'export_changes'").fetchone()
+            if not high or high[0] <= max_rows:
+                return 0
+            return cursor.execute("DELETE FROM export_changes WHERE seq <= ?", (high[0] - max_rows,)).rowcount
+        return self._write(op, durable=True)
+
+    def check_dashboard_rollups(self, repair: bool = False) -> Dict[str, Dict[str, Tuple]]:
+        """롤업 테이블을 원본에서 다시 계산한 값과 비교하여 차이 반환 (빈 dict면 정상)
+        
+        반환값은 {scope: {field: (저장된 값, 다시 계산한 값)}} 형태이며,
+        repair=True이면 차이가 있을 때 롤업을 다시 계산한 값으로 덮어쓴다.
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            # 비교와 복구 사이에 다른 쓰기가 끼어들지 않도록 쓰기 잠금을 먼저 잡음
+            cursor.execute("BEGIN IMMEDIATE")
+            stored = {row['scope']: dict(row) for row in cursor.execute("SELECT * FROM dashboard_rollups")}
+            expected = {row['scope']: dict(row) for row in cursor.execute(ROLLUP_REBUILD_SQL)}
+            
+            empty = dict.fromkeys(ROLLUP_FIELDS, 0)
+            differences = {}
+            for scope in sorted(set(stored) | set(expected)):
+                before = stored.get(scope, empty)
+                after = expected.get(scope, empty)
+                diff = {field: (before[field], after[field]) for field in ROLLUP_FIELDS
+                        if abs((before[field] or 0) - (after[field] or 0)) > 1e-6}
+                if diff:
+                    differences[scope] = diff
+            
+            if differences and repair:
+                rebuild_dashboard_rollups(cursor)
             conn.commit()
+        if differences and repair:
+            self._sessions_changed()
+        return differences
+    
+    def explain_query_plan(self, sql: str, params: Tuple = ()) -> List[str]:
+        """EXPLAIN QUERY PLAN 결과 (detail 목록)"""
+        with self._read_connection() as conn:
+            return [row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    
+    def verify_query_plans(self) -> Dict[str, List[str]]:
+        """인덱스를 사용하지 않고 테이블 전체를 스캔하는 주요 쿼리 목록 반환 (빈 dict면 정상)
+        
+        문장 준비에 실패한 쿼리(없는 컬럼, ON CONFLICT 대상 유니크 인덱스 없음 등)도 오류 메시지와 함께 포함한다.
+        """
+        problems = {}
+        for name, (sql, params) in HOT_QUERIES.items():
+            try:
+                plan = self.explain_query_plan(sql, params)
+            except sqlite3.Error as e:
+                problems[name] = [f"ERROR: {e}"]
+                continue
+            # 구체화된 CTE/서브쿼리 결과와 행 수가 고정된 작은 테이블의 스캔은 제외
+            derived = {step.split()[1] for step in plan if step.startswith('MATERIALIZE ')}
+            full_scans = [step for step in plan
+                          if step.startswith('SCAN') and 'INDEX' not in step
+                          and not step.startswith('SCAN (subquery-')
+                          and step.split()[1] not in derived | PLAN_SMALL_TABLES]
+            if full_scans:
+                problems[name] = plan
+        return problems
     
     def hash_password(self, password: str) -> str:
         """비밀번호 해시화"""
@@ -122,7 +2316,7 @@ class DatabaseManager:
         user_id = str(uuid.uuid4())
         password_hash = self.hash_password(password)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO users (id, username, email, password_hash, full_name, role)
@@ -130,20 +2324,16 @@ class DatabaseManager:
             """, (user_id, username, email, password_hash, full_name, role))
             conn.commit()
         
+        self.versions.bump('users')
         return user_id
     
     def authenticate_user(self, email: str, password: str) -> Optional[Dict]:
         """사용자 인증"""
         password_hash = self.hash_password(password)
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, username, email, full_name, role, created_at
-                FROM users
-                WHERE email = ? AND password_hash = ?
-            """, (email, password_hash))
+            cursor.execute(HOT_QUERIES['authenticate_user'][0], (email, password_hash))
             
             user = cursor.fetchone()
             if user:
@@ -152,36 +2342,34 @@ class DatabaseManager:
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
         """사용자 ID로 사용자 정보 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, username, email, full_name, role, created_at
-                FROM users
-                WHERE id = ?
-            """, (user_id,))
+            cursor.execute(HOT_QUERIES['get_user_by_id'][0], (user_id,))
             
             user = cursor.fetchone()
             if user:
                 return dict(user)
         return None
     
-    def create_test_session(self, user_id: str, test_type: str, total_questions: int = 0) -> str:
+    def create_test_session(self, user_id: str, test_type: str, total_questions: int = 0,
+                            durable: bool = False) -> str:
         """새 테스트 세션 생성"""
         session_id = str(uuid.uuid4())
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO test_sessions (id, user_id, test_type, total_questions)
-                VALUES (?, ?, ?, ?)
-            """, (session_id, user_id, test_type, total_questions))
-            conn.commit()
+        def op(cursor):
+            # 회차(session_round)는 생성 시점에 저장 (같은 사용자/테스트 유형의 다음 번호)
+            row = cursor.execute(HOT_QUERIES['create_test_session'][0],
+                                 (session_id, user_id, test_type, total_questions, user_id, test_type)).fetchone()
+            return dict(row)
         
+        self._write(op, durable, on_commit=lambda session: self._session_committed('session_created', session))
         return session_id
     
-    def update_test_session(self, session_id: str, **kwargs) -> bool:
-        """테스트 세션 업데이트"""
+    def update_test_session(self, session_id: str, durable: bool = False, **kwargs) -> bool:
+        """테스트 세션 업데이트
+        
+        쓰기 스레드를 거쳐 큐에 넣기만 한 경우(durable=False)에는 True를 반환한다.
+        """
         allowed_fields = ['status', 'completed_questions', 'total_score', 'completed_at']
         updates = []
         values = []
@@ -196,24 +2384,31 @@ class DatabaseManager:
         
         values.append(session_id)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
+        def op(cursor):
+            # 캐시 무효화/변경 알림을 위해 수정된 세션 요약을 함께 반환 (없는 세션이면 None)
+            row = cursor.execute(f"""
                 UPDATE test_sessions
                 SET {', '.join(updates)}
                 WHERE id = ?
-            """, values)
-            conn.commit()
-            return cursor.rowcount > 0
+                RETURNING {SESSION_DELTA_COLUMNS}
+            """, values).fetchone()
+            if row and kwargs.get('status') == 'completed':
+                # 완료 시점에 보고서를 만들어 두고 이후 조회는 저장된 JSON으로 응답
+                refresh_session_report(cursor, session_id)
+                refresh_score_trends(cursor, [session_id])
+            return dict(row) if row else None
+        
+        result = self._write(op, durable,
+                             on_commit=lambda session: self._session_committed('session_updated', session))
+        if isinstance(result, Future):
+            return True
+        return result is not None
     
     def get_test_session(self, session_id: str) -> Optional[Dict]:
         """테스트 세션 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM test_sessions WHERE id = ?
-            """, (session_id,))
+            cursor.execute(HOT_QUERIES['get_test_session'][0], (session_id,))
             
             session = cursor.fetchone()
             if session:
@@ -222,27 +2417,21 @@ class DatabaseManager:
     
     def get_user_test_sessions(self, user_id: str, limit: int = 50) -> List[Dict]:
         """사용자의 테스트 세션 목록 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM test_sessions
-                WHERE user_id = ?
-                ORDER BY started_at DESC
-                LIMIT ?
-            """, (user_id, limit))
+            cursor.execute(HOT_QUERIES['get_user_test_sessions'][0], (user_id, limit))
             
             return [dict(row) for row in cursor.fetchall()]
     
     def save_test_response(self, session_id: str, question_id: str, question_text: str, 
                           user_response: str, detected_intent: str = None, 
                           calculated_score: float = None, keywords: str = None,
-                          question_group: int = None, question_category: str = None) -> str:
+                          question_group: int = None, question_category: str = None,
+                          durable: bool = False) -> str:
         """테스트 응답 저장"""
         response_id = str(uuid.uuid4())
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        def op(cursor):
             cursor.execute("""
                 INSERT INTO test_responses 
                 (id, session_id, question_id, question_text, user_response, 
@@ -250,20 +2439,30 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (response_id, session_id, question_id, question_text, user_response,
                   detected_intent, calculated_score, keywords, question_group, question_category))
-            conn.commit()
+            sync_response_search(cursor)
+            owner = cursor.execute("SELECT user_id FROM test_sessions WHERE id = ?", (session_id,)).fetchone()
+            return {
+                'id': response_id,
+                'session_id': session_id,
+                'user_id': owner[0] if owner else None,
+                'question_id': question_id,
+                'question_group': question_group,
+                'question_category': question_category,
+                'calculated_score': calculated_score
+            }
         
+        def on_commit(response):
+            self._sessions_changed()
+            self._publish_change('response_saved', response)
+        
+        self._write(op, durable, on_commit=on_commit)
         return response_id
     
     def get_test_responses(self, session_id: str) -> List[Dict]:
         """테스트 세션의 모든 응답 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM test_responses
-                WHERE session_id = ?
-                ORDER BY created_at ASC
-            """, (session_id,))
+            cursor.execute(HOT_QUERIES['get_test_responses'][0], (session_id,))
             
             return [dict(row) for row in cursor.fetchall()]
     
@@ -273,7 +2472,7 @@ class DatabaseManager:
         """전문가 피드백 저장"""
         feedback_id = str(uuid.uuid4())
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO expert_feedback
@@ -286,24 +2485,28 @@ class DatabaseManager:
                 UPDATE test_responses
                 SET expert_score = ?
                 WHERE id = ?
+                RETURNING session_id
             """, (feedback_score, response_id))
+            row = cursor.fetchone()
+            change = None
+            if row:
+                refresh_session_report(cursor, row[0])
+                refresh_score_trends(cursor, [row[0]])
+                sync_response_search(cursor)
+                change = _expert_score_delta(cursor, response_id, row[0], feedback_score)
             
             conn.commit()
         
+        self._sessions_changed(change['user_id'] if change else None)
+        if change:
+            self._publish_change('expert_score_updated', change)
         return feedback_id
     
     def get_expert_feedback(self, response_id: str) -> List[Dict]:
         """응답에 대한 전문가 피드백 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT ef.*, u.username as expert_username
-                FROM expert_feedback ef
-                JOIN users u ON ef.expert_id = u.id
-                WHERE ef.response_id = ?
-                ORDER BY ef.created_at DESC
-            """, (response_id,))
+            cursor.execute(HOT_QUERIES['get_expert_feedback'][0], (response_id,))
             
             return [dict(row) for row in cursor.fetchall()]
     
@@ -312,7 +2515,7 @@ class DatabaseManager:
         """평가 템플릿 업데이트"""
         template_id = str(uuid.uuid4())
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
             # 기존 템플릿 버전 확인
@@ -336,15 +2539,9 @@ class DatabaseManager:
     
     def get_evaluation_template(self, test_type: str, question_id: str) -> Optional[Dict]:
         """평가 템플릿 조회 (최신 버전)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM evaluation_templates
-                WHERE test_type = ? AND question_id = ?
-                ORDER BY version DESC
-                LIMIT 1
-            """, (test_type, question_id))
+            cursor.execute(HOT_QUERIES['get_evaluation_template'][0], (test_type, question_id))
             
             template = cursor.fetchone()
             if template:
@@ -362,64 +2559,109 @@ class DatabaseManager:
         stop_words = {'은', '는', '이', '가', '을', '를', '에', '의', '로', '으로', '와', '과', '도', '만', '부터', '까지'}
         keywords = [kw for kw in keywords if kw not in stop_words and len(kw) > 1]
         
-        # 키워드 빈도 업데이트
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            for keyword in keywords:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO keyword_extraction_history
-                    (id, test_type, question_id, extracted_keywords, frequency_count, last_updated)
-                    VALUES (?, ?, ?, ?, 
-                        COALESCE((SELECT frequency_count FROM keyword_extraction_history 
-                                 WHERE test_type = ? AND question_id = ? AND extracted_keywords = ?), 0) + 1,
-                        CURRENT_TIMESTAMP)
-                """, (str(uuid.uuid4()), test_type, question_id, keyword, test_type, question_id, keyword))
-            
-            conn.commit()
+        # 키워드 빈도 업데이트 (한 답변 안의 중복 키워드는 미리 합산)
+        rows = [(str(uuid.uuid4()), test_type, question_id, keyword, count)
+                for keyword, count in Counter(keywords).items()]
+        
+        def op(cursor):
+            cursor.executemany(HOT_QUERIES['extract_and_update_keywords'][0], rows)
         
+        if rows:
+            self._write(op)
         return keywords
     
+    def bulk_insert(self, users: List[Tuple] = (), sessions: List[Tuple] = (), responses: List[Tuple] = (),
+                    feedback: List[Tuple] = (), keyword_counts: List[Tuple] = (),
+                    refresh_reports: bool = True) -> Dict[str, int]:
+        """대량 적재 (합성 데이터 생성/이관용)
+        
+        행은 BULK_INSERT_COLUMNS 순서의 튜플이고, keyword_counts는 (test_type, question_id, keyword, count)이다.
+        한 트랜잭션 안에서 executemany로 넣는다. 사용자 수/세션 롤업은 트리거가 그대로 유지하고,
+        응답 롤업은 행마다 트리거를 실행하는 대신 세션별 합계로 반영한다.
+        완료된 세션의 점수 추이 행은 항상, 보고서는 refresh_reports=True일 때 같은 트랜잭션에서 만든다.
+        캐시는 비우고 변경 번호는 올리지만 세션별 변경 델타는 보내지 않는다.
+        """
+        def op(cursor):
+            counts = {}
+            if responses:
+                # 응답마다 롤업 트리거를 실행하지 않고 세션별 합계로 한 번에 반영
+                # (플래그 행은 이 트랜잭션 안에서만 보이므로 다른 연결의 쓰기에는 영향 없음)
+                cursor.execute("INSERT OR IGNORE INTO write_flags (name) VALUES ('bulk_loading')")
+            for table, rows in (('users', users), ('test_sessions', sessions),
+                                ('test_responses', responses), ('expert_feedback', feedback)):
+                if rows:
+                    cursor.executemany(_bulk_insert_sql(table), rows)
+                    counts[table] = len(rows)
+            if responses:
+                per_session = Counter(row[1] for row in responses)
+                cursor.executemany(_ROLLUP_RESPONSE_BULK,
+                                   [(count, session_id) for session_id, count in per_session.items()])
+                cursor.execute("DELETE FROM write_flags WHERE name = 'bulk_loading'")
+            if keyword_counts:
+                cursor.executemany("""
+                    INSERT INTO keyword_extraction_history
+                    (id, test_type, question_id, extracted_keywords, frequency_count, last_updated)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT (test_type, question_id, extracted_keywords) DO UPDATE SET
+                        frequency_count = frequency_count + excluded.frequency_count,
+                        last_updated = excluded.last_updated
+                """, [(str(uuid.uuid4()), *row) for row in keyword_counts])
+                counts['keyword_extraction_history'] = len(keyword_counts)
+            if responses:
+                counts['response_search'] = sync_response_search(cursor)
+            status_index = BULK_INSERT_COLUMNS['test_sessions'].index('status')
+            completed = [row[0] for row in sessions if row[status_index] == 'completed']
+            counts['score_trends'] = refresh_score_trends(cursor, completed)
+            if refresh_reports:
+                counts['session_reports'] = sum(refresh_session_report(cursor, session_id)
+                                                for session_id in completed)
+            return counts
+        
+        def on_commit(counts):
+            self.progress_cache.clear()
+            self.versions.bump('users', 'sessions')
+        
+        return self._write(op, durable=True, on_commit=on_commit)
+    
+    @staticmethod
+    def _read_dashboard_rollups(cursor) -> Tuple[Dict, List[Dict]]:
+        """롤업 테이블에서 전체 집계와 테스트 타입별 통계 조회 (세션 수와 무관하게 O(1))"""
+        cursor.execute("SELECT * FROM dashboard_rollups")
+        rollups = {row['scope']: dict(row) for row in cursor.fetchall()}
+        overall = rollups.pop('*', None) or dict.fromkeys(ROLLUP_FIELDS, 0)
+        test_type_stats = [
+            {
+                'test_type': test_type,
+                'session_count': rollup['session_count'],
+                'avg_score': _rollup_average(rollup),
+                'completed_count': rollup['completed_count'],
+                'user_count': rollup['user_count']
+            }
+            for test_type, rollup in sorted(rollups.items())
+            if rollup['session_count'] > 0
+        ]
+        return overall, test_type_stats
+    
     def get_dashboard_data(self, user_id: str = None) -> Dict:
         """대시보드용 데이터 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             
-            # 전체 통계
-            cursor.execute("""
-                SELECT 
-                    COUNT(DISTINCT ts.id) as total_sessions,
-                    COUNT(DISTINCT ts.user_id) as total_users,
-                    AVG(ts.total_score) as avg_score,
-                    COUNT(DISTINCT tr.id) as total_responses
-                FROM test_sessions ts
-                LEFT JOIN test_responses tr ON ts.id = tr.session_id
-            """)
-            overall_stats = dict(cursor.fetchone())
-            
-            # 테스트 타입별 통계
-            cursor.execute("""
-                SELECT 
-                    test_type,
-                    COUNT(*) as session_count,
-                    AVG(total_score) as avg_score,
-                    COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_count
-                FROM test_sessions
-                GROUP BY test_type
-            """)
-            test_type_stats = [dict(row) for row in cursor.fetchall()]
+            # 전체 통계 및 테스트 타입별 통계
+            overall, test_type_stats = self._read_dashboard_rollups(cursor)
+            overall_stats = {
+                'total_sessions': overall['session_count'],
+                'total_users': overall['user_count'],
+                'avg_score': _rollup_average(overall),
+                'total_responses': overall['response_count']
+            }
             
             # 최근 세션들 (회차 정보 포함)
             cursor.execute("""
                 SELECT 
                     ts.*, 
                     u.username, 
-                    u.full_name,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY ts.user_id, ts.test_type 
-                        ORDER BY ts.started_at ASC
-                    ) as session_round
+                    u.full_name
                 FROM test_sessions ts
                 JOIN users u ON ts.user_id = u.id
                 ORDER BY ts.started_at DESC
@@ -435,58 +2677,31 @@ class DatabaseManager:
     
     def get_dashboard_stats(self) -> Dict:
         """대시보드 통계 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             
-            # 전체 통계
-            cursor.execute("""
-                SELECT 
-                    COUNT(DISTINCT ts.id) as total_sessions,
-                    AVG(ts.total_score) as avg_score,
-                    COUNT(tr.id) as total_responses
-                FROM test_sessions ts
-                LEFT JOIN test_responses tr ON ts.id = tr.session_id
-            """)
-            session_stats = dict(cursor.fetchone())
+            # 전체 통계 및 테스트 타입별 통계
+            overall, test_type_stats = self._read_dashboard_rollups(cursor)
             
-            # 실제 사용자 수 조회 (관리자 제외)
+            # 실제 사용자 수 (관리자 제외, 역할별 카운터)
             cursor.execute("""
-                SELECT COUNT(*) as total_users
-                FROM users
-                WHERE role != 'admin'
+                SELECT SUM(user_count) FROM user_role_counts WHERE role NOT IN ('admin', '')
             """)
-            user_count = cursor.fetchone()['total_users']
+            user_count = cursor.fetchone()[0] or 0
             
             overall_stats = {
-                'total_sessions': session_stats['total_sessions'],
+                'total_sessions': overall['session_count'],
                 'total_users': user_count,
-                'avg_score': session_stats['avg_score'],
-                'total_responses': session_stats['total_responses']
+                'avg_score': _rollup_average(overall),
+                'total_responses': overall['response_count']
             }
             
-            # 테스트 타입별 통계
-            cursor.execute("""
-                SELECT 
-                    test_type,
-                    COUNT(*) as session_count,
-                    AVG(total_score) as avg_score,
-                    COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_count
-                FROM test_sessions
-                GROUP BY test_type
-            """)
-            test_type_stats = [dict(row) for row in cursor.fetchall()]
-            
             # 최근 세션들 (회차 정보 포함)
             cursor.execute("""
                 SELECT 
                     ts.*, 
                     u.username, 
-                    u.full_name,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY ts.user_id, ts.test_type 
-                        ORDER BY ts.started_at ASC
-                    ) as session_round
+                    u.full_name
                 FROM test_sessions ts
                 JOIN users u ON ts.user_id = u.id
                 ORDER BY ts.started_at DESC
@@ -500,207 +2715,219 @@ class DatabaseManager:
                 'recent_sessions': recent_sessions
             }
     
-    def get_user_sessions(self, user_id: str, limit: int = 50) -> List[Dict]:
+    def _keyset_values(self, cursor: Optional[str], count: int) -> Optional[List]:
+        """페이지 커서 → keyset 값 목록 (커서가 없으면 None)"""
+        if not cursor:
+            return None
+        values = decode_cursor(cursor)
+        if len(values) != count:
+            raise ValueError("유효하지 않은 커서입니다.")
+        return values
+    
+    @staticmethod
+    def _session_page(rows, limit: int) -> Dict:
+        sessions = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = sessions[-1]
+            next_cursor = encode_cursor([last['started_at'], last['id']])
+        return {'sessions': sessions, 'next_cursor': next_cursor}
+    
+    def get_user_sessions_page(self, user_id: str, limit: int = 50, cursor: str = None) -> Dict:
+        """사용자의 세션 목록 페이지 조회 (최신순, keyset 페이지네이션, 사용자별 캐시)"""
+        return self.progress_cache.get_or_load(
+            user_id, 'sessions', (limit, cursor),
+            lambda: self._load_user_sessions_page(user_id, limit, cursor))
+    
+    def _load_user_sessions_page(self, user_id: str, limit: int, cursor: Optional[str]) -> Dict:
+        sql, params = _session_page_query(user_id, self._keyset_values(cursor, 2), limit + 1)
+        with self._read_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return self._session_page(rows, limit)
+    
+    def get_user_sessions(self, user_id: str, limit: int = 50, cursor: str = None) -> List[Dict]:
         """사용자의 세션 목록 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    ts.*,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY ts.user_id, ts.test_type 
-                        ORDER BY ts.started_at ASC
-                    ) as session_round
-                FROM test_sessions ts
-                WHERE ts.user_id = ?
-                ORDER BY ts.started_at DESC
-                LIMIT ?
-            """, (user_id, limit))
-            
-            return [dict(row) for row in cursor.fetchall()]
+        return self.get_user_sessions_page(user_id, limit, cursor)['sessions']
     
-    def get_all_sessions(self, limit: int = 100) -> List[Dict]:
+    def get_all_sessions_page(self, limit: int = 100, cursor: str = None) -> Dict:
+        """모든 사용자의 세션 목록 페이지 조회 (관리자/전문가용, keyset 페이지네이션)"""
+        sql, params = _session_page_query(None, self._keyset_values(cursor, 2), limit + 1)
+        with self._read_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return self._session_page(rows, limit)
+    
+    def get_all_sessions(self, limit: int = 100, cursor: str = None) -> List[Dict]:
         """모든 사용자의 세션 목록 조회 (관리자/전문가용)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT ts.*, u.username, u.email, u.full_name
-                FROM test_sessions ts
-                JOIN users u ON ts.user_id = u.id
-                ORDER BY ts.started_at DESC
-                LIMIT ?
-            """, (limit,))
-            
-            return [dict(row) for row in cursor.fetchall()]
+        return self.get_all_sessions_page(limit, cursor)['sessions']
     
     def get_user_progress_summary(self, user_id: str) -> Dict:
-        """사용자의 전체 테스트 진행률 요약"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        """사용자의 전체 테스트 진행률 요약 (세션 생성/수정 시 무효화되는 캐시 사용)"""
+        return self.progress_cache.get_or_load(
+            user_id, 'progress', (), lambda: self._load_user_progress_summary(user_id))
+    
+    def _load_user_progress_summary(self, user_id: str) -> Dict:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             
             # 각 테스트 타입별 진행률 계산
-            cursor.execute("""
-                SELECT 
-                    test_type,
-                    COUNT(*) as total_sessions,
-                    SUM(completed_questions) as total_completed_questions,
-                    SUM(total_questions) as total_questions,
-                    MAX(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as is_completed,
-                    MAX(started_at) as last_activity
-                FROM test_sessions
-                WHERE user_id = ?
-                GROUP BY test_type
-            """, (user_id,))
-            
-            test_progress = {}
-            total_completed = 0
-            total_questions = 0
+            cursor.execute(HOT_QUERIES['get_user_progress_summary'][0], (user_id,))
             
+            summary = _summarize_progress(cursor.fetchall())
+            return {'user_id': user_id, **summary}
+    
+    def get_score_trends(self, user_id: str, date_from: str = None, date_to: str = None,
+                         points: int = TREND_DEFAULT_POINTS, test_type: str = None) -> Dict:
+        """사용자의 테스트 유형별 점수 추이 (완료된 세션 기준, 시간순)
+        
+        date_from/date_to는 'YYYY-MM-DD' (date_to 포함). 유형별 세션이 points개보다 많으면
+        기간을 같은 폭의 구간으로 나누어 평균한 포인트로 줄인다.
+        반환: {'user_id', 'series': {test_type: [포인트, ...]}, 'downsampled': {test_type: bool}}
+        """
+        _check_dates(date_from, date_to)
+        points = max(1, min(points, TREND_MAX_POINTS))
+        
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(HOT_QUERIES['get_score_trends'][0],
+                           (user_id, date_from or '0000-01-01', date_to or '9999-12-30'))
+            grouped = OrderedDict()
             for row in cursor.fetchall():
-                test_type = row['test_type']
-                completed = row['total_completed_questions'] or 0
-                questions = row['total_questions'] or 0
-                
-                test_progress[test_type] = {
-                    'completed_questions': completed,
-                    'total_questions': questions,
-                    'progress_percentage': (completed / questions * 100) if questions > 0 else 0,
-                    'is_completed': bool(row['is_completed']),
-                    'last_activity': row['last_activity']
-                }
-                
-                total_completed += completed
-                total_questions += questions
-            
-            # 전체 진행률 계산
-            overall_progress = (total_completed / total_questions * 100) if total_questions > 0 else 0
-            
-            return {
-                'user_id': user_id,
-                'overall_progress': {
-                    'completed_questions': total_completed,
-                    'total_questions': total_questions,
-                    'progress_percentage': overall_progress
-                },
-                'test_progress': test_progress
-            }
+                if not test_type or row['test_type'] == test_type:
+                    grouped.setdefault(row['test_type'], []).append(row)
+        
+        return {
+            'user_id': user_id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'points': points,
+            'series': {name: downsample_trend(rows, points) for name, rows in grouped.items()},
+            'downsampled': {name: len(rows) > points for name, rows in grouped.items()}
+        }
+    
+    def export_rows(self, dataset: str, user_ids: List[str] = None, test_type: str = None,
+                    status: str = None, date_from: str = None, date_to: str = None,
+                    chunk_size: int = 1000) -> Tuple[Tuple[str, ...], Iterator[List[Tuple]]]:
+        """스트리밍 내보내기용 (열 이름, 행 묶음 제너레이터)
+        
+        제너레이터는 한 SELECT 문을 열어 두고 chunk_size 행씩 가져오므로 전체 행 수와 관계없이
+        메모리 사용량이 일정하다. 파라미터 검사는 호출 시점에 바로 하고(ValueError),
+        쿼리는 첫 묶음을 요청할 때 실행한다. date_from/date_to는 세션 시작일 기준 'YYYY-MM-DD' (date_to 포함).
+        """
+        if dataset not in STREAM_EXPORTS:
+            raise ValueError(f"지원하지 않는 내보내기 데이터입니다: {dataset}")
+        _check_dates(date_from, date_to)
+        columns = STREAM_EXPORTS[dataset][0]
+        sql, params = _export_query(dataset, user_ids, test_type, status, date_from, date_to)
+        
+        def chunks():
+            with self._read_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(sql, params)
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield [tuple(row) for row in rows]
+                finally:
+                    # 클라이언트가 중간에 끊어도 문장을 닫아 읽기 트랜잭션을 끝냄
+                    cursor.close()
+        
+        return columns, chunks()
+    
+    def get_user_count(self, role: str = None) -> int:
+        """사용자 수 (트리거로 유지되는 카운터 사용, role이 없으면 관리자 제외 전체)"""
+        with self._read_connection() as conn:
+            if role:
+                row = conn.execute(HOT_QUERIES['get_user_count_role'][0], (role,)).fetchone()
+            else:
+                row = conn.execute(HOT_QUERIES['get_user_count'][0]).fetchone()
+            return (row[0] or 0) if row else 0
+    
+    def get_users_progress_page(self, limit: Optional[int] = 100, cursor: str = None,
+                                sort: str = 'created_at', order: str = 'desc',
+                                role: str = None, search: str = None) -> Dict:
+        """사용자 진행률 페이지 조회 (관리자용, keyset 페이지네이션)
+        
+        사용자 페이지와 (해당 사용자들에 한정한) 테스트 유형별 세션 집계를 하나의 쿼리로 가져온다.
+        반환값의 next_cursor를 다음 호출의 cursor로 넘기면 이어서 조회한다.
+        limit이 없으면 사용자 목록과 전체 세션 집계(커버링 인덱스 한 번 훑기)를 따로 읽어 합친다 -
+        집계를 사용자 목록에 JOIN하면 매번 자동 인덱스를 만들거나 임시 B-tree로 묶어야 해서 더 느리다.
+        total_users는 role/search 필터를 적용한 전체 사용자 수다.
+        """
+        if sort not in USER_PROGRESS_SORTS:
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}")
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"지원하지 않는 정렬 방향입니다: {order}")
+        
+        keys = USER_PROGRESS_SORTS[sort]
+        keyset = self._keyset_values(cursor, len(keys))
+        with self._read_connection() as conn:
+            if limit:
+                # 다음 페이지 존재 여부 확인용으로 한 행 더 조회
+                rows = conn.execute(*_users_progress_query(limit + 1, keyset, sort, order, role, search)).fetchall()
+            else:
+                rows = conn.execute(*_users_page_query(None, keyset, sort, order, role, search)).fetchall()
+                sessions = {}
+                for row in conn.execute(HOT_QUERIES['get_all_users_progress_sessions'][0]).fetchall():
+                    sessions.setdefault(row[0], []).append(row)  # row[0] = user_id
+            if search:
+                # 검색 결과 기준 전체 수 (검색어 LIKE는 어차피 사용자 테이블을 훑으므로 같은 비용)
+                total_users = conn.execute(*_users_count_query(role, search)).fetchone()[0]
+        if not search:
+            total_users = self.get_user_count(role)
+        
+        users = []
+        grouped = {}
+        if limit:
+            for row in rows:
+                user_id = row['id']
+                if user_id not in grouped:
+                    grouped[user_id] = []
+                    users.append({key: row[key] for key in ('id', 'username', 'email', 'full_name', 'role', 'created_at')})
+                if row['test_type'] is not None:
+                    grouped[user_id].append(row)
+        else:
+            users = [dict(row) for row in rows]
+            grouped = {user['id']: sessions.get(user['id'], []) for user in users}
+        
+        next_cursor = None
+        if limit and len(users) > limit:
+            users = users[:limit]
+            last = users[-1]
+            next_cursor = encode_cursor([last[key] for key in keys])
+        
+        for user in users:
+            user['progress'] = _summarize_progress(grouped[user['id']])
+        
+        return {
+            'users': users,
+            'next_cursor': next_cursor,
+            'total_users': total_users
+        }
     
     def get_all_users_progress(self) -> List[Dict]:
         """모든 사용자의 진행률 조회 (관리자용)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # 모든 사용자 조회
-            cursor.execute("""
-                SELECT id, username, email, full_name, role, created_at
-                FROM users
-                WHERE role != 'admin'
-                ORDER BY created_at DESC
-            """)
-            
-            users = [dict(row) for row in cursor.fetchall()]
-            
-            # 각 사용자별 진행률 계산
-            for user in users:
-                user_id = user['id']
-                
-                # 각 테스트 타입별 진행률 계산
-                cursor.execute("""
-                    SELECT 
-                        test_type,
-                        COUNT(*) as total_sessions,
-                        SUM(completed_questions) as total_completed_questions,
-                        SUM(total_questions) as total_questions,
-                        MAX(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as is_completed,
-                        MAX(started_at) as last_activity
-                    FROM test_sessions
-                    WHERE user_id = ?
-                    GROUP BY test_type
-                """, (user_id,))
-                
-                test_progress = {}
-                total_completed = 0
-                total_questions = 0
-                
-                for row in cursor.fetchall():
-                    test_type = row['test_type']
-                    completed = row['total_completed_questions'] or 0
-                    questions = row['total_questions'] or 0
-                    
-                    test_progress[test_type] = {
-                        'completed_questions': completed,
-                        'total_questions': questions,
-                        'progress_percentage': (completed / questions * 100) if questions > 0 else 0,
-                        'is_completed': bool(row['is_completed']),
-                        'last_activity': row['last_activity']
-                    }
-                    
-                    total_completed += completed
-                    total_questions += questions
-                
-                # 전체 진행률 계산
-                overall_progress = (total_completed / total_questions * 100) if total_questions > 0 else 0
-                
-                user['progress'] = {
-                    'overall_progress': {
-                        'completed_questions': total_completed,
-                        'total_questions': total_questions,
-                        'progress_percentage': overall_progress
-                    },
-                    'test_progress': test_progress
-                }
-            
-            return users
+        return self.get_users_progress_page(limit=None)['users']
+    
+    def get_session_report(self, session_id: str, kind: str = 'detail') -> Optional[Tuple[str, str]]:
+        """완료된 세션의 저장된 보고서 (JSON 문자열, ETag) - 없으면 None
+        
+        응답 테이블을 읽지 않고 session_reports 한 행만 조회한다.
+        """
+        if kind not in SESSION_REPORT_KINDS:
+            raise ValueError(f"지원하지 않는 보고서 종류입니다: {kind}")
+        with self._read_connection() as conn:
+            row = conn.execute(_session_report_query(kind), (session_id,)).fetchone()
+            return (row[0], row[1]) if row else None
     
     def get_session_detail(self, session_id: str) -> Optional[Dict]:
-        """세션 상세 정보 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # 세션 정보
-            cursor.execute("""
-                SELECT ts.*, u.username, u.full_name
-                FROM test_sessions ts
-                JOIN users u ON ts.user_id = u.id
-                WHERE ts.id = ?
-            """, (session_id,))
-            
-            session = cursor.fetchone()
-            if not session:
-                return None
-            
-            session_dict = dict(session)
-            
-            # 세션의 응답들
-            cursor.execute("""
-                SELECT * FROM test_responses
-                WHERE session_id = ?
-                ORDER BY created_at ASC
-            """, (session_id,))
-            
-            responses = [dict(row) for row in cursor.fetchall()]
-            session_dict['responses'] = responses
-            
-            # 전문가 피드백 (response_id를 통해 조인)
-            cursor.execute("""
-                SELECT ef.*, tr.session_id
-                FROM expert_feedback ef
-                JOIN test_responses tr ON ef.response_id = tr.id
-                WHERE tr.session_id = ?
-                ORDER BY ef.created_at DESC
-            """, (session_id,))
-            
-            feedback = [dict(row) for row in cursor.fetchall()]
-            session_dict['expert_feedback'] = feedback
-            
-            return session_dict
+        """세션 상세 정보 조회 (완료된 세션은 저장된 보고서 사용)"""
+        report = self.get_session_report(session_id, 'detail')
+        if report:
+            return json.loads(report[0])
+        with self._read_connection() as conn:
+            return _query_session_detail(conn.cursor(), session_id)
     
     def create_expert_feedback(self, session_id: str, expert_name: str, 
                               feedback: str, recommendations: str = '', 
@@ -708,7 +2935,7 @@ class DatabaseManager:
         """전문가 피드백 생성"""
         feedback_id = str(uuid.uuid4())
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -718,15 +2945,16 @@ class DatabaseManager:
                 ) VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (feedback_id, session_id, expert_name, feedback, 
                   recommendations, severity_level, datetime.now().isoformat()))
+            refresh_session_report(cursor, session_id)
             
             conn.commit()
         
+        self._sessions_changed()
         return feedback_id
     
     def get_expert_feedback(self, feedback_id: str) -> Optional[Dict]:
         """전문가 피드백 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -741,71 +2969,144 @@ class DatabaseManager:
             return dict(result) if result else None
     
     def update_expert_score(self, response_id: str, score: float) -> bool:
-        """전문가 점수 업데이트"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # 응답이 존재하는지 확인
-            cursor.execute("SELECT id FROM test_responses WHERE id = ?", (response_id,))
-            if not cursor.fetchone():
-                return False
-            
-            # 전문가 점수 업데이트
-            cursor.execute("""
-                UPDATE test_responses 
-                SET expert_score = ? 
-                WHERE id = ?
-            """, (score, response_id))
-            
-            conn.commit()
-            return cursor.rowcount > 0
+        """전문가 점수 업데이트 (응답이 없으면 False)"""
+        return self.update_expert_scores([{'response_id': response_id, 'score': score}])[0]['ok']
+    
+    def update_expert_scores(self, items: List[Dict], expert_id: str = None) -> List[Dict]:
+        """여러 응답의 전문가 점수를 한 트랜잭션에서 반영
+        
+        items: [{'response_id', 'score', 'comment'(선택)}, ...]
+        expert_id가 있으면 항목마다 전문가 피드백 행도 남긴다.
+        세션 보고서와 검색 색인은 항목마다가 아니라 배치마다 세션별로 한 번 갱신한다.
+        반환: 입력 순서대로 [{'response_id', 'ok', 'error'(실패 시)}, ...]
+        """
+        results = []
+        valid = []
+        for item in items:
+            response_id = item.get('response_id') if isinstance(item, dict) else None
+            result = {'response_id': response_id, 'ok': False}
+            results.append(result)
+            if not isinstance(response_id, str) or not response_id:
+                result['error'] = '응답 ID가 필요합니다.'
+                continue
+            try:
+                score = float(item.get('score'))
+            except (TypeError, ValueError):
+                result['error'] = '유효하지 않은 점수 형식입니다.'
+                continue
+            if not EXPERT_SCORE_MIN <= score <= EXPERT_SCORE_MAX:
+                result['error'] = f'점수는 {EXPERT_SCORE_MIN:g}-{EXPERT_SCORE_MAX:g} 사이의 값이어야 합니다.'
+                continue
+            comment = item.get('comment')
+            if comment is not None and not isinstance(comment, str):
+                result['error'] = '코멘트는 문자열이어야 합니다.'
+                continue
+            valid.append((result, response_id, score, comment))
+        
+        if not valid:
+            return results
+        
+        def op(cursor):
+            sessions = dict(cursor.execute("""
+                SELECT id, session_id FROM test_responses
+                WHERE id IN (SELECT value FROM json_each(?))
+            """, (json.dumps([entry[1] for entry in valid]),)).fetchall())
+            found = [entry for entry in valid if entry[1] in sessions]
+            if not found:
+                return []
+            
+            cursor.executemany("UPDATE test_responses SET expert_score = ? WHERE id = ?",
+                               [(score, response_id) for _, response_id, score, _ in found])
+            if expert_id:
+                cursor.executemany("""
+                    INSERT INTO expert_feedback
+                    (id, response_id, expert_id, feedback_score, feedback_comment)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(str(uuid.uuid4()), response_id, expert_id, score, comment)
+                      for _, response_id, score, comment in found])
+            
+            # 세션별 한 번씩: 완료된 세션 보고서(그룹별 전문가 점수 포함)와 점수 추이 갱신
+            touched = {sessions[response_id] for _, response_id, _, _ in found}
+            for session_id in touched:
+                refresh_session_report(cursor, session_id)
+            refresh_score_trends(cursor, touched)
+            sync_response_search(cursor)
+            
+            owners = dict(cursor.execute("""
+                SELECT id, user_id FROM test_sessions WHERE id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(touched)),)).fetchall())
+            return [{
+                'response_id': response_id,
+                'session_id': sessions[response_id],
+                'user_id': owners.get(sessions[response_id]),
+                'expert_score': score
+            } for _, response_id, score, _ in found]
+        
+        def on_commit(changes):
+            if not changes:
+                return
+            # 점수 추이/진행률이 사용자 단위로 캐시되므로 세션 소유자별로 변경 번호를 올림
+            for user_id in {change['user_id'] for change in changes}:
+                self._sessions_changed(user_id)
+            for change in changes:
+                self._publish_change('expert_score_updated', change)
+        
+        changes = self._write(op, durable=True, on_commit=on_commit)
+        updated = {change['response_id'] for change in changes}
+        for result, response_id, _, _ in valid:
+            if response_id in updated:
+                result['ok'] = True
+            else:
+                result['error'] = '응답을 찾을 수 없습니다.'
+        return results
+    
+    def search_responses(self, query: str, test_type: str = None, min_score: float = None,
+                         max_score: float = None, date_from: str = None, date_to: str = None,
+                         limit: int = 50, cursor: str = None) -> Dict:
+        """응답 전문 검색 (최신순, 커서 기반 페이지네이션)
+        
+        점수 범위는 전문가 점수가 있으면 전문가 점수, 없으면 계산 점수에 적용한다.
+        date_from/date_to는 'YYYY-MM-DD' (date_to 포함).
+        반환: {'results': [...], 'next_cursor': 다음 페이지 커서 또는 None}
+        """
+        keyset = self._keyset_values(cursor, 2)
+        if keyset and not all(isinstance(value, str) for value in keyset):
+            raise ValueError("유효하지 않은 커서입니다.")
+        # 다음 페이지 존재 여부 확인용으로 한 행 더 조회
+        sql, params = _search_query(query, test_type, min_score, max_score, date_from, date_to, limit + 1, keyset)
+        
+        # 다른 경로(외부 도구 등)로 들어온 응답이 아직 색인되지 않았으면 먼저 반영
+        with self._read_connection() as conn:
+            pending = conn.execute(HOT_QUERIES['response_search_pending'][0]).fetchone()
+        if pending:
+            self._write(sync_response_search, durable=True)
+        
+        with self._read_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        results = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor([results[-1]['created_at'], results[-1]['id']])
+        return {'results': results, 'next_cursor': next_cursor}
     
     def get_session_grouped_scores(self, session_id: str) -> Dict:
-        """세션별 그룹 점수 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # 그룹별 점수 통계
-            cursor.execute("""
-                SELECT 
-                    question_group,
-                    question_category,
-                    COUNT(*) as question_count,
-                    AVG(calculated_score) as avg_ai_score,
-                    AVG(expert_score) as avg_expert_score,
-                    SUM(calculated_score) as total_ai_score,
-                    SUM(expert_score) as total_expert_score
-                FROM test_responses 
-                WHERE session_id = ?
-                GROUP BY question_group, question_category
-                ORDER BY question_group
-            """, (session_id,))
-            
-            grouped_scores = [dict(row) for row in cursor.fetchall()]
-            
-            # 전체 점수
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_questions,
-                    AVG(calculated_score) as overall_avg_ai_score,
-                    AVG(expert_score) as overall_avg_expert_score,
-                    SUM(calculated_score) as overall_total_ai_score,
-                    SUM(expert_score) as overall_total_expert_score
-                FROM test_responses 
-                WHERE session_id = ?
-            """, (session_id,))
-            
-            overall_stats = dict(cursor.fetchone())
-            
-            return {
-                'grouped_scores': grouped_scores,
-                'overall_stats': overall_stats
-            }
+        """세션별 그룹 점수 조회 (완료된 세션은 저장된 보고서 사용)"""
+        report = self.get_session_report(session_id, 'grouped')
+        if report:
+            return json.loads(report[0])
+        with self._read_connection() as conn:
+            return _query_session_grouped_scores(conn.cursor(), session_id)
     
     def close(self):
-        """데이터베이스 연결 종료"""
-        pass  # SQLite는 자동으로 연결을 관리함
+        """데이터베이스 연결 종료 (대기 중인 쓰기는 모두 커밋)"""
+        self.stop_writer()
+        self.connections.close_all()
+
+
+# 모든 공개 메서드의 호출 수/지연/반환 행 수 기록 (DB 작업이 아닌 메서드는 제외)
+profile_methods(DatabaseManager, exclude=('hash_password', 'start_writer', 'stop_writer',
+                                          'add_change_listener', 'close'))
 
-# 전역 데이터베이스 인스턴스
-db = DatabaseManager()
+# 전역 데이터베이스 인스턴스 (AI_HELPER_DB_PATH로 다른 파일 사용 가능 - 벤치마크용 합성 DB 등)
+db = DatabaseManager(os.environ.get('AI_HELPER_DB_PATH', 'ai_helper_eval.db'))
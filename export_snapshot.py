@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Columnar Snapshot Export
+분석용으로 사용자/세션/응답/전문가 피드백을 컬럼형 파일(Parquet 또는 Arrow IPC)로 내보낸다.
+운영 DB 파일을 복사해서 직접 조회하는 대신 이 스냅샷을 읽으면 된다.
+
+첫 실행은 전체를, 이후 실행은 마지막 실행 이후 추가/수정된 행만 새 run 파티션으로 내보낸다.
+실행 목록과 파일은 <out>/manifest.json에 기록된다 (같은 id는 run 번호가 큰 행이 최신).
+변경 로그는 첫 실행이 기록을 켠 뒤부터 쌓이고(그 전에는 쓰기마다 기록하지 않음) 내보낸 뒤 지워진다.
+앱은 시작할 때 EXPORT_CHANGES_MAX_ROWS(기본 100만 행)를 넘는 오래된 로그를 정리하며, 그 사이
+내보내지 못한 변경분이 정리되었으면 다음 실행은 전체 내보내기가 된다.
+내보내기를 더 이상 쓰지 않으면 --disable로 기록을 끄고 남은 로그를 지운다.
+
+사용 예:
+    python export_snapshot.py --db ai_helper_eval.db --out snapshots
+    python export_snapshot.py --db ai_helper_eval.db --out snapshots --format arrow --full
+    python export_snapshot.py --db ai_helper_eval.db --disable
+
+읽기 예 (pyarrow):
+    import pyarrow.dataset as ds
+    responses = ds.dataset('snapshots/test_responses', format='parquet', partitioning='hive').to_table()
+"""
+
+import argparse
+import sys
+
+from database import DatabaseManager
+from modules.snapshot_export import SnapshotExporter, FORMATS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="컬럼형 스냅샷 내보내기 (증분)")
+    parser.add_argument('--db', default='ai_helper_eval.db', help="내보낼 데이터베이스")
+    parser.add_argument('--out', default='snapshots', help="스냅샷 디렉터리 (manifest.json 위치)")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='parquet', help="파일 포맷")
+    parser.add_argument('--compression', default='zstd', help="압축 방식 (zstd, lz4, snappy, none 등)")
+    parser.add_argument('--full', action='store_true', help="변경분이 아니라 전체를 다시 내보냄")
+    parser.add_argument('--chunk-rows', type=int, default=50000, help="한 번에 읽어서 쓸 행 수")
+    parser.add_argument('--rows-per-file', type=int, default=1000000, help="파일 하나의 최대 행 수")
+    parser.add_argument('--pause', type=float, default=0.0, help="청크 사이에 쉴 시간(초), 운영 DB 부하 완화용")
+    parser.add_argument('--disable', action='store_true', help="변경 로그 기록을 끄고 남은 로그 삭제 (내보내지 않음)")
+    args = parser.parse_args()
+
+    manager = DatabaseManager(args.db)
+    if args.disable:
+        try:
+            removed = manager.disable_export_changes()
+        finally:
+            manager.close()
+        print(f"변경 로그 기록을 껐습니다. 삭제한 로그 {removed:,}건 (다음 내보내기는 전체 내보내기)")
+        return 0
+    try:
+        exporter = SnapshotExporter(manager, args.out, fmt=args.format, compression=args.compression,
+                                    chunk_rows=args.chunk_rows, rows_per_file=args.rows_per_file,
+                                    pause=args.pause)
+        print(f"스냅샷 내보내기: {args.db} → {args.out} ({args.format})")
+        entry = exporter.run(full=args.full)
+    except (RuntimeError, ValueError) as e:
+        print(f"내보내기 실패: {e}")
+        return 1
+    finally:
+        manager.close()
+
+    if entry.get('warning'):
+        print(f"경고: {entry['warning']}")
+    for table, result in entry['tables'].items():
+        print(f"  {table}: {result['rows']:,}행, 파일 {len(result['files'])}개")
+    total = sum(table['rows'] for table in entry['tables'].values())
+    print(f"\n=== run {entry['run']} ({entry['kind']}) 완료: {total:,}행, {entry['elapsed_seconds']}초 ===")
+    print(f"  변경 로그 seq {entry['from_seq']} → {entry['to_seq']}, 정리된 로그 {entry['pruned_changes']:,}건")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Synthetic Data Generator
+대시보드/진행률 쿼리를 실제 규모에서 측정할 수 있도록 합성 데이터로 데이터베이스를 채운다.
+
+사용자마다 CDI → RCMAS → BDI 세션 묶음(회차)을 rounds번 만들고, 각 문항 응답은
+학습 데이터셋의 해당 테스트 유형 사용자 답변(점수 포함)에서 뽑는다.
+일부 응답에는 전문가 점수/피드백을 붙이고, 응답 키워드로 키워드 이력을 누적한다.
+적재는 DatabaseManager.bulk_insert()로 사용자 묶음 단위 트랜잭션에서 수행한다.
+
+사용 예:
+    python generate_data.py --db bench.db --users 1000 --rounds 2
+    python generate_data.py --db bench_10m.db --users 60000 --rounds 3   # 응답 약 1,000만 건
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from database import DatabaseManager
+from modules.questions import TEST_QUESTIONS
+
+DEFAULT_DATASET = 'training_ds/training_dataset_scored.json'
+TEST_GROUPS = {'cdi': (1, 'CDI'), 'rcmas': (2, 'RCMAS'), 'bdi': (3, 'BDI')}
+STOP_WORDS = {'은', '는', '이', '가', '을', '를', '에', '의', '로', '으로', '와', '과', '도', '만', '부터', '까지'}
+FEEDBACK_COMMENTS = ["점수 조정", "응답 맥락 고려", "추가 관찰 필요", "적절함", None]
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def extract_keywords(text):
+    """DatabaseManager.extract_and_update_keywords()와 같은 방식의 키워드 추출"""
+    keywords = re.findall(r'\b\w+\b', text.lower())
+    return [kw for kw in keywords if kw not in STOP_WORDS and len(kw) > 1]
+
+
+def load_answer_pool(dataset_path):
+    """테스트 유형별 (답변, 점수, 키워드 목록, 키워드 JSON) 목록"""
+    pool = defaultdict(list)
+    with open(dataset_path, 'r', encoding='utf-8') as f:
+        dialogs = json.load(f)
+
+    for dialog in dialogs:
+        for turn in dialog:
+            metadata = turn.get('metadata') or {}
+            category = metadata.get('category')
+            if turn.get('speaker') == 'user' and category in TEST_QUESTIONS:
+                text = turn['utterance']
+                keywords = extract_keywords(text)
+                pool[category].append((text, float(turn.get('score', 0)), keywords,
+                                       json.dumps(keywords, ensure_ascii=False)))
+
+    for test_type in TEST_QUESTIONS:
+        if not pool[test_type]:
+            pool[test_type] = [(text, 1.0, [text], json.dumps([text], ensure_ascii=False))
+                               for text in ("그냥 그래", "괜찮아", "조금 힘들어")]
+    return pool
+
+
+class SequentialIds:
+    """실행마다 다른 접두어 + 증가하는 번호로 만든 UUID 형식 ID
+
+    uuid4는 무작위라 수백만 건을 넣을 때 PRIMARY KEY B-tree의 임의 위치에 삽입되어
+    페이지 캐시를 벗어나면 급격히 느려진다. 증가하는 ID는 항상 끝에 추가된다.
+    """
+
+    def __init__(self, rng):
+        self._prefix = rng.getrandbits(64) << 64
+        self._next = 0
+
+    def __call__(self):
+        self._next += 1
+        return str(uuid.UUID(int=self._prefix | self._next))
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    next_id = SequentialIds(rng)
+    pool = load_answer_pool(args.dataset)
+    manager = DatabaseManager(args.db)
+    password_hash = manager.hash_password(args.password)
+    now = datetime.now().replace(microsecond=0)
+    run_tag = uuid.uuid4().hex[:6]
+
+    experts = [(next_id(), f"expert_{run_tag}_{i}", f"expert_{run_tag}_{i}@example.com", password_hash,
+                f"전문가 {i}", 'expert', (now - timedelta(days=args.days)).strftime(TIMESTAMP_FORMAT))
+               for i in range(args.experts)]
+    expert_ids = [row[0] for row in experts]
+    if experts:
+        manager.bulk_insert(users=experts, refresh_reports=False)
+
+    totals = Counter()
+    keyword_counts = Counter()
+    started = time.perf_counter()
+    test_types = list(TEST_QUESTIONS)
+
+    for batch_start in range(0, args.users, args.batch_users):
+        users, sessions, responses, feedback = [], [], [], []
+        for index in range(batch_start, min(batch_start + args.batch_users, args.users)):
+            user_id = next_id()
+            created = now - timedelta(days=args.days, seconds=-rng.randrange(86400))
+            users.append((user_id, f"user_{run_tag}_{index}", f"user_{run_tag}_{index}@example.com",
+                          password_hash, f"사용자 {index}", 'user', created.strftime(TIMESTAMP_FORMAT)))
+
+            # 회차 시작 시각을 가입 이후 기간에 오름차순으로 분포
+            offsets = sorted(rng.uniform(0, max(args.days - 1, 0) * 86400) for _ in range(args.rounds))
+            for round_index, offset in enumerate(offsets):
+                moment = created + timedelta(seconds=offset)
+                last_round = round_index == args.rounds - 1
+                stop_early = last_round and rng.random() < args.in_progress_ratio
+                for type_index, test_type in enumerate(test_types):
+                    questions = TEST_QUESTIONS[test_type]
+                    answered = len(questions)
+                    # 마지막 회차 일부는 중간에 멈춘 상태로 남김
+                    if stop_early and type_index == len(test_types) - 1:
+                        answered = rng.randrange(len(questions))
+                    session_id = next_id()
+                    session_started = moment
+                    group, category = TEST_GROUPS.get(test_type, (1, 'UNKNOWN'))
+                    total_score = 0.0
+                    for question_index in range(answered):
+                        text, score, keywords, keywords_json = rng.choice(pool[test_type])
+                        moment += timedelta(seconds=rng.randrange(5, 90))
+                        response_id = next_id()
+                        expert_score = None
+                        if expert_ids and rng.random() < args.expert_ratio:
+                            expert_score = float(max(0, min(3, score + rng.choice((-1, 0, 0, 1)))))
+                            feedback.append((next_id(), response_id, rng.choice(expert_ids), expert_score,
+                                             rng.choice(FEEDBACK_COMMENTS), None,
+                                             moment.strftime(TIMESTAMP_FORMAT)))
+                        responses.append((response_id, session_id, str(question_index), questions[question_index],
+                                          text, 'answer', score, expert_score, keywords_json, group, category,
+                                          moment.strftime(TIMESTAMP_FORMAT)))
+                        total_score += score
+                        for keyword in keywords:
+                            keyword_counts[(test_type, str(question_index), keyword)] += 1
+                    completed = answered == len(questions)
+                    sessions.append((session_id, user_id, test_type, 'completed' if completed else 'in_progress',
+                                     len(questions), answered, total_score, round_index + 1,
+                                     session_started.strftime(TIMESTAMP_FORMAT),
+                                     moment.strftime(TIMESTAMP_FORMAT) if completed else None))
+
+        counts = manager.bulk_insert(users, sessions, responses, feedback, refresh_reports=not args.no_reports)
+        totals.update(counts)
+        elapsed = time.perf_counter() - started
+        print(f"  사용자 {batch_start + len(users):,}/{args.users:,}  응답 {totals['test_responses']:,}건  "
+              f"{elapsed:.1f}초 ({totals['test_responses'] / elapsed:,.0f} 응답/초)")
+
+    manager.bulk_insert(keyword_counts=[(*key, count) for key, count in keyword_counts.items()],
+                        refresh_reports=False)
+    totals['keyword_extraction_history'] = len(keyword_counts)
+
+    with manager.connections.connection() as conn:
+        conn.execute("PRAGMA optimize")
+    manager.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n=== 합성 데이터 생성 완료 ({elapsed:.1f}초) ===")
+    print(f"  전문가 {len(experts):,}명")
+    for table in ('users', 'test_sessions', 'test_responses', 'expert_feedback',
+                  'session_reports', 'score_trends', 'keyword_extraction_history'):
+        print(f"  {table}: {totals[table]:,}")
+    print(f"  DB 크기: {os.path.getsize(args.db) / 1024 / 1024:,.1f}MB")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터 생성")
+    parser.add_argument('--db', default='bench.db', help="대상 데이터베이스 파일 (없으면 생성)")
+    parser.add_argument('--users', type=int, default=1000, help="생성할 사용자 수")
+    parser.add_argument('--rounds', type=int, default=2, help="사용자별 CDI/RCMAS/BDI 검사 회차 수")
+    parser.add_argument('--experts', type=int, default=10, help="생성할 전문가 수")
+    parser.add_argument('--expert-ratio', type=float, default=0.1, help="전문가 점수를 붙일 응답 비율")
+    parser.add_argument('--in-progress-ratio', type=float, default=0.2,
+                        help="마지막 회차를 진행 중 상태로 남길 사용자 비율")
+    parser.add_argument('--days', type=int, default=180, help="데이터를 분포시킬 기간(일)")
+    parser.add_argument('--batch-users', type=int, default=500, help="트랜잭션 하나에 넣을 사용자 수")
+    parser.add_argument('--no-reports', action='store_true', help="완료된 세션 보고서를 만들지 않음")
+    parser.add_argument('--password', default='password', help="생성된 계정의 비밀번호")
+    parser.add_argument('--dataset', default=DEFAULT_DATASET, help="답변을 뽑을 학습 데이터셋")
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    generate(parse_args())
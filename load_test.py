@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+AI Helper Evaluation System - Load Test
+가상 사용자 N명이 회원가입/로그인 → 세션 시작 → 대화 → 트리거 → CDI/RCMAS/BDI 60문항 응답을
+수행하면서 엔드포인트별/턴 유형별 처리량과 지연 시간(p50/p95/p99)을 측정한다.
+
+사용 예:
+    python load_test.py --base-url http://localhost:18080 --users 50 --think-time exponential --think-mean 2
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+
+from modules.questions import TRIGGER_KEYWORDS, TEST_QUESTIONS
+
+DEFAULT_DATASET = 'training_ds/training_dataset_scored.json'
+TOTAL_TEST_QUESTIONS = sum(len(questions) for questions in TEST_QUESTIONS.values())
+# 전체 응답 순서상 각 문항이 속한 테스트 유형 (CDI → RCMAS → BDI)
+TEST_SEQUENCE = [test_type for test_type, questions in TEST_QUESTIONS.items() for _ in questions]
+
+CHAT_MESSAGES = [
+    "안녕", "오늘 학교 다녀왔어", "점심 맛있었어", "친구랑 게임했어",
+    "주말에 뭐 할지 고민 중이야", "숙제가 좀 많아", "음악 듣는 거 좋아해"
+]
+
+
+def load_answer_pool(dataset_path):
+    """학습 데이터셋에서 테스트 유형별 사용자 답변 목록 로드"""
+    pool = defaultdict(list)
+    with open(dataset_path, 'r', encoding='utf-8') as f:
+        dialogs = json.load(f)
+
+    for dialog in dialogs:
+        for turn in dialog:
+            metadata = turn.get('metadata') or {}
+            category = metadata.get('category')
+            if turn.get('speaker') == 'user' and category in TEST_QUESTIONS:
+                pool[category].append(turn['utterance'])
+
+    for test_type in TEST_QUESTIONS:
+        if not pool[test_type]:
+            pool[test_type] = ["그냥 그래", "괜찮아", "조금 힘들어"]
+    return pool
+
+
+class ThinkTime:
+    """가상 사용자의 요청 간 대기 시간 분포"""
+
+    def __init__(self, distribution='exponential', mean=1.0, rng=None):
+        self.distribution = distribution
+        self.mean = mean
+        self.rng = rng or random.Random()
+
+    def sample(self):
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == 'constant':
+            return self.mean
+        if self.distribution == 'uniform':
+            return self.rng.uniform(0, 2 * self.mean)
+        if self.distribution == 'lognormal':
+            # 평균이 mean이 되도록 mu 조정 (sigma=0.5)
+            sigma = 0.5
+            return self.rng.lognormvariate(math.log(self.mean) - sigma * sigma / 2, sigma)
+        return self.rng.expovariate(1.0 / self.mean)
+
+
+class LatencyRecorder:
+    """엔드포인트/턴 유형별 지연 시간 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_endpoint = defaultdict(list)
+        self.by_turn = defaultdict(list)
+        self.status_counts = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, turn_type, elapsed, status):
+        with self._lock:
+            self.by_endpoint[endpoint].append(elapsed)
+            self.by_turn[turn_type].append(elapsed)
+            self.status_counts[endpoint][status] += 1
+
+    @staticmethod
+    def _summary(samples, duration):
+        ordered = sorted(samples)
+
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+        return {
+            'count': len(ordered),
+            'throughput_rps': round(len(ordered) / duration, 2) if duration > 0 else 0.0,
+            'p50_ms': round(percentile(0.50), 1),
+            'p95_ms': round(percentile(0.95), 1),
+            'p99_ms': round(percentile(0.99), 1),
+            'max_ms': round(ordered[-1] * 1000, 1) if ordered else 0.0
+        }
+
+    def report(self, duration):
+        with self._lock:
+            total = sum(len(samples) for samples in self.by_endpoint.values())
+            return {
+                'duration_sec': round(duration, 2),
+                'total_requests': total,
+                'throughput_rps': round(total / duration, 2) if duration > 0 else 0.0,
+                'endpoints': {name: self._summary(samples, duration)
+                              for name, samples in sorted(self.by_endpoint.items())},
+                'turn_types': {name: self._summary(samples, duration)
+                               for name, samples in sorted(self.by_turn.items())},
+                'status_codes': {name: dict(codes) for name, codes in sorted(self.status_counts.items())}
+            }
+
+
+def _parse_retry_after(value):
+    """Retry-After 헤더(초 단위)를 float로 변환 (없거나 HTTP 날짜 형식이면 None)"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class VirtualUser:
+    """한 명의 학생 시나리오를 수행하는 가상 사용자"""
+
+    def __init__(self, index, args, recorder, answer_pool, rng):
+        self.index = index
+        self.base_url = args.base_url.rstrip('/')
+        self.args = args
+        self.recorder = recorder
+        self.answer_pool = answer_pool
+        self.rng = rng
+        self.think = ThinkTime(args.think_time, args.think_mean, rng)
+        self.user_id = None
+        self.session_id = None
+        self.completed_tests = False
+        self.errors = 0
+        self.coalesced = 0
+        self.retry_after = None  # 마지막 오류 응답의 Retry-After(초)
+
+    def _request(self, method, path, endpoint, turn_type, payload=None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        req.add_header('Content-Type', 'application/json; charset=utf-8')
+
+        started = time.perf_counter()
+        status = 0
+        body = None
+        self.retry_after = None
+        try:
+            with urllib.request.urlopen(req, timeout=self.args.timeout) as resp:
+                status = resp.status
+                body = json.loads(resp.read().decode('utf-8') or 'null')
+        except urllib.error.HTTPError as e:
+            status = e.code
+            self.retry_after = _parse_retry_after(e.headers.get('Retry-After'))
+        except Exception:
+            status = 0
+        elapsed = time.perf_counter() - started
+
+        self.recorder.record(endpoint, turn_type, elapsed, status)
+        if status < 200 or status >= 300:
+            self.errors += 1
+        return status, body
+
+    def _pause(self):
+        delay = self.think.sample()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _login(self):
+        tag = f"{self.args.user_prefix}{self.index}"
+        email = f"{tag}@loadtest.local"
+        password = 'loadtest'
+
+        status, body = self._request('POST', '/api/auth/login', '/api/auth/login', 'login',
+                                     {'email': email, 'password': password})
+        if status == 200 and body:
+            self.user_id = body['user']['id']
+            return True
+
+        status, body = self._request('POST', '/api/auth/register', '/api/auth/register', 'register',
+                                     {'username': tag, 'email': email, 'password': password,
+                                      'full_name': f"부하테스트 {self.index}"})
+        if status == 200 and body:
+            self.user_id = body['user_id']
+            return True
+        return False
+
+    def _send(self, message, turn_type):
+        return self._request('POST', '/api/message', '/api/message', turn_type,
+                             {'session_id': self.session_id, 'message': message})
+
+    def run(self):
+        if not self._login():
+            return
+
+        status, body = self._request('POST', '/api/start_session', '/api/start_session', 'start_session',
+                                     {'user_id': self.user_id})
+        if status != 200 or not body:
+            return
+        self.session_id = body['session_id']
+
+        for _ in range(self.args.chat_turns):
+            self._pause()
+            self._send(self.rng.choice(CHAT_MESSAGES), 'chat')
+
+        self._pause()
+        trigger = self.rng.choice(TRIGGER_KEYWORDS)
+        status, body = self._send(f"요즘 좀 {trigger} 것 같아", 'trigger')
+        if status != 200 or not body or body.get('intent') != 'test_start':
+            return
+
+        answered = 0
+        while answered < TOTAL_TEST_QUESTIONS:
+            self._pause()
+            test_type = TEST_SEQUENCE[answered]
+            status, body = self._send(self.rng.choice(self.answer_pool[test_type]), 'test_answer')
+            if status == 200:
+                answered += 1
+                if body and body.get('is_complete'):
+                    self.completed_tests = True
+                    break
+            elif status == 202:
+                # coalesce 정책: 대기 중인 턴에 답변이 병합됨 (실패 아님) - 문항 수는 200 응답으로만 세고 다음 답변을 보냄
+                self.coalesced += 1
+            elif status in (409, 503):
+                # 과부하/동시 요청 거절 - 서버가 준 Retry-After(없으면 --retry-backoff)만큼 쉬었다가 같은 문항 재시도
+                time.sleep(self.retry_after if self.retry_after is not None else self.args.retry_backoff)
+            else:
+                break
+
+
+def run_load_test(args):
+    answer_pool = load_answer_pool(args.dataset)
+    recorder = LatencyRecorder()
+    master_rng = random.Random(args.seed)
+
+    users = [VirtualUser(i, args, recorder, answer_pool, random.Random(master_rng.random()))
+             for i in range(args.users)]
+    threads = []
+
+    started = time.perf_counter()
+    for i, user in enumerate(users):
+        thread = threading.Thread(target=user.run, name=f"vu-{i}", daemon=True)
+        threads.append(thread)
+        thread.start()
+        if args.ramp_up > 0 and args.users > 1:
+            time.sleep(args.ramp_up / (args.users - 1))
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    report = recorder.report(duration)
+    report['virtual_users'] = args.users
+    report['completed_all_tests'] = sum(1 for user in users if user.completed_tests)
+    report['errors'] = sum(user.errors for user in users)
+    report['coalesced'] = sum(user.coalesced for user in users)
+    return report
+
+
+def print_report(report):
+    print(f"\n=== 부하 테스트 결과 ({report['virtual_users']}명, {report['duration_sec']}초) ===")
+    print(f"총 요청: {report['total_requests']}  처리량: {report['throughput_rps']} req/s  "
+          f"오류: {report['errors']}  병합(202): {report['coalesced']}  전체 테스트 완료: {report['completed_all_tests']}명")
+
+    for title, key in (("엔드포인트별", 'endpoints'), ("턴 유형별", 'turn_types')):
+        print(f"\n[{title}]")
+        print(f"{'이름':<24}{'요청':>8}{'req/s':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+        for name, stats in report[key].items():
+            print(f"{name:<24}{stats['count']:>8}{stats['throughput_rps']:>9}"
+                  f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+
+    print("\n[상태 코드]")
+    for name, codes in report['status_codes'].items():
+        print(f"{name:<24}{codes}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="대화 API 다중 사용자 부하 테스트")
+    parser.add_argument('--base-url', default='http://localhost:18080', help="서버 기본 URL")
+    parser.add_argument('--users', type=int, default=10, help="가상 사용자 수")
+    parser.add_argument('--chat-turns', type=int, default=3, help="트리거 전 일반 대화 횟수")
+    parser.add_argument('--think-time', default='exponential',
+                        choices=['constant', 'uniform', 'exponential', 'lognormal'],
+                        help="요청 간 대기 시간 분포")
+    parser.add_argument('--think-mean', type=float, default=1.0, help="평균 대기 시간(초)")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="모든 사용자를 시작하는 데 걸리는 시간(초)")
+    parser.add_argument('--timeout', type=float, default=120.0, help="요청 타임아웃(초)")
+    parser.add_argument('--retry-backoff', type=float, default=1.0, help="409/503 응답에 Retry-After가 없을 때 재시도 대기(초)")
+    parser.add_argument('--dataset', default=DEFAULT_DATASET, help="답변을 가져올 학습 데이터셋")
+    parser.add_argument('--user-prefix', default=f"lt_{uuid.uuid4().hex[:6]}_", help="가상 사용자 계정 접두사")
+    parser.add_argument('--seed', type=int, default=42, help="랜덤 시드")
+    parser.add_argument('--json', dest='json_output', help="결과를 JSON 파일로 저장")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    report = run_load_test(args)
+    print_report(report)
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
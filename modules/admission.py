@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# LLM 작업 우선순위 클래스 (숫자가 작을수록 먼저 처리)
+PRIORITY_CLASSES = {
+    'scoring': 0,  # 테스트 답변 채점
+    'intent': 1,   # 의도 분석
+    'chat': 2      # 일반 대화
+}
+
+
+class AdmissionRejected(Exception):
+    """LLM 작업이 허용 예산 내에 처리될 수 없어 거절된 경우"""
+
+    def __init__(self, message, retry_after=1, reason='queue_full'):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ('key', 'priority', 'finish_tag', 'enqueued_at', 'granted', 'rejected', 'seq')
+
+    def __init__(self, key, priority, finish_tag, seq):
+        self.key = key
+        self.priority = priority
+        self.finish_tag = finish_tag
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.rejected = None
+        self.seq = seq
+
+
+class AdmissionController:
+    """LLM(Ollama) 호출에 대한 입장 제어 및 사용자별 공정 스케줄링
+
+    동시에 실행되는 LLM 작업 수를 max_concurrency로 제한하고,
+    대기열이 max_queue를 넘거나 max_wait 초 안에 차례가 오지 않으면
+    AdmissionRejected를 발생시켜 빠르게 실패(또는 대체 응답)하도록 한다.
+
+    대기 중인 작업은 우선순위 클래스(PRIORITY_CLASSES) 순으로 처리하고,
+    같은 클래스 안에서는 사용자(user_id/session_id)별 가상 완료 시각으로
+    가중 공정 큐(WFQ)를 구성한다. 한 사용자가 동시에 점유할 수 있는
+    슬롯은 max_per_user로 제한된다.
+    """
+
+    def __init__(self, max_concurrency=2, max_queue=16, max_wait=10.0,
+                 max_per_user=1, user_weights=None):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_per_user = max(1, min(max_per_user, max_concurrency))
+        self.user_weights = user_weights or {}
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._in_flight_by_key = collections.Counter()
+        self._waiters = []
+        self._seq = 0
+        # 클래스별 가상 시간 및 사용자별 마지막 가상 완료 시각
+        self._virtual_time = {name: 0.0 for name in PRIORITY_CLASSES}
+        self._last_finish = {name: {} for name in PRIORITY_CLASSES}
+        # 평균 처리 시간 (Retry-After 추정용, 지수 이동 평균)
+        self._avg_service_time = 1.0
+
+        self.admitted_count = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.shed_preempted = 0
+        self.degraded_count = 0
+        # 클래스별 스케줄링 지연 (최근 샘플)
+        self._delay_samples = {name: collections.deque(maxlen=1000) for name in PRIORITY_CLASSES}
+        self._delay_totals = {name: [0, 0.0, 0.0] for name in PRIORITY_CLASSES}  # count, sum, max
+
+    def _retry_after(self):
+        """현재 대기열 기준 재시도 권장 시간(초)"""
+        backlog = (len(self._waiters) + self._in_flight) / max(self.max_concurrency, 1)
+        return max(1, math.ceil(backlog * self._avg_service_time))
+
+    def _weight(self, key):
+        return self.user_weights.get(key, 1.0)
+
+    def _can_run(self, key):
+        return (self._in_flight < self.max_concurrency and
+                (key is None or self._in_flight_by_key[key] < self.max_per_user))
+
+    def _start(self, key, priority, delay):
+        self._in_flight += 1
+        if key is not None:
+            self._in_flight_by_key[key] += 1
+        self.admitted_count += 1
+        self._delay_samples[priority].append(delay)
+        totals = self._delay_totals[priority]
+        totals[0] += 1
+        totals[1] += delay
+        totals[2] = max(totals[2], delay)
+
+    def _dispatch(self):
+        """빈 슬롯이 있으면 다음 대기 작업에 배정"""
+        granted = False
+        while self._in_flight < self.max_concurrency and self._waiters:
+            candidates = [w for w in self._waiters if self._can_run(w.key)]
+            if not candidates:
+                break
+            waiter = min(candidates, key=lambda w: (PRIORITY_CLASSES[w.priority], w.finish_tag, w.seq))
+            self._waiters.remove(waiter)
+            self._virtual_time[waiter.priority] = waiter.finish_tag
+            self._prune_finish_tags(waiter.priority)
+            waiter.granted = True
+            self._start(waiter.key, waiter.priority, time.monotonic() - waiter.enqueued_at)
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _prune_finish_tags(self, priority, limit=10000):
+        """가상 시간보다 뒤처진 사용자 기록 정리 (메모리 제한)"""
+        last_finish = self._last_finish[priority]
+        if len(last_finish) > limit:
+            vtime = self._virtual_time[priority]
+            for key in [k for k, tag in last_finish.items() if tag <= vtime]:
+                del last_finish[key]
+
+    def _preempt_for(self, priority):
+        """대기열이 가득 찼을 때 더 낮은 우선순위의 가장 최근 대기 작업을 밀어냄"""
+        rank = PRIORITY_CLASSES[priority]
+        victims = [w for w in self._waiters if PRIORITY_CLASSES[w.priority] > rank]
+        if not victims:
+            return False
+        victim = max(victims, key=lambda w: (PRIORITY_CLASSES[w.priority], w.seq))
+        self._waiters.remove(victim)
+        victim.rejected = 'preempted'
+        self.shed_preempted += 1
+        self._cond.notify_all()
+        return True
+
+    def acquire(self, key=None, priority='chat'):
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"지원하지 않는 우선순위 클래스입니다: {priority}")
+        with self._cond:
+            if not self._waiters and self._can_run(key):
+                self._start(key, priority, 0.0)
+                return
+            if len(self._waiters) >= self.max_queue and not self._preempt_for(priority):
+                self.shed_queue_full += 1
+                raise AdmissionRejected("LLM 작업 대기열이 가득 찼습니다.",
+                                        self._retry_after(), 'queue_full')
+
+            # 가상 완료 시각 = max(클래스 가상 시간, 해당 사용자 직전 완료 시각) + 1/가중치
+            last_finish = self._last_finish[priority]
+            start_tag = max(self._virtual_time[priority], last_finish.get(key, 0.0))
+            finish_tag = start_tag + 1.0 / self._weight(key)
+            last_finish[key] = finish_tag
+
+            self._seq += 1
+            waiter = _Waiter(key, priority, finish_tag, self._seq)
+            self._waiters.append(waiter)
+            self._dispatch()
+
+            deadline = waiter.enqueued_at + self.max_wait
+            while not waiter.granted:
+                if waiter.rejected:
+                    raise AdmissionRejected("더 높은 우선순위 작업에 의해 대기열에서 밀려났습니다.",
+                                            self._retry_after(), waiter.rejected)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiters.remove(waiter)
+                    self.shed_timeout += 1
+                    raise AdmissionRejected("LLM 작업 대기 시간이 초과되었습니다.",
+                                            self._retry_after(), 'timeout')
+                self._cond.wait(remaining)
+
+    def release(self, key=None, service_time=None):
+        with self._cond:
+            self._in_flight -= 1
+            if key is not None:
+                self._in_flight_by_key[key] -= 1
+                if self._in_flight_by_key[key] <= 0:
+                    del self._in_flight_by_key[key]
+            if service_time is not None:
+                self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * service_time
+            self._dispatch()
+
+    def record_degraded(self):
+        """대체 응답으로 처리된 요청 수 기록"""
+        with self._cond:
+            self.degraded_count += 1
+
+    @contextmanager
+    def slot(self, key=None, priority='chat'):
+        """LLM 작업 슬롯을 잡은 상태로 실행"""
+        self.acquire(key, priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(key, time.monotonic() - started)
+
+    def _delay_stats(self, priority):
+        samples = sorted(self._delay_samples[priority])
+        count, total, max_delay = self._delay_totals[priority]
+
+        def percentile(p):
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 4)
+
+        return {
+            'count': count,
+            'avg': round(total / count, 4) if count else 0.0,
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'max': round(max_delay, 4)
+        }
+
+    def stats(self):
+        """대기열, 거절 및 클래스별 스케줄링 지연 통계"""
+        with self._cond:
+            queued_by_class = collections.Counter(w.priority for w in self._waiters)
+            return {
+                'in_flight': self._in_flight,
+                'queue_depth': len(self._waiters),
+                'queue_depth_by_class': {name: queued_by_class.get(name, 0) for name in PRIORITY_CLASSES},
+                'active_users': len(self._in_flight_by_key),
+                'max_concurrency': self.max_concurrency,
+                'max_per_user': self.max_per_user,
+                'max_queue': self.max_queue,
+                'max_wait': self.max_wait,
+                'admitted': self.admitted_count,
+                'shed_queue_full': self.shed_queue_full,
+                'shed_timeout': self.shed_timeout,
+                'shed_preempted': self.shed_preempted,
+                'degraded': self.degraded_count,
+                'avg_service_time': round(self._avg_service_time, 3),
+                'scheduling_delay': {name: self._delay_stats(name) for name in PRIORITY_CLASSES}
+            }
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ChangeFeed:
+    """DB 변경 델타를 Socket.IO 방(room)으로 묶어서 내보내는 피드
+
+    publish()는 델타를 방별 버퍼에 넣기만 하고(O(1), 예외 없음), 전용 스레드가
+    interval 초마다 방별로 한 번씩 emit한다. 같은 주기 안에서 같은 대상
+    (예: 같은 세션의 session_updated)이 여러 번 바뀌면 마지막 델타만 보낸다.
+    따라서 전송량은 대시보드를 보는 사람 수나 폴링 주기가 아니라 변경 빈도에 비례한다.
+    """
+
+    def __init__(self, emit, event_name='dashboard_delta', interval=0.25, max_pending=5000):
+        self._emit = emit
+        self.event_name = event_name
+        self.interval = interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = {}  # room -> OrderedDict((type, key) -> delta)
+        self._pending_count = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.published_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.emitted_count = 0
+        self.batch_count = 0
+        self.last_error = None
+
+    def publish(self, delta_type, data, rooms, key=None):
+        """델타를 방별 버퍼에 추가 (key가 같은 델타는 마지막 것으로 덮어씀)"""
+        try:
+            delta = {'type': delta_type, 'data': data, 'ts': time.time()}
+            slot = (delta_type, key if key is not None else id(delta))
+            with self._lock:
+                for room in rooms:
+                    buffer = self._pending.setdefault(room, OrderedDict())
+                    if slot in buffer:
+                        del buffer[slot]
+                        self.coalesced_count += 1
+                    elif self._pending_count >= self.max_pending:
+                        self.dropped_count += 1
+                        continue
+                    else:
+                        self._pending_count += 1
+                    buffer[slot] = delta
+                self.published_count += 1
+            self._wakeup.set()
+            return True
+        except Exception:
+            self.dropped_count += 1
+            return False
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='change-feed', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 델타를 방별로 한 번씩 전송"""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._pending_count = 0
+        for room, buffer in pending.items():
+            deltas = list(buffer.values())
+            try:
+                self._emit(self.event_name, {'deltas': deltas}, room)
+                self.emitted_count += len(deltas)
+                self.batch_count += 1
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"대시보드 델타 전송 실패 ({room}): {e}")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            if self._stopped.is_set():
+                break
+            # 짧게 기다려 같은 주기의 변경을 모아서 전송
+            time.sleep(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def stats(self):
+        return {
+            'pending': self._pending_count,
+            'rooms_pending': len(self._pending),
+            'published': self.published_count,
+            'coalesced': self.coalesced_count,
+            'dropped': self.dropped_count,
+            'emitted': self.emitted_count,
+            'batches': self.batch_count,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from database import HOT_QUERIES
+
+# 분포/비교에 사용할 수 있는 세션 지표 (score_trends 컬럼)
+METRICS = ('total_score', 'ai_avg', 'expert_avg', 'gap_avg')
+
+# 코호트 비교 기준
+COHORT_KEYS = ('test_type', 'round', 'month')
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90, 95, 99)
+
+
+
+def _epoch(date_text, end=False):
+    """'YYYY-MM-DD'를 epoch 초로 변환 (end=True이면 그날의 끝, 다음 날 0시)"""
+    try:
+        value = datetime.strptime(date_text, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+    return int((value - datetime(1970, 1, 1)).total_seconds()) + (86400 if end else 0)
+
+
+def _finite(values):
+    return values[~np.isnan(values)]
+
+
+def _round(value, digits=4):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+class CohortAnalytics:
+    """완료된 세션 점수(score_trends)의 메모리 NumPy 컬럼 캐시와 모집단 분포/코호트 분석
+
+    세션마다 고정된 slot 번호를 배열 위치로 쓰고, 마지막으로 읽은 변경 번호(seq) 이후 행만
+    읽어서 해당 위치에 덮어쓴다(추가/전문가 점수 수정 모두). 조회는 refresh_interval 초가
+    지났을 때만 변경분을 확인하며, 필터/히스토그램/백분위/그룹 집계는 모두 벡터 연산으로 처리한다.
+    """
+
+    def __init__(self, connect, refresh_interval=5.0, chunk_size=50000):
+        self._connect = connect
+        self.refresh_interval = refresh_interval
+        self.chunk_size = chunk_size
+        self._lock = threading.RLock()
+        self._capacity = 0
+        self._size = 0
+        self._high_water = 0
+        self._refreshed_at = None
+        self._test_types = {}
+        self._test_type_names = []
+        self._users = {}
+        self._columns = {}
+        self._allocate(1024)
+
+        self.refresh_count = 0
+        self.rows_loaded = 0
+        self.last_refresh_ms = 0.0
+
+    def _allocate(self, capacity):
+        """컬럼 배열을 capacity 크기로 (다시) 할당하고 기존 값을 복사"""
+        columns = {
+            'valid': np.zeros(capacity, dtype=bool),
+            'user': np.zeros(capacity, dtype=np.int32),
+            'test_type': np.zeros(capacity, dtype=np.int16),
+            'completed_at': np.zeros(capacity, dtype=np.int64),
+            'round': np.zeros(capacity, dtype=np.int32),
+            'expert_count': np.zeros(capacity, dtype=np.int32),
+        }
+        for metric in METRICS:
+            columns[metric] = np.full(capacity, np.nan, dtype=np.float32)
+        for name, array in self._columns.items():
+            columns[name][:self._capacity] = array
+        self._columns = columns
+        self._capacity = capacity
+
+    def _code(self, mapping, value, names=None):
+        code = mapping.get(value)
+        if code is None:
+            code = mapping[value] = len(mapping)
+            if names is not None:
+                names.append(value)
+        return code
+
+    def _apply(self, rows):
+        """변경된 행들을 slot 위치에 기록"""
+        slots = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)) - 1
+        needed = int(slots.max()) + 1
+        if needed > self._capacity:
+            self._allocate(max(needed, self._capacity * 2))
+
+        columns = self._columns
+        columns['valid'][slots] = True
+        columns['user'][slots] = [self._code(self._users, row[2]) for row in rows]
+        columns['test_type'][slots] = [self._code(self._test_types, row[3], self._test_type_names)
+                                       for row in rows]
+        columns['completed_at'][slots] = [row[4] or 0 for row in rows]
+        columns['round'][slots] = [row[5] or 0 for row in rows]
+        for offset, metric in enumerate(METRICS, start=6):
+            columns[metric][slots] = np.array([row[offset] for row in rows], dtype=np.float32)
+        columns['expert_count'][slots] = [row[10] for row in rows]
+        self._size = max(self._size, needed)
+        self._high_water = max(self._high_water, rows[-1][1])
+
+    def refresh(self, force=False):
+        """마지막 seq 이후 변경분을 읽어 반영 (refresh_interval 안에 다시 부르면 건너뜀)"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+                return 0
+            started = time.perf_counter()
+            loaded = 0
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(HOT_QUERIES['score_trend_changes'][0], (self._high_water,))
+                while True:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+                    self._apply(rows)
+                    loaded += len(rows)
+                cursor.close()
+            self._refreshed_at = now
+            self.refresh_count += 1
+            self.rows_loaded += loaded
+            self.last_refresh_ms = (time.perf_counter() - started) * 1000
+            return loaded
+
+    def version(self):
+        """refresh 후 캐시에 반영된 마지막 변경 번호 (같으면 분포/비교 결과도 같음, 응답 ETag용)"""
+        with self._lock:
+            self.refresh()
+            return self._high_water
+
+    def _select(self, test_type=None, date_from=None, date_to=None, session_round=None, latest=False):
+        """조건에 맞는 세션 위치 배열 (latest=True이면 사용자별 가장 최근 세션만)"""
+        columns = self._columns
+        size = self._size
+        mask = columns['valid'][:size].copy()
+        if test_type:
+            code = self._test_types.get(test_type)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= columns['test_type'][:size] == code
+        if date_from:
+            mask &= columns['completed_at'][:size] >= _epoch(date_from)
+        if date_to:
+            mask &= columns['completed_at'][:size] < _epoch(date_to, end=True)
+        if session_round is not None:
+            mask &= columns['round'][:size] == session_round
+        index = np.flatnonzero(mask)
+
+        if latest and len(index):
+            # (테스트 유형, 사용자)별 마지막 완료 세션: 정렬 후 그룹 경계의 마지막 원소
+            users = columns['user'][index]
+            types = columns['test_type'][index]
+            order = np.lexsort((columns['completed_at'][index], users, types))
+            users, types = users[order], types[order]
+            last = np.ones(len(order), dtype=bool)
+            last[:-1] = (users[1:] != users[:-1]) | (types[1:] != types[:-1])
+            index = index[order][last]
+        return index
+
+    def _check_metric(self, metric):
+        if metric not in METRICS:
+            raise ValueError(f"지원하지 않는 지표입니다: {metric}")
+
+    def distribution(self, metric='total_score', test_type=None, bins=20, date_from=None, date_to=None,
+                     session_round=None, latest=False, percentiles=DEFAULT_PERCENTILES):
+        """지표의 히스토그램/백분위/평균/표준편차 (값이 없는 세션은 제외)"""
+        self._check_metric(metric)
+        bins = max(1, min(int(bins), 200))
+        self.refresh()
+        with self._lock:
+            index = self._select(test_type, date_from, date_to, session_round, latest)
+            values = _finite(self._columns[metric][index]).astype(np.float64)
+            users = len(np.unique(self._columns['user'][index]))
+
+        result = {
+            'metric': metric,
+            'test_type': test_type,
+            'sessions': int(len(index)),
+            'users': users,
+            'count': int(len(values)),
+        }
+        if not len(values):
+            result.update({'mean': None, 'std': None, 'min': None, 'max': None,
+                           'percentiles': {}, 'histogram': {'counts': [], 'edges': []}})
+            return result
+
+        counts, edges = np.histogram(values, bins=bins)
+        result.update({
+            'mean': _round(values.mean()),
+            'std': _round(values.std()),
+            'min': _round(values.min()),
+            'max': _round(values.max()),
+            'percentiles': {f"p{p:g}": _round(v) for p, v in zip(percentiles, np.percentile(values, percentiles))},
+            'histogram': {'counts': counts.tolist(), 'edges': [_round(edge) for edge in edges]},
+        })
+        return result
+
+    def _group_keys(self, by, index):
+        """코호트 기준별 그룹 키 배열과 키 → 이름 변환 함수"""
+        columns = self._columns
+        if by == 'test_type':
+            return columns['test_type'][index], lambda key: self._test_type_names[key]
+        if by == 'round':
+            return columns['round'][index], int
+        if by == 'month':
+            months = columns['completed_at'][index].astype('datetime64[s]').astype('datetime64[M]')
+            return months.astype(np.int64), lambda key: str(np.datetime64(int(key), 'M'))
+        raise ValueError(f"지원하지 않는 비교 기준입니다: {by}")
+
+    def compare(self, by='round', metric='total_score', test_type=None, date_from=None, date_to=None,
+                latest=False, max_groups=100):
+        """코호트(테스트 유형/회차/완료 월)별 지표 비교: 세션 수, 평균, 사분위수"""
+        self._check_metric(metric)
+        if by not in COHORT_KEYS:
+            raise ValueError(f"지원하지 않는 비교 기준입니다: {by}")
+        self.refresh()
+        with self._lock:
+            index = self._select(test_type, date_from, date_to, None, latest)
+            values = self._columns[metric][index].astype(np.float64)
+            keys, label = self._group_keys(by, index)
+            present = ~np.isnan(values)
+            values, keys = values[present], keys[present]
+
+            groups, inverse = np.unique(keys, return_inverse=True)
+            labels = [label(key) for key in groups]
+
+        if not len(groups):
+            return {'by': by, 'metric': metric, 'test_type': test_type, 'groups': []}
+
+        counts = np.bincount(inverse)
+        means = np.bincount(inverse, weights=values) / counts
+        # 그룹별로 정렬된 값에서 선형 보간 사분위수 계산
+        ordered = values[np.lexsort((values, inverse))]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        def quantile(q):
+            position = q * (counts - 1)
+            low = np.floor(position).astype(np.int64)
+            high = np.ceil(position).astype(np.int64)
+            return ordered[starts + low] + (ordered[starts + high] - ordered[starts + low]) * (position - low)
+
+        p25, p50, p75 = quantile(0.25), quantile(0.5), quantile(0.75)
+        groups_out = [{
+            'cohort': labels[i],
+            'count': int(counts[i]),
+            'mean': _round(means[i]),
+            'p25': _round(p25[i]),
+            'median': _round(p50[i]),
+            'p75': _round(p75[i]),
+        } for i in range(len(groups))][:max_groups]
+        return {'by': by, 'metric': metric, 'test_type': test_type, 'groups': groups_out}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': int(self._columns['valid'][:self._size].sum()),
+                'capacity': self._capacity,
+                'users': len(self._users),
+                'high_water_seq': self._high_water,
+                'memory_bytes': sum(array.nbytes for array in self._columns.values()),
+                'refreshes': self.refresh_count,
+                'rows_loaded': self.rows_loaded,
+                'last_refresh_ms': round(self.last_refresh_ms, 2),
+            }
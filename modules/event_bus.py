@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import collections
+import json
+import threading
+import time
+from datetime import datetime
+
+import websockets
+
+
+class EventPublisher:
+    """웹소켓으로 이벤트를 내보내는 백그라운드 퍼블리셔
+
+    요청 핸들러는 publish()로 이벤트를 큐에 넣기만 하고(O(1), 블로킹/예외 없음),
+    전용 asyncio 스레드가 큐를 비우면서 이벤트를 묶어(batch) 전송한다.
+    연결이 끊기면 지수 백오프로 재연결한다.
+    """
+
+    def __init__(self, uri, headers=None, max_queue=1000, batch_size=50,
+                 batch_interval=0.05, backoff_initial=1.0, backoff_max=30.0,
+                 connect=None):
+        self.uri = uri
+        self.headers = headers or {}
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        # 테스트에서는 로컬 웹소켓 대체 객체를 주입할 수 있음
+        self._connect = connect or self._default_connect
+
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wakeup = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+        self.connected = False
+        self.published_count = 0
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.batch_count = 0
+        self.reconnect_count = 0
+        self.last_error = None
+
+    def _default_connect(self):
+        return websockets.connect(self.uri, additional_headers=self.headers)
+
+    def publish(self, event_type, data=None):
+        """이벤트를 큐에 추가 (가득 차면 버리고 드롭 카운트 증가)"""
+        try:
+            event = {
+                'type': event_type,
+                'data': data,
+                'timestamp': datetime.now().isoformat()
+            }
+            with self._lock:
+                if len(self._queue) >= self.max_queue:
+                    self.dropped_count += 1
+                    return False
+                self._queue.append(event)
+                self.published_count += 1
+            self._notify()
+            return True
+        except Exception:
+            self.dropped_count += 1
+            return False
+
+    def _notify(self):
+        loop = self._loop
+        if loop is not None and self._wakeup is not None:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # 루프가 이미 종료된 경우
+                pass
+
+    def stats(self):
+        """큐 상태 및 전송 통계"""
+        return {
+            'connected': self.connected,
+            'queue_depth': len(self._queue),
+            'max_queue': self.max_queue,
+            'published': self.published_count,
+            'sent': self.sent_count,
+            'dropped': self.dropped_count,
+            'batches': self.batch_count,
+            'reconnects': self.reconnect_count,
+            'last_error': self.last_error
+        }
+
+    def start(self):
+        """전용 스레드에서 이벤트 루프 시작"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._thread_main, name='event-publisher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """퍼블리셔 중지 (남은 이벤트는 가능한 만큼 전송 시도)"""
+        self._stopped.set()
+        self._notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _thread_main(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._wakeup = asyncio.Event()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._run())
+        finally:
+            self._loop = None
+            loop.close()
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _requeue(self, batch):
+        """전송 실패한 배치를 큐 앞쪽에 되돌림 (공간이 없으면 드롭)"""
+        with self._lock:
+            for event in reversed(batch):
+                if len(self._queue) >= self.max_queue:
+                    self.dropped_count += 1
+                    continue
+                self._queue.appendleft(event)
+
+    async def _run(self):
+        backoff = self.backoff_initial
+        while not self._stopped.is_set():
+            try:
+                async with self._connect() as websocket:
+                    self.connected = True
+                    backoff = self.backoff_initial
+                    print("웹소켓 연결 성공")
+                    await self._send_loop(websocket)
+                    if self._stopped.is_set():
+                        self.connected = False
+                        return
+            except Exception as e:
+                self.last_error = str(e)
+                print("웹소켓 연결 에러:", e)
+            self.connected = False
+            if self._stopped.is_set():
+                return
+            self.reconnect_count += 1
+            await self._sleep(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+
+    async def _send_loop(self, websocket):
+        # 서버 메시지(ping/pong 등)를 계속 읽어 연결 종료를 감지
+        reader = asyncio.ensure_future(self._drain_incoming(websocket))
+        try:
+            while not self._stopped.is_set() or self._queue:
+                if reader.done():
+                    reader.result()
+                    raise ConnectionError("웹소켓 연결이 종료되었습니다.")
+
+                batch = self._take_batch()
+                if not batch:
+                    if self._stopped.is_set():
+                        break
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        pass
+                    # 짧게 기다려 이벤트를 모아서 전송
+                    await asyncio.sleep(self.batch_interval)
+                    continue
+
+                try:
+                    await websocket.send(json.dumps({'events': batch}, ensure_ascii=False))
+                except Exception:
+                    self._requeue(batch)
+                    raise
+                self.sent_count += len(batch)
+                self.batch_count += 1
+        finally:
+            reader.cancel()
+
+    async def _drain_incoming(self, websocket):
+        while True:
+            await websocket.recv()
+
+    async def _sleep(self, seconds):
+        """중지 요청 시 바로 깨어나는 대기"""
+        deadline = time.monotonic() + seconds
+        while not self._stopped.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(remaining, 1.0))
+            except asyncio.TimeoutError:
+                pass
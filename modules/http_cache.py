@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import gzip
+import json
+import zlib
+
+from flask import request, Response
+from flask.json.provider import DefaultJSONProvider
+
+# 선택 의존성: 설치되어 있으면 더 빠른 인코더/압축 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """공백 없는(compact) UTF-8 JSON 출력 - orjson이 있으면 orjson 사용"""
+
+    ensure_ascii = False
+    compact = True
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        # jsonify는 compact 모드에서 separators만 넘기므로 그 경우에도 orjson 사용
+        if orjson is not None and set(kwargs) <= {'separators'}:
+            try:
+                # datetime은 Flask 기본 인코더와 같은 형식이 되도록 default로 넘김
+                return orjson.dumps(obj, default=self.default,
+                                    option=orjson.OPT_PASSTHROUGH_DATETIME).decode('utf-8')
+            except TypeError:
+                # orjson이 지원하지 않는 타입(큰 정수 등)은 표준 인코더로 처리
+                pass
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('separators', (',', ':'))
+        kwargs.setdefault('default', self.default)
+        return json.dumps(obj, **kwargs)
+
+
+def _accepted_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, min_size=1024, level=6):
+    """큰 JSON 응답을 클라이언트가 허용하는 방식(br/gzip)으로 압축
+
+    압축하면 본문 바이트가 달라지므로 강한 ETag는 약한 ETag로 바꾼다.
+    """
+    # 스트리밍 응답은 본문을 모으지 않도록 건너뜀 (압축이 필요하면 생성 측에서 처리)
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed or
+            'Content-Encoding' in response.headers or
+            not response.mimetype or not response.mimetype.endswith('json')):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    encoding = _accepted_encoding()
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=min(level, 11))
+    elif encoding == 'gzip':
+        compressed = gzip.compress(body, compresslevel=level)
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _conditional(etag, view, view_args):
+    """If-None-Match가 etag와 같으면 304, 아니면 뷰를 실행하고 약한 ETag를 붙임"""
+    # 같은 데이터 번호라도 경로/쿼리 문자열이 다르면 다른 응답
+    variant = zlib.crc32(request.full_path.encode('utf-8'))
+    etag = f"{etag}-{variant:08x}"
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    response = view(**view_args)
+    if isinstance(response, Response) and response.status_code == 200:
+        # 뷰가 내용 기반 ETag를 이미 붙였으면 그대로 둠 (완료된 세션 보고서 등)
+        if not response.get_etag()[0]:
+            response.set_etag(etag, weak=True)
+        # 브라우저가 매번 재검증하도록 (304면 본문 없이 캐시 사용)
+        response.cache_control.no_cache = True
+    return response
+
+
+def versioned(versions, scopes):
+    """데이터 변경 번호로 ETag를 만들고 If-None-Match가 같으면 304로 응답하는 데코레이터
+
+    scopes(**view_args)는 응답이 의존하는 DataVersions 범위 목록을 반환한다.
+    ETag가 일치하면 뷰 함수(DB 조회와 직렬화)를 실행하지 않는다.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            numbers = versions.snapshot(*scopes(**view_args))
+            return _conditional(f"{versions.boot}-{'.'.join(map(str, numbers))}", view, view_args)
+        return wrapper
+    return decorator
+
+
+def tagged(tag):
+    """tag(**view_args)가 돌려주는 버전 문자열로 ETag를 만드는 데코레이터 (304 처리는 versioned와 같음)
+
+    DataVersions가 아니라 자체 캐시에 반영된 상태에 의존하는 응답용이다 - 캐시가 주기적으로만
+    갱신되면 데이터 변경 번호가 올라도 본문은 그대로라서 ETag가 본문과 어긋난다.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            return _conditional(tag(**view_args), view, view_args)
+        return wrapper
+    return decorator
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# 트리거 키워드 (진단 테스트 시작 조건)
+TRIGGER_KEYWORDS = [
+    '우울', '슬프', '힘들', '어려', '걱정', '불안', '스트레스', '피곤', '외로',
+    '자살', '죽고', '끝내', '포기', '의미없', '희망없', '절망', '괴로', '고통'
+]
+
+# 3가지 테스트 질문 (각 20개)
+TEST_QUESTIONS = {
+    'cdi': [
+        "야, 요즘 공부는 어때? 어떤 기분이야?",
+        "친구들이나 다른 애들이랑 있을 때 어떤 느낌이야?",
+        "요즘 잠은 잘 자? 잠자리는 어때?",
+        "학교에서 선생님이나 어른들과 이야기할 때는 어때?",
+        "혼자 있을 때 어떤 기분이야? 외롭지 않아?",
+        "요즘 우울하거나 슬픈 기분이 자주 들어?",
+        "친구들과 놀 때 재미있어? 아니면 힘들어?",
+        "공부할 때 집중이 잘 돼? 아니면 어려워?",
+        "요즘 많이 울어? 눈물이 자주 나와?",
+        "밥은 잘 먹어? 식욕은 어때?",
+        "몸이 피곤하거나 아픈 곳 있어?",
+        "새로운 일을 시작할 때 두려워?",
+        "다른 애들보다 못하다고 생각해?",
+        "미래에 대해 걱정이 많아?",
+        "가족들과 잘 지내? 집에서 편해?",
+        "요즘 스트레스 받는 일이 많아?",
+        "기분이 자주 변해? 갑자기 화나거나?",
+        "혹시 자해하거나 죽고 싶은 생각 해봤어?",
+        "마지막으로, 요즘 가장 힘든 일이 뭐야?",
+        "그럼 마지막 질문이야. 앞으로 어떻게 하고 싶어?"
+    ],
+    'rcmas': [
+        "새로운 상황에 들어갈 때 얼마나 긴장돼?",
+        "다른 사람들이 너를 어떻게 생각하는지 걱정돼?",
+        "시험을 볼 때 얼마나 불안해?",
+        "새로운 친구를 사귈 때 어려워?",
+        "선생님 앞에서 발표할 때 떨려?",
+        "다른 애들보다 못하다고 생각해?",
+        "실수를 하면 얼마나 부끄러워?",
+        "새로운 일을 시작할 때 두려워?",
+        "다른 사람들이 너를 비웃을까 걱정돼?",
+        "혼자 있을 때 불안해?",
+        "새로운 환경에 적응하기 어려워?",
+        "다른 사람들과 비교될 때 스트레스받아?",
+        "실패할까봐 걱정돼?",
+        "다른 사람들의 시선이 부담스러워?",
+        "새로운 도전을 피하고 싶어?",
+        "다른 사람들이 너를 어떻게 볼지 걱정돼?",
+        "새로운 사람들과 만날 때 어색해?",
+        "다른 애들보다 뒤처질까 걱정돼?",
+        "새로운 상황에서 실수할까봐 두려워?",
+        "마지막으로, 가장 불안한 상황이 뭐야?"
+    ],
+    'bdi': [
+        "요즘 기분이 어떤가?",
+        "미래에 대해 어떻게 생각해?",
+        "실패했다고 느낄 때가 있어?",
+        "만족스럽지 않은 일이 많아?",
+        "죄책감을 느낄 때가 있어?",
+        "벌을 받을 것 같다고 생각해?",
+        "자신에 대해 실망해?",
+        "자신을 비난할 때가 있어?",
+        "자살에 대해 생각해본 적 있어?",
+        "요즘 많이 울어?",
+        "짜증이 자주 나?",
+        "다른 사람들에게 관심이 없어?",
+        "결정하기 어려워?",
+        "자신이 못생겼다고 생각해?",
+        "일하기 어려워?",
+        "잠을 잘 못 자?",
+        "피곤해?",
+        "식욕이 없어?",
+        "몸무게가 많이 변했어?",
+        "건강에 대해 걱정돼?"
+    ]
+}
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+SESSION_POLICIES = ('queue', 'reject', 'coalesce')
+
+
+class SessionBusyError(Exception):
+    """같은 세션에서 이미 처리 중인 요청이 있어 거절된 경우"""
+    pass
+
+
+class SessionCoalesced(Exception):
+    """메시지가 대기 중인 다른 요청에 병합되어 그 요청과 함께 처리된 경우"""
+    pass
+
+
+class _CoalescedBatch:
+    """coalesce 정책에서 락을 기다리는 요청(대표)에 모인 메시지와 처리 결과"""
+
+    def __init__(self, message):
+        self.messages = [message]
+        self.done = threading.Event()
+        self.error = None
+
+
+class SessionTurnGate:
+    """세션 단위로 메시지 처리를 직렬화하는 게이트
+
+    - queue: 앞선 요청이 끝날 때까지 대기 (timeout 초과 시 SessionBusyError)
+    - reject: 처리 중인 요청이 있으면 즉시 SessionBusyError
+    - coalesce: 처리 중인 요청이 있으면 대기 요청 하나에 메시지를 모아서 한 번에 처리
+      (병합된 요청은 묶음 처리가 끝날 때까지 기다렸다가 SessionCoalesced, 실패하면 같은 예외)
+    """
+
+    def __init__(self, policy='queue', timeout=30.0):
+        if policy not in SESSION_POLICIES:
+            raise ValueError(f"지원하지 않는 세션 정책입니다: {policy}")
+        self.policy = policy
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._pending = None  # coalesce 정책에서 락을 기다리는 묶음
+
+    @property
+    def busy(self):
+        return self._lock.locked()
+
+    def run(self, message, handler):
+        """handler(message)를 세션 락을 잡은 상태로 실행"""
+        if self.policy == 'coalesce':
+            return self._run_coalesced(message, handler)
+        if self.policy == 'reject':
+            if not self._lock.acquire(blocking=False):
+                raise SessionBusyError("이전 메시지를 처리 중입니다.")
+        elif not self._lock.acquire(timeout=self.timeout):
+            raise SessionBusyError("이전 메시지 처리 대기 시간이 초과되었습니다.")
+
+        try:
+            return handler(message)
+        finally:
+            self._lock.release()
+
+    def _run_coalesced(self, message, handler):
+        """coalesce 정책: 락이 비어 있으면 바로 처리, 아니면 대기 묶음에 합쳐서 한 번에 처리
+
+        병합된 요청도 묶음이 실제로 처리될 때까지 응답하지 않으므로, 대표 요청이 시간 초과나
+        오류로 끝나면 병합된 요청들도 같은 오류를 받는다 (메시지가 조용히 사라지지 않음).
+        """
+        with self._state_lock:
+            if self._lock.acquire(blocking=False):
+                batch = None
+            elif self._pending is not None:
+                # 이미 대기 중인 묶음이 있으면 거기에 합치고 처리 결과를 기다림
+                batch = self._pending
+                batch.messages.append(message)
+                follower = True
+            else:
+                batch = self._pending = _CoalescedBatch(message)
+                follower = False
+
+        if batch is None:
+            try:
+                return handler(message)
+            finally:
+                self._lock.release()
+
+        if follower:
+            batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+            raise SessionCoalesced("대기 중인 메시지와 병합되어 처리되었습니다.")
+
+        try:
+            acquired = self._lock.acquire(timeout=self.timeout)
+            with self._state_lock:
+                # 락을 잡은 뒤(또는 포기한 뒤)에는 더 이상 합치지 않음
+                if self._pending is batch:
+                    self._pending = None
+            if not acquired:
+                raise SessionBusyError("이전 메시지 처리 대기 시간이 초과되었습니다.")
+            try:
+                return handler(' '.join(batch.messages))
+            finally:
+                self._lock.release()
+        except Exception as e:
+            batch.error = e
+            raise
+        finally:
+            batch.done.set()
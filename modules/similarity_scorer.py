@@ -166,6 +166,17 @@ class SimilarityScorer:
             # 기본 점수 반환
             return 1
     
+    def calculate_keyword_score(self, user_response, category, subcategory):
+        """키워드만 사용한 점수 계산 (LLM을 사용할 수 없을 때의 대체 경로)"""
+        if category not in self.evaluation_templates:
+            return 0
+        
+        if subcategory not in self.evaluation_templates[category]:
+            return 0
+        
+        templates = self.evaluation_templates[category][subcategory]
+        return self._calculate_keyword_similarity_fallback(user_response, templates, category)
+    
     def _extract_korean_stems(self, text):
         """한국어 텍스트에서 어간 추출"""
         if not text:
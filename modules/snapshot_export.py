@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import time
+from datetime import datetime
+
+from database import EXPORT_TABLES, HOT_QUERIES
+
+# 선택 의존성: 스냅샷 파일 작성에 필요 (pip install pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# 내보내지 않는 컬럼
+EXCLUDED_COLUMNS = {
+    'users': ('password_hash',),
+}
+
+# 포맷별 파일 확장자
+FORMATS = {
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+}
+
+
+def _arrow_type(declared):
+    """SQLite 선언 타입 → (Arrow 타입, CAST 타입)"""
+    declared = (declared or '').upper()
+    if 'INT' in declared:
+        return pa.int64(), 'INTEGER'
+    if 'REAL' in declared or 'FLOA' in declared or 'DOUB' in declared:
+        return pa.float64(), 'REAL'
+    return pa.string(), 'TEXT'
+
+
+class _PartitionWriter:
+    """한 테이블/실행(run) 파티션의 파일 작성기 - rows_per_file마다 새 파일로 나눔
+
+    파일은 임시 이름으로 쓰고 닫을 때 최종 이름으로 바꾸므로 읽는 쪽은 완성된 파일만 본다.
+    """
+
+    def __init__(self, directory, schema, fmt, compression, rows_per_file):
+        self.directory = directory
+        self.schema = schema
+        self.fmt = fmt
+        self.compression = compression
+        self.rows_per_file = rows_per_file
+        self.files = []
+        self._writer = None
+        self._sink = None
+        self._path = None
+        self._rows = 0
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._path = os.path.join(self.directory, f"part-{len(self.files):05d}.{FORMATS[self.fmt]}")
+        if self.fmt == 'parquet':
+            self._writer = pq.ParquetWriter(self._path + '.tmp', self.schema, compression=self.compression)
+        else:
+            self._sink = pa.OSFile(self._path + '.tmp', 'wb')
+            options = ipc.IpcWriteOptions(compression=None if self.compression == 'none' else self.compression)
+            self._writer = ipc.new_file(self._sink, self.schema, options=options)
+        self._rows = 0
+
+    def _close(self):
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        os.replace(self._path + '.tmp', self._path)
+        self.files.append({'path': self._path, 'rows': self._rows, 'bytes': os.path.getsize(self._path)})
+        self._writer = None
+
+    def write(self, batch):
+        offset = 0
+        while offset < batch.num_rows:
+            if self._writer is None:
+                self._open()
+            take = min(batch.num_rows - offset, self.rows_per_file - self._rows)
+            self._writer.write_batch(batch.slice(offset, take))
+            self._rows += take
+            offset += take
+            if self._rows >= self.rows_per_file:
+                self._close()
+
+    def close(self):
+        if self._writer is not None:
+            self._close()
+        return self.files
+
+
+class SnapshotExporter:
+    """사용자/세션/응답/전문가 피드백의 증분 컬럼형 스냅샷(Parquet 또는 Arrow IPC) 내보내기
+
+    첫 실행(또는 full=True)은 전체 행을, 이후 실행은 마지막 실행 이후 변경 로그(export_changes)에
+    기록된 행의 현재 값만 내보낸다. 변경 로그는 첫 실행이 기록을 켠 뒤부터 쌓이며, 기록이 꺼져
+    있었거나 실행 간격이 길어 로그가 보존 한도(trim_export_changes)로 정리되었으면 전체 내보내기로
+    전환한다. 한 실행의 모든 테이블은 같은 읽기 트랜잭션(스냅샷)에서
+    chunk_rows 행씩 읽어 바로 파일에 쓰므로 메모리 사용량은 데이터 크기와 무관하다.
+
+    출력 구조:
+        <out>/<table>/run=<번호>/part-<번호>.parquet
+        <out>/manifest.json  - 실행 목록(종류, seq 범위, 파일별 행 수)과 테이블 스키마
+
+    읽는 쪽은 마지막 full 실행부터의 파일을 모두 읽고, 같은 id는 run 번호가 가장 큰 행을 쓰면 된다.
+    """
+
+    def __init__(self, manager, out_dir, fmt='parquet', compression='zstd', chunk_rows=50000,
+                 rows_per_file=1000000, pause=0.0):
+        if pa is None:
+            raise RuntimeError("스냅샷 내보내기에는 pyarrow가 필요합니다. (pip install pyarrow)")
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 포맷입니다: {fmt}")
+        self.manager = manager
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.compression = compression
+        self.chunk_rows = chunk_rows
+        self.rows_per_file = rows_per_file
+        self.pause = pause
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.out_dir, MANIFEST_NAME)
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest):
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 manifest를 보지 않도록)"""
+        path = self.manifest_path + '.tmp'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(path, self.manifest_path)
+
+    def _table_schema(self, conn, table):
+        """(Arrow 스키마, SELECT 목록)"""
+        excluded = EXCLUDED_COLUMNS.get(table, ())
+        fields, select = [], []
+        for row in conn.execute(f"PRAGMA table_info({table})").fetchall():
+            name, declared = row[1], row[2]
+            if name in excluded:
+                continue
+            arrow_type, cast = _arrow_type(declared)
+            fields.append(pa.field(name, arrow_type))
+            # SQLite는 컬럼 타입이 강제되지 않으므로 선언 타입으로 맞춰서 읽음
+            select.append(f"CAST(t.{name} AS {cast}) AS {name}")
+        return pa.schema(fields), ', '.join(select)
+
+    def _export_table(self, conn, table, run, from_seq, to_seq, full):
+        schema, select = self._table_schema(conn, table)
+        if full:
+            cursor = conn.execute(f"SELECT {select} FROM {table} t ORDER BY t.rowid")
+        else:
+            cursor = conn.execute(f"""
+                SELECT {select} FROM {table} t
+                WHERE t.id IN ({HOT_QUERIES['export_changed_rows'][0]})
+            """, (table, from_seq, to_seq))
+
+        writer = _PartitionWriter(os.path.join(self.out_dir, table, f"run={run:06d}"), schema,
+                                  self.fmt, self.compression, self.rows_per_file)
+        rows = 0
+        while True:
+            chunk = cursor.fetchmany(self.chunk_rows)
+            if not chunk:
+                break
+            columns = list(zip(*chunk))
+            writer.write(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema))
+            rows += len(chunk)
+            if self.pause:
+                time.sleep(self.pause)  # 운영 DB 읽기 부하 완화
+        cursor.close()
+
+        files = writer.close()
+        for entry in files:
+            entry['path'] = os.path.relpath(entry['path'], self.out_dir)
+        return {'rows': rows, 'files': files}, [{'name': field.name, 'type': str(field.type)} for field in schema]
+
+    def run(self, full=False):
+        """한 번 내보내고 manifest에 실행 기록 추가, 내보낸 변경 로그는 삭제
+
+        반환: 실행 기록 (테이블별 행/파일 수, 전체 내보내기로 전환한 경우 그 이유를 담은 warning)
+        """
+        manifest = self.load_manifest()
+        if manifest and manifest.get('format') != self.fmt:
+            raise ValueError(f"기존 스냅샷 포맷({manifest.get('format')})과 다릅니다: {self.fmt}")
+        if manifest is None:
+            manifest = {'version': MANIFEST_VERSION, 'format': self.fmt, 'key': 'id',
+                        'merge': 'latest_run_wins', 'tables': {}, 'runs': []}
+        last_seq = manifest['runs'][-1]['to_seq'] if manifest['runs'] else 0
+        full = full or not manifest['runs']
+        run = manifest['runs'][-1]['run'] + 1 if manifest['runs'] else 1
+        started = time.perf_counter()
+        started_at = datetime.now().isoformat()
+        warning = None
+        # 스냅샷을 열기 전에 기록을 켜야 그 뒤의 변경이 다음 실행에서 빠지지 않음
+        if self.manager.enable_export_changes() and not full:
+            warning = "변경 로그 기록이 꺼져 있어 기록을 켜고 전체 내보내기로 전환했습니다."
+            full = True
+
+        conn = self.manager.connections.open(readonly=True)
+        try:
+            # 모든 테이블을 같은 시점의 스냅샷에서 읽음 (쓰기 작업은 막지 않음)
+            conn.execute("BEGIN")
+            # 로그가 비어 있어도 번호는 줄지 않도록 AUTOINCREMENT 최댓값을 기준으로 삼음
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'export_changes'").fetchone()
+            to_seq = row[0] if row else 0
+            if to_seq < last_seq:
+                # 데이터베이스가 바뀌었거나 다시 만들어진 경우
+                warning = f"변경 로그 번호({to_seq})가 마지막 내보내기({last_seq})보다 작아 전체 내보내기로 전환했습니다."
+                full = True
+            elif not full and to_seq > last_seq:
+                # 번호는 빈틈없이 매겨지므로 다음 번호가 없으면 보존 한도 정리로 지워진 변경분이 있는 것
+                first = conn.execute("SELECT MIN(seq) FROM export_changes WHERE seq > ?", (last_seq,)).fetchone()[0]
+                if first != last_seq + 1:
+                    warning = (f"내보내지 않은 변경 로그(seq {last_seq + 1}~)가 보존 한도로 정리되어 "
+                               f"전체 내보내기로 전환했습니다.")
+                    full = True
+            tables = {}
+            for table in EXPORT_TABLES:
+                tables[table], manifest['tables'][table] = self._export_table(
+                    conn, table, run, last_seq, to_seq, full)
+            conn.rollback()
+        finally:
+            conn.close()
+
+        entry = {
+            'run': run,
+            'kind': 'full' if full else 'incremental',
+            'from_seq': 0 if full else last_seq,
+            'to_seq': to_seq,
+            'started_at': started_at,
+            'finished_at': datetime.now().isoformat(),
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+            'tables': tables,
+        }
+        if warning:
+            entry['warning'] = warning
+        manifest['runs'].append(entry)
+        self._save_manifest(manifest)
+        # manifest에 기록된 뒤에만 로그 삭제 (중간에 실패하면 다음 실행에서 다시 내보냄)
+        entry['pruned_changes'] = self.manager.prune_export_changes(to_seq)
+        return entry
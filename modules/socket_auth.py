@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import hmac
+import time
+
+
+class SocketTokenSigner:
+    """로그인한 사용자에게 발급하는 Socket.IO 구독 토큰 (HMAC-SHA256 서명, 만료 시각 포함)
+
+    토큰은 '<user_id>.<만료 epoch>.<서명>'을 URL-safe base64로 인코딩한 문자열이다.
+    여러 노드로 실행할 때는 모든 노드가 같은 secret을 써야 다른 노드에서 발급한 토큰을 검증할 수 있다.
+    """
+
+    def __init__(self, secret, max_age=43200):
+        self.secret = secret.encode('utf-8') if isinstance(secret, str) else secret
+        self.max_age = max_age
+
+    def _sign(self, payload):
+        return hmac.new(self.secret, payload.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def issue(self, user_id):
+        payload = f"{user_id}.{int(time.time()) + self.max_age}"
+        token = f"{payload}.{self._sign(payload)}"
+        return base64.urlsafe_b64encode(token.encode('utf-8')).decode('ascii')
+
+    def verify(self, token):
+        """토큰의 사용자 ID 반환 (형식 오류/서명 불일치/만료 시 None)"""
+        try:
+            decoded = base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8')
+            payload, signature = decoded.rsplit('.', 1)
+            user_id, expires = payload.rsplit('.', 1)
+            expires = int(expires)
+        except (AttributeError, ValueError, UnicodeError):
+            return None
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        if expires < time.time():
+            return None
+        return user_id
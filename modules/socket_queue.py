@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import json
+import socket
+import socketserver
+import threading
+import time
+from urllib.parse import urlparse
+
+import socketio
+
+LOCAL_QUEUE_SCHEME = 'localqueue'
+
+
+def socketio_queue_options(url=None, channel='flask-socketio'):
+    """Socket.IO 메시지 큐 설정 (SocketIO(app, **options)에 전달)
+
+    - 없음: 단일 프로세스 (기존 동작)
+    - redis://, rediss://, kafka://, amqp:// 등: Flask-SocketIO 기본 백엔드 사용
+    - localqueue://host:port: 테스트/개발용 로컬 브로커(LocalQueueBroker) 사용
+    """
+    if not url:
+        return {}
+    if urlparse(url).scheme == LOCAL_QUEUE_SCHEME:
+        return {'client_manager': LocalQueueManager(url, channel=channel)}
+    return {'message_queue': url, 'channel': channel}
+
+
+def _send_frame(sock, frame):
+    sock.sendall(json.dumps(frame, ensure_ascii=False).encode('utf-8') + b'\n')
+
+
+class LocalQueueBroker:
+    """Redis pub/sub를 대신하는 최소 TCP 브로커 (테스트/개발용)
+
+    {"subscribe": true} 한 줄을 보낸 연결을 구독자로 등록하고, 그 밖의 프레임(JSON 한 줄)은
+    모든 구독자에게 그대로 전달한다. 보낸 노드의 구독 연결에도 돌려보내는데,
+    Socket.IO의 PubSubManager는 자기 노드의 로컬 클라이언트에게도 큐를 거쳐
+    받은 메시지로 전달하기 때문이다. 느린 구독자를 격리하지 않으므로 운영에서는 Redis를 쓴다.
+    """
+
+    def __init__(self, host='127.0.0.1', port=6380):
+        broker = self
+        self._lock = threading.Lock()
+        self._clients = set()
+        self.forwarded_count = 0
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    for line in self.rfile:
+                        if line.startswith(b'{"subscribe"'):
+                            with broker._lock:
+                                broker._clients.add(self.connection)
+                        else:
+                            broker._broadcast(line)
+                finally:
+                    with broker._lock:
+                        broker._clients.discard(self.connection)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"{LOCAL_QUEUE_SCHEME}://{self.host}:{self.port}"
+
+    def _broadcast(self, line):
+        with self._lock:
+            clients = list(self._clients)
+            self.forwarded_count += 1
+        for conn in clients:
+            try:
+                conn.sendall(line)
+            except OSError:
+                with self._lock:
+                    self._clients.discard(conn)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='local-queue-broker', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+
+class LocalQueueManager(socketio.PubSubManager):
+    """LocalQueueBroker를 사용하는 Socket.IO 클라이언트 매니저 (RedisManager와 같은 역할)"""
+
+    name = LOCAL_QUEUE_SCHEME
+
+    def __init__(self, url=f'{LOCAL_QUEUE_SCHEME}://127.0.0.1:6380', channel='flask-socketio',
+                 write_only=False, logger=None):
+        parsed = urlparse(url)
+        self.address = (parsed.hostname or '127.0.0.1', parsed.port or 6380)
+        self._publish_lock = threading.Lock()
+        self._publisher = None
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    def _connect(self):
+        return socket.create_connection(self.address, timeout=10)
+
+    def _publish(self, data):
+        frame = {'channel': self.channel, 'data': data}
+        with self._publish_lock:
+            # 연결이 끊겼으면 한 번 다시 연결해서 재시도
+            for attempt in range(2):
+                try:
+                    if self._publisher is None:
+                        self._publisher = self._connect()
+                    _send_frame(self._publisher, frame)
+                    return
+                except OSError:
+                    if self._publisher is not None:
+                        self._publisher.close()
+                    self._publisher = None
+                    if attempt:
+                        raise
+
+    def _listen(self):
+        retry_sleep = 1
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                conn.settimeout(None)
+                _send_frame(conn, {'subscribe': True})
+                retry_sleep = 1
+                for line in conn.makefile('rb'):
+                    frame = json.loads(line)
+                    if frame.get('channel') == self.channel:
+                        yield frame['data']
+            except OSError as e:
+                self._get_logger().error(f"로컬 큐 연결 실패, {retry_sleep}초 후 재연결: {e}")
+            finally:
+                if conn is not None:
+                    conn.close()
+            time.sleep(retry_sleep)
+            retry_sleep = min(retry_sleep * 2, 60)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Socket.IO 로컬 메시지 큐 브로커 (테스트/개발용)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6380)
+    args = parser.parse_args()
+
+    broker = LocalQueueBroker(args.host, args.port)
+    print(f"로컬 큐 브로커 시작: {broker.url}")
+    broker.serve_forever()